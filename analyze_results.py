@@ -0,0 +1,62 @@
+# Сводка по колоночному хранилищу результатов runner.py --results (чтение через memmap)
+
+import argparse
+import os
+import sys
+
+from runner import RESULTS_GAMES, RESULTS_PIECES
+from src.results import ColumnReader, ResultsError
+
+
+def print_histogram(title: str, histogram: dict, total: int):
+    """Выводит распределение: интервал, количество и доля."""
+    print(title)
+    for start, count in histogram.items():
+        print(f"  {start:>10}: {count:>10} ({count / total:.1%})")
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Сводка по результатам массового запуска игр")
+    parser.add_argument("results", help="Каталог хранилища (runner.py --results)")
+    parser.add_argument("--score-bin", type=int, default=1000, help="Ширина интервала распределения счета")
+    args = parser.parse_args(argv)
+    if args.score_bin <= 0:
+        parser.error("--score-bin должен быть положительным")
+    
+    try:
+        games = ColumnReader(os.path.join(args.results, RESULTS_GAMES))
+    except (OSError, ResultsError) as e:
+        print(f"Не удалось открыть результаты: {e}", file=sys.stderr)
+        return 1
+    if not len(games):
+        print("Результатов нет")
+        return 0
+    
+    print(f"Игр: {len(games)}")
+    for field in ("score", "lines", "pieces"):
+        summary = games.summary(field)
+        print(f"{field}: среднее {summary['mean']:.2f}, минимум {summary['min']}, "
+              f"максимум {summary['max']}")
+    print_histogram(f"Распределение счета (интервал {args.score_bin}):",
+                    games.histogram('score', args.score_bin), len(games))
+    print("Линии по итоговому уровню (игр, среднее):")
+    for level, (count, mean) in games.group_mean('lines', 'level').items():
+        print(f"  уровень {level:>3}: {count:>10} игр, {mean:.2f} линий")
+    
+    pieces_directory = os.path.join(args.results, RESULTS_PIECES)
+    if os.path.isdir(pieces_directory):
+        try:
+            pieces = ColumnReader(pieces_directory)
+        except (OSError, ResultsError) as e:
+            print(f"Не удалось открыть записи о фигурах: {e}", file=sys.stderr)
+            return 1
+        if len(pieces):
+            print(f"Фиксаций фигур: {len(pieces)}")
+            print_histogram("Фигур по скорости падения (мс):",
+                            pieces.histogram('fall_speed'), len(pieces))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
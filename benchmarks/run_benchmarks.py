@@ -0,0 +1,263 @@
+# Бенчмарки: операции поля, отрисовка и полные игры без графики
+#
+# Запуск из корня проекта:
+#   python -m benchmarks.run_benchmarks --output bench.json
+# Работает без дисплея: для отрисовки используется видеодрайвер SDL "dummy".
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from src.ai import AIPlayer
+from src.board import Board
+from src.engine import GameState
+from src.pieces import ORIENTATIONS, PieceGenerator, rotate_piece
+from src.renderer import RENDERERS, RENDERER_ARRAY
+
+
+def measure(func, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Измеряет время одного вызова функции.
+    
+    Количество вызовов в серии подбирается так, чтобы серия длилась
+    не меньше min_time; из repeat серий берется лучшая.
+    
+    Returns:
+        Словарь: ns_per_op (лучшая серия), ops_per_sec, loops
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9:
+            break
+        loops *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter_ns() - start)
+    ns_per_op = best / loops
+    return {'ns_per_op': ns_per_op, 'ops_per_sec': 1e9 / ns_per_op, 'loops': loops}
+
+
+def measure_each(make, func, count: int = 2000, repeat: int = 5) -> dict:
+    """
+    Измеряет операцию, меняющую объект: каждый вызов получает свой объект,
+    созданный make() вне замера.
+    
+    Returns:
+        Словарь как у measure
+    """
+    best = None
+    for _ in range(repeat):
+        targets = [make() for _ in range(count)]
+        start = time.perf_counter_ns()
+        for target in targets:
+            func(target)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    ns_per_op = best / count
+    return {'ns_per_op': ns_per_op, 'ops_per_sec': 1e9 / ns_per_op, 'loops': count}
+
+
+def clone_board(board: Board) -> Board:
+    """Копия поля через публичные методы (цвета клеток не сохраняются)."""
+    clone = Board(board.width, board.height)
+    clone.place_piece(board.grid, 0, 0, 1)
+    return clone
+
+
+def mid_game_board(seed: int = 0, pieces: int = 40, height: int = 20) -> Board:
+    """Поле середины игры: ИИ ставит несколько десятков фигур."""
+    state = GameState(height=height, generator=PieceGenerator(seed))
+    ai = AIPlayer()
+    while state.pieces_placed < pieces and not state.game_over:
+        ai.play_piece(state)
+    return state.board
+
+
+def bench_board(min_time: float) -> dict:
+    """Микробенчмарки операций поля на поле середины игры."""
+    board = mid_game_board()
+    heights = board.column_heights
+    results = {}
+    
+    # Проверка столкновений: фигура в каждой колонке над стопкой
+    orientation = ORIENTATIONS['T'][1]
+    top = board.height - max(heights) - orientation.height
+    probes = [(x, y) for x in range(-1, board.width) for y in (top, top + 2)]
+    
+    def can_place():
+        for x, y in probes:
+            board.can_place_piece(orientation, x, y)
+    results['can_place_piece'] = measure(can_place, min_time)
+    results['can_place_piece']['ns_per_op'] /= len(probes)
+    results['can_place_piece']['ops_per_sec'] *= len(probes)
+    
+    # Размещение фигуры: каждое на своей заранее подготовленной копии поля
+    results['place_piece'] = measure_each(lambda: clone_board(board),
+                                          lambda target: target.place_piece(orientation, 0, top, 3))
+    
+    # Удаление линий: копии поля с четырьмя заполненными строками
+    full_board = clone_board(board)
+    for y in range(full_board.height - 4, full_board.height):
+        full_board.place_piece([[1] * full_board.width], 0, y, 1)
+    results['clear_lines_4_rows'] = measure_each(lambda: clone_board(full_board),
+                                                 lambda target: target.clear_lines())
+    
+    # Вызов без полных строк (самый частый случай)
+    results['clear_lines_no_full_rows'] = measure(board.clear_lines, min_time)
+    
+    # Поворот: таблица поворотов и матрица (старый путь)
+    results['rotate_piece_orientation'] = measure(lambda: rotate_piece(orientation), min_time)
+    matrix = [list(row) for row in orientation]
+    results['rotate_piece_matrix'] = measure(lambda: rotate_piece(matrix), min_time)
+    
+    # Выбор хода ИИ и снимок поля: время зависит от занятых строк, а не от высоты поля
+    ai = AIPlayer()
+    for height in (20, 3000):
+        tall_board = mid_game_board(height=height)
+        x = tall_board.width // 2 - orientation.width // 2
+        size = f"{tall_board.width}x{height}"
+        results[f'best_placement_{size}'] = measure(
+            lambda: ai.best_placement(tall_board, orientation, x, 0), min_time)
+        results[f'snapshot_{size}'] = measure(tall_board.snapshot, min_time)
+    return results
+
+
+def bench_render(min_time: float, sizes, renderers) -> dict:
+    """Отрисовка Game.draw под видеодрайвером dummy для разных размеров окна и способов отрисовки."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from src.game_logic import Game
+    
+    pygame.display.init()
+    pygame.font.init()
+    results = {}
+    for renderer in renderers:
+        for window_width, window_height in sizes:
+            screen = pygame.display.set_mode((window_width, window_height))
+            game = Game(generator=PieceGenerator(0), window_size=(window_width, window_height),
+                        renderer=renderer)
+            # Заполняем поле как в середине игры
+            ai = AIPlayer()
+            while game.state.pieces_placed < 40 and not game.state.game_over:
+                ai.play_piece(game.state)
+            key = f"{renderer}_{window_width}x{window_height}_cell{game.renderer.cell_size}"
+            
+            # Полная перерисовка кадра
+            def full_frame():
+                game.invalidate()
+                game.draw(screen)
+            results[f"{key}_full"] = measure(full_frame, min_time)
+            
+            # Обычный кадр: фигура сдвинулась на одну клетку
+            moves = [1, -1]
+            
+            def moving_frame():
+                dx = moves[0]
+                if not game.state.move(dx):
+                    moves.reverse()
+                game.draw(screen)
+            results[f"{key}_piece_move"] = measure(moving_frame, min_time)
+            
+            # Кадр без изменений
+            results[f"{key}_idle"] = measure(lambda: game.draw(screen), min_time)
+    pygame.quit()
+    return results
+
+
+def bench_games(games: int, max_pieces: int) -> dict:
+    """Полные игры ИИ без графики с фиксированными зернами."""
+    ai = AIPlayer()
+    pieces = 0
+    lines = 0
+    start = time.perf_counter()
+    for seed in range(games):
+        state = GameState(generator=PieceGenerator(seed))
+        while not state.game_over and state.pieces_placed < max_pieces:
+            ai.play_piece(state)
+        pieces += state.pieces_placed
+        lines += state.lines_cleared
+    elapsed = time.perf_counter() - start
+    return {
+        'games': games,
+        'pieces': pieces,
+        'lines': lines,
+        'seconds': elapsed,
+        'pieces_per_sec': pieces / elapsed,
+    }
+
+
+def git_revision() -> str:
+    """Текущий коммит (для сравнения результатов между коммитами)."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def numpy_available() -> bool:
+    """Установлен ли NumPy (нужен для RENDERER_ARRAY)."""
+    return importlib.util.find_spec('numpy') is not None
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Бенчмарки тетриса")
+    parser.add_argument("--output", default="bench_results.json", help="Файл результатов (JSON)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Минимальная длительность серии, с")
+    parser.add_argument("--games", type=int, default=5, help="Количество полных игр")
+    parser.add_argument("--max-pieces", type=int, default=500, help="Лимит фигур на игру")
+    parser.add_argument("--skip-render", action="store_true", help="Пропустить бенчмарк отрисовки")
+    parser.add_argument("--renderers", default=None,
+                        help="Способы отрисовки через запятую (по умолчанию все доступные)")
+    args = parser.parse_args(argv)
+    
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'board': bench_board(args.min_time),
+        'games': bench_games(args.games, args.max_pieces),
+    }
+    if not args.skip_render:
+        if args.renderers is None:
+            renderers = list(RENDERERS)
+        else:
+            renderers = [name for name in args.renderers.split(",") if name]
+        unknown = set(renderers) - set(RENDERERS)
+        if unknown:
+            parser.error(f"неизвестные способы отрисовки: {', '.join(sorted(unknown))}")
+        if RENDERER_ARRAY in renderers and not numpy_available():
+            # NumPy необязателен: по умолчанию отрисовка через массивы просто пропускается
+            if args.renderers is not None:
+                parser.error(f"для отрисовки {RENDERER_ARRAY} нужен NumPy")
+            print(f"NumPy не установлен: бенчмарк отрисовки {RENDERER_ARRAY} пропущен")
+            renderers.remove(RENDERER_ARRAY)
+        results['render'] = bench_render(args.min_time, [(640, 480), (800, 600), (1280, 960)], renderers)
+    
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+    
+    for group in ('board', 'render'):
+        for name, value in results.get(group, {}).items():
+            print(f"{group}.{name}: {value['ns_per_op'] / 1000:.2f} мкс")
+    print(f"games: {results['games']['pieces_per_sec']:.1f} фигур/с")
+    print(f"Результаты записаны в {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,53 @@
 # Главный файл запуска тетриса
 
-import pygame
+from time import perf_counter_ns
+START_NS = perf_counter_ns()  # Начало отсчета для --startup-profile
+
+import argparse
 import sys
+
+# Параметры командной строки
+parser = argparse.ArgumentParser(description="Тетрис")
+parser.add_argument("--autoplay", action="store_true", help="Игра под управлением ИИ")
+parser.add_argument("--lookahead", type=int, default=0, metavar="DEPTH",
+                    help="Глубина поиска ИИ с учетом следующей фигуры (вместе с --autoplay)")
+parser.add_argument("--seed", type=int, default=None, help="Зерно генератора фигур")
+parser.add_argument("--bag", action="store_true", help="Генератор фигур «7 в мешке»")
+parser.add_argument("--record", metavar="PATH", default=None, help="Записать повтор первой игры в файл")
+parser.add_argument("--practice", type=int, nargs="?", const=100, default=0, metavar="DEPTH",
+                    help="Режим тренировки: отмена последних DEPTH ходов клавишей Backspace")
+parser.add_argument("--board", default="10x20", metavar="WxH",
+                    help="Размер поля в клетках; большое поле прокручивается за фигурой")
+parser.add_argument("--renderer", choices=("sprites", "numpy"), default="sprites",
+                    help="Отрисовка поля: спрайт на клетку или один вызов blit_array (нужен NumPy)")
+parser.add_argument("--profile", metavar="CSV", default=None,
+                    help="Замерять фазы кадра и сохранить их в CSV при выходе (оверлей - F3)")
+parser.add_argument("--startup-profile", action="store_true",
+                    help="Вывести время импорта, инициализации и первого кадра")
+args = parser.parse_args()
+if args.practice and args.record:
+    parser.error("--practice нельзя совмещать с --record")
+if args.seed is not None and args.seed < 0:
+    parser.error("--seed должен быть неотрицательным")
+try:
+    board_size = tuple(int(value) for value in args.board.lower().split("x"))
+except ValueError:
+    board_size = ()
+if len(board_size) != 2 or min(board_size) < 4:
+    parser.error("--board ожидает размер вида 10x20 (не меньше 4 клеток по каждой стороне)")
+
+# pygame импортируется после разбора аргументов: --help и ошибки не ждут его загрузки
+import pygame
 from src.game_logic import Game
+from src.pieces import PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+from src.profiler import StartupProfiler, STAGE_IMPORT, STAGE_INIT, STAGE_GAME
+startup = StartupProfiler(START_NS) if args.startup_profile else None
+if startup is not None:
+    startup.mark(STAGE_IMPORT)
 
-# Инициализация pygame
-pygame.init()
+# Инициализация только нужных модулей pygame (без звука и джойстиков)
+pygame.display.init()
+pygame.font.init()
 
 # Создание окна
 screen = pygame.display.set_mode((800, 600))
@@ -13,10 +55,36 @@ pygame.display.set_caption("Тетрис")
 
 # Часы для ограничения FPS
 clock = pygame.time.Clock()
+if startup is not None:
+    startup.mark(STAGE_INIT)
 
 # Создание и запуск игры
-game = Game()
-game.run(screen, clock)
+generator = PieceGenerator(args.seed, RANDOMIZER_BAG if args.bag else RANDOMIZER_UNIFORM)
+if args.autoplay and args.lookahead:
+    from src.search import BeamSearchPlayer
+    game = Game(ai=BeamSearchPlayer(depth=args.lookahead), generator=generator, record_path=args.record,
+                board_size=board_size, renderer=args.renderer)
+elif args.autoplay:
+    from src.ai import AIPlayer
+    game = Game(ai=AIPlayer(), generator=generator, record_path=args.record,
+                board_size=board_size, renderer=args.renderer)
+else:
+    game = Game(generator=generator, record_path=args.record, undo_limit=args.practice,
+                board_size=board_size, renderer=args.renderer)
+if args.profile:
+    from src.profiler import FrameProfiler
+    game.profiler = FrameProfiler()
+if startup is not None:
+    startup.mark(STAGE_GAME)
+    game.startup_profiler = startup
+if sys.platform == "emscripten":
+    # Браузер (pygbag): асинхронный цикл, отдающий управление вкладке каждый кадр
+    import asyncio
+    asyncio.run(game.run_async(screen, clock))
+else:
+    game.run(screen, clock)
+if args.profile:
+    game.profiler.dump_csv(args.profile)
 
 # Корректный выход из pygame
 pygame.quit()
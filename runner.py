@@ -0,0 +1,207 @@
+# Массовый запуск игр без графики на нескольких ядрах
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from src.ai import AIPlayer, DEFAULT_WEIGHTS
+from src.engine import GameState, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE
+from src.pieces import PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+from src.results import ColumnWriter, ResultsError
+
+# Действия случайного игрока
+ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE)
+
+# Поля результата одной игры (порядок колонок в пакете результатов)
+RESULT_FIELDS = ("seed", "score", "lines", "level", "pieces", "fall_speed")
+# Поля записи о фиксации фигуры (piece - номер фигуры в игре, с 1)
+PIECE_FIELDS = ("seed", "piece", "score", "lines", "level", "fall_speed")
+# Каталоги таблиц игр и фигур в хранилище результатов
+RESULTS_GAMES = "games"
+RESULTS_PIECES = "pieces"
+
+
+def _record_piece(piece_columns, seed: int, state: GameState):
+    """Дописывает в колонки PIECE_FIELDS состояние после фиксации фигуры."""
+    for column, value in zip(piece_columns, (seed, state.pieces_placed, state.score,
+                                             state.lines_cleared, state.level, state.fall_speed)):
+        column.append(value)
+
+
+def play_game(seed: int, max_pieces: int, frame_ms: int, ai: AIPlayer = None,
+              randomizer: str = RANDOMIZER_UNIFORM, piece_columns=None) -> GameState:
+    """
+    Играет одну игру без отрисовки до Game Over или лимита фигур.
+    
+    Args:
+        seed: Зерно игры: генератор фигур получает его как есть, а случайные
+              действия - отдельный поток из строки f"actions-{seed}", чтобы
+              последовательности фигур и действий не были связаны
+        max_pieces: Максимальное количество фигур (0 - без лимита)
+        frame_ms: Длительность одного шага в миллисекундах (для случайного игрока)
+        ai: ИИ-игрок; без него действия выбираются случайно
+        randomizer: Режим генератора фигур (RANDOMIZER_UNIFORM или RANDOMIZER_BAG)
+        piece_columns: Колонки PIECE_FIELDS для записей о каждой фиксации фигуры
+                       (None - без записей)
+    
+    Returns:
+        Итоговое состояние игры
+    """
+    state = GameState(generator=PieceGenerator(seed, randomizer))
+    if ai is not None:
+        while not state.game_over:
+            placed = state.pieces_placed
+            ai.play_piece(state)
+            if piece_columns is not None and state.pieces_placed != placed:
+                _record_piece(piece_columns, seed, state)
+            if max_pieces and state.pieces_placed >= max_pieces:
+                break
+        return state
+    
+    choice = random.Random(f"actions-{seed}").choice
+    while not state.game_over:
+        placed = state.pieces_placed
+        state.step(choice(ACTIONS), frame_ms)
+        if piece_columns is not None and state.pieces_placed != placed:
+            _record_piece(piece_columns, seed, state)
+        if max_pieces and state.pieces_placed >= max_pieces:
+            break
+    return state
+
+
+def play_batch(seeds, max_pieces: int, frame_ms: int, weights: dict = None,
+               randomizer: str = RANDOMIZER_UNIFORM, record_pieces: bool = False):
+    """
+    Играет пакет игр в процессе-обработчике.
+    
+    Результаты возвращаются компактно: по массиву на колонку RESULT_FIELDS
+    и массив длительностей, а не объект на каждую игру.
+    
+    Args:
+        seeds: Зерна игр пакета
+        max_pieces: Лимит фигур на игру (0 - без лимита)
+        frame_ms: Длительность шага случайного игрока
+        weights: Веса ИИ-игрока; None - случайный игрок
+        randomizer: Режим генератора фигур
+        record_pieces: Собирать записи PIECE_FIELDS о каждой фиксации фигуры
+    
+    Returns:
+        tuple: (columns, durations, piece_columns), piece_columns - None без record_pieces
+    """
+    columns = [array('q') for _ in RESULT_FIELDS]
+    durations = array('d')
+    piece_columns = [array('q') for _ in PIECE_FIELDS] if record_pieces else None
+    ai = AIPlayer(weights) if weights is not None else None
+    for seed in seeds:
+        start = time.perf_counter()
+        state = play_game(seed, max_pieces, frame_ms, ai, randomizer, piece_columns)
+        durations.append(time.perf_counter() - start)
+        for column, value in zip(columns, (seed, state.score, state.lines_cleared,
+                                           state.level, state.pieces_placed, state.fall_speed)):
+            column.append(value)
+    return columns, durations, piece_columns
+
+
+def run(games: int, workers: int, seed: int, chunk_size: int, max_pieces: int, frame_ms: int,
+        weights: dict = None, randomizer: str = RANDOMIZER_UNIFORM,
+        games_writer: ColumnWriter = None, pieces_writer: ColumnWriter = None):
+    """
+    Распределяет игры по процессам и собирает результаты.
+    
+    Пакеты приходят в порядке зерен и сразу дописываются в games_writer
+    (колонки RESULT_FIELDS) и pieces_writer (колонки PIECE_FIELDS); записи
+    о фигурах в памяти основного процесса не накапливаются.
+    
+    Returns:
+        tuple: (columns, durations, elapsed) - объединенные колонки, длительности и общее время
+    """
+    chunks = [range(start, min(start + chunk_size, seed + games))
+              for start in range(seed, seed + games, chunk_size)]
+    columns = [array('q') for _ in RESULT_FIELDS]
+    durations = array('d')
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(play_batch, chunks, [max_pieces] * len(chunks),
+                                [frame_ms] * len(chunks), [weights] * len(chunks),
+                                [randomizer] * len(chunks),
+                                [pieces_writer is not None] * len(chunks))
+        for batch_columns, batch_durations, piece_columns in results:
+            for column, batch_column in zip(columns, batch_columns):
+                column.extend(batch_column)
+            durations.extend(batch_durations)
+            if games_writer is not None:
+                games_writer.extend(batch_columns)
+            if pieces_writer is not None:
+                pieces_writer.extend(piece_columns)
+    elapsed = time.perf_counter() - start
+    return columns, durations, elapsed
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Массовый запуск игр тетриса без графики")
+    parser.add_argument("--games", type=int, default=1000, help="Количество игр")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Количество процессов")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно первой игры (игры нумеруются подряд)")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="Игр в одном пакете (по умолчанию - поровну на процесс)")
+    parser.add_argument("--max-pieces", type=int, default=0, help="Лимит фигур на игру (0 - без лимита)")
+    parser.add_argument("--frame-ms", type=int, default=16, help="Длительность шага в миллисекундах")
+    parser.add_argument("--ai", action="store_true", help="Играет ИИ с весами по умолчанию")
+    parser.add_argument("--bag", action="store_true", help="Генератор фигур «7 в мешке»")
+    parser.add_argument("--results", metavar="DIR", default=None,
+                        help="Дописать результаты игр в колоночное хранилище (DIR/games/*.npy)")
+    parser.add_argument("--pieces", action="store_true",
+                        help="Записывать и каждую фиксацию фигуры (DIR/pieces/*.npy)")
+    args = parser.parse_args(argv)
+    if args.pieces and not args.results:
+        parser.error("--pieces требует --results")
+    if args.ai and args.max_pieces <= 0:
+        parser.error("--ai требует положительный --max-pieces: игра ИИ может не закончиться")
+    
+    workers = max(1, args.workers)
+    # Несколько пакетов на процесс выравнивают нагрузку между ядрами
+    chunk_size = args.chunk_size or max(1, args.games // (workers * 4))
+    
+    weights = DEFAULT_WEIGHTS if args.ai else None
+    randomizer = RANDOMIZER_BAG if args.bag else RANDOMIZER_UNIFORM
+    games_writer = pieces_writer = None
+    if args.results:
+        try:
+            games_writer = ColumnWriter(os.path.join(args.results, RESULTS_GAMES), RESULT_FIELDS)
+            if args.pieces:
+                pieces_writer = ColumnWriter(os.path.join(args.results, RESULTS_PIECES), PIECE_FIELDS)
+        except (OSError, ResultsError) as e:
+            if games_writer is not None:
+                games_writer.close()
+            print(f"Не удалось открыть хранилище результатов: {e}", file=sys.stderr)
+            return 1
+    try:
+        columns, durations, elapsed = run(args.games, workers, args.seed, chunk_size,
+                                          args.max_pieces, args.frame_ms, weights, randomizer,
+                                          games_writer, pieces_writer)
+    finally:
+        for writer in (games_writer, pieces_writer):
+            if writer is not None:
+                writer.close()
+    results = dict(zip(RESULT_FIELDS, columns))
+    played = len(results["seed"])
+    pieces = sum(results["pieces"])
+    
+    print(f"Игр: {played}, процессов: {workers}, время: {elapsed:.2f} с")
+    print(f"Скорость: {played / elapsed:.1f} игр/с, {pieces / elapsed:.1f} фигур/с")
+    if played:
+        print(f"Средний счет: {sum(results['score']) / played:.1f}, "
+              f"максимальный: {max(results['score'])}")
+        print(f"Средние линии: {sum(results['lines']) / played:.2f}, "
+              f"средняя длительность игры: {sum(durations) / played * 1000:.2f} мс")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# Игровой сервер турнирного режима: сессии без графики по локальному сокету
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from src.client import GameClient
+from src.engine import ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP
+from src.pieces import RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+from src.server import GameServer, TICK_MS, encode_message
+
+# Действия ботов-заменителей клиентов (мгновенное падение - реже остальных)
+STANDIN_ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE) * 3 + (ACTION_HARD_DROP,)
+
+
+async def serve(host: str, port: int, tick_ms: int):
+    """Запускает сервер и обслуживает клиентов до прерывания."""
+    server = GameServer(tick_ms)
+    port = await server.start(host, port)
+    print(f"Сервер слушает {host}:{port}, шаг колеса {tick_ms} мс")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+async def _read_until_sync(client: GameClient, count: int = 1):
+    """Читает сообщения клиента, пока не придет count ответов "sync"."""
+    while count:
+        message = await client.receive()
+        if message.get('type') == 'sync':
+            count -= 1
+
+
+async def _drive_player(client: GameClient, rng: random.Random, deadline: float):
+    """Бот: случайные действия до срока, затем сверка зеркала с сервером."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.create_task(_read_until_sync(client))
+    while loop.time() < deadline:
+        await asyncio.sleep(rng.uniform(0.01, 0.05))
+        if client.mirrors[client.session].fields['game_over']:
+            client.send('restart')
+        else:
+            client.send('action', action=rng.choice(STANDIN_ACTIONS))
+    client.send('sync', session=client.session)
+    await reader
+
+
+async def run_standin(clients: int, duration: float, seed: int, tick_ms: int, mode: str) -> int:
+    """
+    Проверка из конца в конец: сервер и локальные клиенты-боты в одном цикле.
+    
+    Каждый бот играет свою сессию, один зритель наблюдает за всеми. В конце
+    зеркала всех клиентов сверяются с сервером по контрольным суммам.
+    
+    Returns:
+        Код возврата: 0 - все зеркала совпали с сервером
+    """
+    server = GameServer(tick_ms)
+    port = await server.start()
+    players = [await GameClient.connect('127.0.0.1', port) for _ in range(clients)]
+    for index, player in enumerate(players):
+        await player.play(seed + index, mode)
+    spectator = await GameClient.connect('127.0.0.1', port)
+    for player in players:
+        spectator.send('watch', session=player.session)
+    
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    start_ms = server.wheel.now_ms
+    spectator_reader = asyncio.create_task(_read_until_sync(spectator, clients))
+    deadline = loop.time() + duration
+    await asyncio.gather(*(_drive_player(player, random.Random(seed + index), deadline)
+                           for index, player in enumerate(players)))
+    for player in players:
+        spectator.send('sync', session=player.session)
+    await spectator_reader
+    elapsed = time.perf_counter() - start
+    wheel_elapsed = (server.wheel.now_ms - start_ms) / 1000
+    
+    # Размер полного кадра для сравнения с дельтами
+    frame_size = sum(len(encode_message(session.frame())) for session in server.sessions.values())
+    frame_size /= max(1, len(server.sessions))
+    desyncs = sum(client.desyncs for client in players) + spectator.desyncs
+    errors = sum(len(client.errors) for client in players) + len(spectator.errors)
+    for client in players + [spectator]:
+        await client.close()
+    await server.close()
+    
+    print(f"Сессий: {clients}, время: {elapsed:.2f} с, время колеса: {wheel_elapsed:.2f} с")
+    print(f"Сообщений: {server.messages_sent} ({server.messages_sent / elapsed:.0f}/с), "
+          f"средний размер: {server.bytes_sent / max(1, server.messages_sent):.0f} байт "
+          f"(полный кадр: {frame_size:.0f} байт)")
+    print(f"Расхождений зеркал: {desyncs}, ошибок протокола: {errors}")
+    return 0 if desyncs == 0 and errors == 0 else 1
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Игровой сервер тетриса")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для подключений")
+    parser.add_argument("--port", type=int, default=8765, help="Порт для подключений")
+    parser.add_argument("--tick-ms", type=int, default=TICK_MS, help="Шаг общего колеса таймеров")
+    parser.add_argument("--standin", type=int, default=0, metavar="N",
+                        help="Проверка: запустить сервер с N локальными клиентами-ботами")
+    parser.add_argument("--duration", type=float, default=5.0, help="Длительность проверки в секундах")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно первой сессии проверки")
+    parser.add_argument("--bag", action="store_true", help="Генератор фигур «7 в мешке» в проверке")
+    args = parser.parse_args(argv)
+    
+    if args.standin:
+        mode = RANDOMIZER_BAG if args.bag else RANDOMIZER_UNIFORM
+        return asyncio.run(run_standin(args.standin, args.duration, args.seed, args.tick_ms, mode))
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick_ms))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# Автоигра: перебор положений фигуры и эвристическая оценка поля
+
+from typing import NamedTuple
+
+from src.board import column_heights, count_holes
+from src.engine import ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP
+
+# Веса признаков по умолчанию (высота, линии, дыры, неровность)
+DEFAULT_WEIGHTS = {
+    'height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483,
+}
+
+
+class Placement(NamedTuple):
+    """Конечное положение фигуры и его оценка."""
+    orientation: object  # Orientation
+    x: int
+    y: int
+    score: float
+    rows: list  # Маски занятых строк поля после размещения и удаления линий
+    cleared: int
+
+
+def board_features(rows, width: int, cleared: int = 0) -> dict:
+    """
+    Признаки поля для эвристической оценки.
+    
+    Returns:
+        Словарь: height, holes, bumpiness, lines
+    """
+    heights = column_heights(rows, width)
+    bumpiness = 0
+    for left, right in zip(heights, heights[1:]):
+        bumpiness += abs(left - right)
+    return {
+        'height': sum(heights),
+        'holes': count_holes(rows, width),
+        'bumpiness': bumpiness,
+        'lines': cleared,
+    }
+
+
+def fits(rows, row_masks, x: int, y: int, width: int) -> bool:
+    """
+    Проверка столкновений по маскам строк (как Board.can_place_piece).
+    
+    Args:
+        rows: Маски строк поля
+        row_masks: Маски строк фигуры
+        x: Координата X левого верхнего угла фигуры
+        y: Координата Y левого верхнего угла фигуры
+        width: Ширина поля
+    """
+    if x < 0:
+        return False
+    height = len(rows)
+    full_row = (1 << width) - 1
+    for row_idx, mask in enumerate(row_masks):
+        shifted = mask << x
+        board_y = y + row_idx
+        if shifted > full_row or board_y >= height:
+            return False
+        if board_y >= 0 and rows[board_y] & shifted:
+            return False
+    return True
+
+
+def enumerate_placements(rows, width: int, orientation, x: int, y: int, heights=None,
+                         height: int = None):
+    """
+    Перебирает все достижимые конечные положения фигуры.
+    
+    Фигура поворачивается на месте, сдвигается по горизонтали и бросается
+    вниз. Поле не копируется: для каждого кандидата копируются только маски
+    занятой части поля, поэтому стоимость не зависит от высоты поля.
+    
+    Args:
+        rows: Маски нижних строк поля сверху вниз (пустые строки над стопкой
+              можно не передавать, например Board.rows[Board.top:])
+        width: Ширина поля
+        orientation: Текущий поворот фигуры (Orientation)
+        x: Текущая координата X фигуры
+        y: Текущая координата Y фигуры (в строках всего поля)
+        heights: Высоты колонок, если уже известны (Board.column_heights)
+        height: Высота всего поля (по умолчанию len(rows))
+    
+    Yields:
+        Placement без оценки (score = 0.0); rows - маски занятой части поля
+        после размещения и удаления линий (признаки поля от пустых строк
+        сверху не зависят)
+    """
+    full_row = (1 << width) - 1
+    stack_height = len(rows)
+    # Смещение переданных строк в поле: координаты фигуры переводятся в строки rows
+    offset = 0 if height is None else height - stack_height
+    y -= offset
+    if heights is None:
+        heights = column_heights(rows, width)
+    tops = [stack_height - h for h in heights]
+    seen_masks = set()
+    
+    for _ in range(4):
+        row_masks = orientation.row_masks
+        if not fits(rows, row_masks, x, y, width):
+            break  # Дальнейшие повороты недостижимы
+        # Одинаковые повороты (O, I, S, Z) проверяем один раз
+        if row_masks not in seen_masks:
+            seen_masks.add(row_masks)
+            first = min(row_idx for row_idx, mask in enumerate(row_masks) if mask)  # Верхняя клетка фигуры
+            
+            # Диапазон колонок, достижимых сдвигом из текущего положения
+            left = x
+            while fits(rows, row_masks, left - 1, y, width):
+                left -= 1
+            right = x
+            while fits(rows, row_masks, right + 1, y, width):
+                right += 1
+            
+            for col in range(left, right + 1):
+                # Строка остановки по профилю колонок
+                land_y = min(
+                    tops[col + dx] - bottom - 1
+                    for dx, bottom in enumerate(orientation.bottom) if bottom >= 0
+                )
+                if land_y < y:
+                    # Фигура уже под навесом: профиль неприменим (как в Board.drop_y)
+                    land_y = y
+                    while fits(rows, row_masks, col, land_y + 1, width):
+                        land_y += 1
+                if any(mask and land_y + row_idx < -offset for row_idx, mask in enumerate(row_masks)):
+                    continue  # Фигура остается выше поля
+                # Строки фигуры над переданной частью поля добавляются пустыми
+                grow = max(0, -(land_y + first))
+                new_rows = [0] * grow + rows if grow else rows[:]
+                cleared = 0
+                for row_idx, mask in enumerate(row_masks):
+                    if mask:
+                        row_y = grow + land_y + row_idx
+                        new_rows[row_y] |= mask << col
+                        if new_rows[row_y] == full_row:
+                            cleared += 1
+                if cleared:
+                    new_rows = [row for row in new_rows if row != full_row]
+                yield Placement(orientation, col, land_y + offset, 0.0, new_rows, cleared)
+        orientation = orientation.rotated
+
+
+class AIPlayer:
+    """ИИ-игрок: выбирает лучшее конечное положение текущей фигуры."""
+    
+    def __init__(self, weights: dict = None):
+        """
+        Args:
+            weights: Веса признаков (см. DEFAULT_WEIGHTS); признаки с нулевым
+                     или отсутствующим весом не учитываются
+        """
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self._target = None  # Выбранное положение текущей фигуры
+        self._target_piece = -1  # Номер фигуры (pieces_placed), для которой выбрано положение
+        self._expected = None  # (поворот, x) фигуры после последнего действия
+    
+    def board_score(self, rows, width: int) -> float:
+        """Оценка поля без учета удаленных линий."""
+        features = board_features(rows, width)
+        return sum(weight * features[name] for name, weight in self.weights.items()
+                   if weight and name != 'lines')
+    
+    def evaluate(self, rows, width: int, cleared: int) -> float:
+        """Оценивает поле (чем больше, тем лучше)."""
+        return self.board_score(rows, width) + self.weights.get('lines', 0) * cleared
+    
+    def placements(self, board, orientation, x: int, y: int):
+        """
+        Перебирает все достижимые конечные положения фигуры на поле (Board).
+        
+        Yields:
+            Placement без оценки (score = 0.0)
+        """
+        return enumerate_placements(board.rows[board.top:], board.width, orientation, x, y,
+                                    board.column_heights, board.height)
+    
+    def best_placement(self, board, orientation, x: int, y: int):
+        """
+        Возвращает лучшее положение фигуры или None, если ходов нет.
+        """
+        best = None
+        width = board.width
+        for placement in self.placements(board, orientation, x, y):
+            score = self.evaluate(placement.rows, width, placement.cleared)
+            if best is None or score > best.score:
+                best = placement._replace(score=score)
+        return best
+    
+    def choose(self, state):
+        """Лучшее положение для текущей фигуры состояния игры (GameState)."""
+        return self.best_placement(state.board, state.current_shape_matrix,
+                                   state.piece_x, state.piece_y)
+    
+    def play_piece(self, state) -> int:
+        """
+        Сразу ставит текущую фигуру в лучшее положение (без пошаговых действий).
+        
+        Returns:
+            Количество удаленных линий
+        """
+        placement = self.choose(state)
+        if placement is None:
+            state.game_over = True
+            return 0
+        return state.place(placement.orientation, placement.x, placement.y)
+    
+    def next_action(self, state) -> int:
+        """
+        Следующее действие (ACTION_*) для пошагового управления фигурой.
+        
+        Положение выбирается для каждой новой фигуры. Каждый вызов сверяет
+        поворот и X фигуры с ожидаемыми после прошлого действия: если
+        действие не удалось (стенка, другие фигуры, фигура упала ниже),
+        положение выбирается заново из текущего. Фигура сбрасывается вниз
+        только после того, как поворот и X совпали с выбранными.
+        """
+        rotation, x = state.current_shape_matrix.rotation, state.piece_x
+        if self._target_piece != state.pieces_placed or (rotation, x) != self._expected:
+            self._target_piece = state.pieces_placed
+            self._target = self.choose(state)
+        target = self._target
+        self._expected = None
+        if target is None:
+            return ACTION_DOWN
+        if rotation != target.orientation.rotation:
+            self._expected = ((rotation + 1) % 4, x)
+            return ACTION_ROTATE
+        if x != target.x:
+            step = 1 if target.x > x else -1
+            self._expected = (rotation, x + step)
+            return ACTION_RIGHT if step > 0 else ACTION_LEFT
+        return ACTION_HARD_DROP
@@ -0,0 +1,140 @@
+# Отрисовка игрового поля одним вызовом pygame.surfarray.blit_array (требует NumPy)
+
+import numpy as np
+import pygame
+
+from src.renderer import BoardRenderer, OUTLINE_COLOR
+
+# Цвет фона клетки тени фигуры
+GHOST_FILL_COLOR = (0, 0, 0)
+# Доля изменившихся клеток, начиная с которой плитки копируются одной операцией
+FULL_UPDATE_FRACTION = 0.25
+
+
+class ArrayBoardRenderer(BoardRenderer):
+    """
+    Отрисовка поля через массивы NumPy вместо спрайта на каждую клетку.
+    
+    Индексы цветов переводятся таблицей в плитки клеток (заливка с наложенной
+    обводкой, цвета в формате пикселей экрана). Плитки записываются в буфер
+    пикселей видимой части поля через представление [x, px, y, py] без
+    копирования, пустые клетки берутся из фона. Буфер (или прямоугольник
+    вокруг изменившихся клеток) выводится на экран одним вызовом blit_array,
+    поэтому стоимость кадра не зависит от заполненности поля. Интерфейс совпадает с BoardRenderer.
+    """
+    
+    def __init__(self, width: int, height: int, cell_size: int,
+                 view_width: int = None, view_height: int = None):
+        super().__init__(width, height, cell_size, view_width, view_height)
+        
+        # Маска обводки клетки: крайние пиксели (как у pygame.draw.rect толщиной 1)
+        outline = np.zeros((cell_size, cell_size), dtype=bool)
+        outline[[0, -1], :] = True
+        outline[:, [0, -1]] = True
+        self._outline = outline
+        
+        # Плитки строятся по словарю цветов Game при первой отрисовке
+        self._colors = None
+        self._tiles = None
+        self._index_offset = 0
+        
+        # Буфер пикселей видимой части поля и его представление по клеткам
+        self._pixels = np.zeros((self.pixel_width, self.pixel_height), dtype=np.uint32)
+        self._blocks = self._pixels.reshape(self.view_width, cell_size, self.view_height, cell_size)
+        
+        # Пиксели фона под полем (берутся из кэшированного фона экрана)
+        self._background = None
+        self._base = None
+    
+    def reset_cells(self):
+        """Забывает показанное состояние клеток (следующий кадр перерисует все)."""
+        self._shown = None
+    
+    def _build_tiles(self, screen: pygame.Surface, colors: dict):
+        """
+        Плитки клеток по индексу цвета: заливка с обводкой поверх.
+        
+        Отрицательные индексы - клетки тени фигуры: черная заливка и обводка
+        цветом фигуры. Индексы сдвигаются на _index_offset, чтобы быть
+        неотрицательными.
+        """
+        offset = max(colors, default=0)
+        fill = np.zeros(2 * offset + 1, dtype=np.uint32)
+        edge = np.zeros(2 * offset + 1, dtype=np.uint32)
+        for index, color in colors.items():
+            fill[offset + index] = screen.map_rgb(color)
+            edge[offset + index] = screen.map_rgb(OUTLINE_COLOR)
+            fill[offset - index] = screen.map_rgb(GHOST_FILL_COLOR)
+            edge[offset - index] = screen.map_rgb(color)
+        self._tiles = np.where(self._outline, edge[:, None, None], fill[:, None, None])
+        self._colors = colors
+        self._index_offset = offset
+    
+    def _board_rect(self, offset_x: int, offset_y: int) -> pygame.Rect:
+        """Прямоугольник видимой части поля на экране."""
+        return pygame.Rect(offset_x, offset_y, self.pixel_width, self.pixel_height)
+    
+    def draw_changed_cells(self, screen: pygame.Surface, background: pygame.Surface, board,
+                           piece_cells, piece_color_index: int, colors: dict,
+                           offset_x: int, offset_y: int, ghost_cells=()) -> list:
+        """
+        Перерисовывает видимую часть поля, если в ней что-то изменилось.
+        
+        Аргументы совпадают с BoardRenderer.draw_changed_cells.
+        
+        Returns:
+            [прямоугольник изменившейся области] или пустой список, если клетки не изменились
+        """
+        view_x, view_y = self.view_x, self.view_y
+        view_width, view_height = self.view_width, self.view_height
+        
+        # Индексы цветов видимых клеток [x, y] (как индексирует пиксели surfarray)
+        rows = board.grid[view_y:view_y + view_height]
+        if view_width != self.width:
+            rows = [row[view_x:view_x + view_width] for row in rows]
+        wanted = np.array(rows, dtype=np.int16).T
+        for cells, color_index in ((ghost_cells, -piece_color_index), (piece_cells, piece_color_index)):
+            for x, y in cells:
+                x -= view_x
+                y -= view_y
+                if 0 <= x < view_width and 0 <= y < view_height:
+                    wanted[x, y] = color_index
+        
+        rect = self._board_rect(offset_x, offset_y)
+        if colors is not self._colors:
+            self._build_tiles(screen, colors)
+            self._shown = None
+        if background is not self._background:
+            self._background = background
+            base = pygame.surfarray.array3d(background.subsurface(rect))
+            self._base = pygame.surfarray.map_array(screen, base).astype(np.uint32).reshape(self._blocks.shape)
+            self._shown = None
+        
+        shown = self._shown
+        if shown is None:
+            changed = None
+        else:
+            changed = np.argwhere(wanted != shown)
+            if not len(changed):
+                return []
+        self._shown = wanted
+        
+        blocks, base = self._blocks, self._base
+        tiles, offset = self._tiles, self._index_offset
+        if changed is None or len(changed) >= FULL_UPDATE_FRACTION * wanted.size:
+            # Все плитки одной операцией, затем фон под пустыми клетками
+            np.copyto(blocks, tiles[wanted + offset].transpose(0, 2, 1, 3))
+            np.copyto(blocks, base, where=(wanted == 0)[:, None, :, None])
+            pygame.surfarray.blit_array(screen.subsurface(rect), self._pixels)
+            return [rect]
+        
+        for x, y in changed.tolist():
+            index = wanted[x, y]
+            blocks[x, :, y, :] = tiles[index + offset] if index else base[x, :, y, :]
+        # На экран выводится только прямоугольник вокруг изменившихся клеток
+        cell_size = self.cell_size
+        left, top = (changed.min(axis=0) * cell_size).tolist()
+        right, bottom = ((changed.max(axis=0) + 1) * cell_size).tolist()
+        dirty = pygame.Rect(offset_x + left, offset_y + top, right - left, bottom - top)
+        pygame.surfarray.blit_array(screen.subsurface(dirty), self._pixels[left:right, top:bottom])
+        return [dirty]
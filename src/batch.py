@@ -0,0 +1,209 @@
+# Пакетный симулятор: тысячи полей тетриса одновременно на NumPy
+
+import numpy as np
+
+from src.pieces import ORIENTATIONS, SHAPE_NAMES
+
+# Таблицы поворотов по индексу фигуры (порядок SHAPE_NAMES) и номеру поворота
+_MAX_PIECE_SIZE = 4
+PIECE_MASKS = np.zeros((len(SHAPE_NAMES), 4, _MAX_PIECE_SIZE), dtype=np.int64)
+PIECE_WIDTHS = np.zeros((len(SHAPE_NAMES), 4), dtype=np.int64)
+PIECE_HEIGHTS = np.zeros((len(SHAPE_NAMES), 4), dtype=np.int64)
+# Нижняя клетка в каждой колонке фигуры (-1 если колонки нет)
+PIECE_BOTTOMS = np.full((len(SHAPE_NAMES), 4, _MAX_PIECE_SIZE), -1, dtype=np.int64)
+
+for _shape_idx, _name in enumerate(SHAPE_NAMES):
+    for _rotation, _orientation in enumerate(ORIENTATIONS[_name]):
+        PIECE_MASKS[_shape_idx, _rotation, :_orientation.height] = _orientation.row_masks
+        PIECE_WIDTHS[_shape_idx, _rotation] = _orientation.width
+        PIECE_HEIGHTS[_shape_idx, _rotation] = _orientation.height
+        PIECE_BOTTOMS[_shape_idx, _rotation, :_orientation.width] = _orientation.bottom
+
+
+class BatchBoards:
+    """
+    N независимых игр, которые продвигаются векторными операциями.
+    
+    Поле хранится как массив масок строк формы (N, height), бит i - колонка i,
+    как в Board.rows. Правила столкновений, удаления линий и подсчета очков
+    совпадают с Board и GameState.
+    """
+    
+    def __init__(self, count: int, width: int = 10, height: int = 20):
+        """
+        Args:
+            count: Количество полей
+            width: Ширина поля в клетках (не больше 62)
+            height: Высота поля в клетках
+        """
+        if not 0 < width <= 62:
+            raise ValueError("width must be between 1 and 62")
+        self.count = count
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1
+        self._index = np.arange(count)
+        self._columns = np.arange(width, dtype=np.int64)
+        self.reset()
+    
+    def reset(self):
+        """Очищает все поля и обнуляет счет."""
+        self.rows = np.zeros((self.count, self.height), dtype=np.int64)
+        self.score = np.zeros(self.count, dtype=np.int64)
+        self.level = np.ones(self.count, dtype=np.int64)
+        self.lines_cleared = np.zeros(self.count, dtype=np.int64)
+        self.fall_speed = np.full(self.count, 500, dtype=np.int64)
+        self.pieces_placed = np.zeros(self.count, dtype=np.int64)
+        self.game_over = np.zeros(self.count, dtype=bool)
+    
+    def spawn_x(self, shapes) -> np.ndarray:
+        """Колонка появления фигуры (как в GameState._spawn_new_piece)."""
+        return self.width // 2 - PIECE_WIDTHS[shapes, 0] // 2
+    
+    def column_tops(self) -> np.ndarray:
+        """
+        Возвращает верхнюю занятую строку каждой колонки.
+        
+        Returns:
+            Массив (N, width); height для пустых колонок
+        """
+        filled = ((self.rows[:, :, None] >> self._columns) & 1).astype(bool)
+        return np.where(filled.any(axis=1), filled.argmax(axis=1), self.height)
+    
+    def can_place(self, shapes, rotations, xs, ys) -> np.ndarray:
+        """
+        Векторная версия Board.can_place_piece.
+        
+        Args:
+            shapes: Индексы фигур (N,)
+            rotations: Номера поворотов (N,)
+            xs: Координаты X левого верхнего угла (N,)
+            ys: Координаты Y левого верхнего угла (N,)
+        
+        Returns:
+            Булев массив (N,)
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        ok = (xs >= 0) & (xs + PIECE_WIDTHS[shapes, rotations] <= self.width)
+        ok &= ys + PIECE_HEIGHTS[shapes, rotations] <= self.height
+        shift = np.where(ok, xs, 0)
+        for row_idx in range(_MAX_PIECE_SIZE):
+            board_y = ys + row_idx
+            inside = (board_y >= 0) & (board_y < self.height)
+            board_rows = self.rows[self._index, np.clip(board_y, 0, self.height - 1)]
+            masks = PIECE_MASKS[shapes, rotations, row_idx] << shift
+            ok &= ~inside | ((board_rows & masks) == 0)
+        return ok
+    
+    def landing_y(self, shapes, rotations, xs) -> np.ndarray:
+        """
+        Строка, на которой остановится фигура, брошенная сверху в колонку x.
+        
+        Как в Board.drop_y: строка вычисляется по вершинам колонок и нижнему
+        профилю фигуры, а если фигура помещается в верхней строке, но профиль
+        выше неё (фигура под навесом), фигура опускается построчной проверкой
+        can_place.
+        
+        Returns:
+            Массив (N,); отрицательное значение - фигура не помещается
+        """
+        shapes = np.asarray(shapes, dtype=np.int64)
+        rotations = np.asarray(rotations, dtype=np.int64)
+        xs = np.asarray(xs, dtype=np.int64)
+        tops = self.column_tops()
+        bottoms = PIECE_BOTTOMS[shapes, rotations]
+        landing = np.full(self.count, self.height, dtype=np.int64)
+        for col_idx in range(_MAX_PIECE_SIZE):
+            column = np.clip(xs + col_idx, 0, self.width - 1)
+            limit = tops[self._index, column] - bottoms[:, col_idx] - 1
+            landing = np.where(bottoms[:, col_idx] >= 0, np.minimum(landing, limit), landing)
+        
+        under = landing < 0
+        if under.any():
+            probing = under & self.can_place(shapes, rotations, xs, np.zeros(self.count, dtype=np.int64))
+            landing[probing] = 0
+            while probing.any():
+                probing &= self.can_place(shapes, rotations, xs, landing + 1)
+                landing += probing
+        return landing
+    
+    def place(self, shapes, rotations, xs, ys) -> np.ndarray:
+        """
+        Размещает фигуры и удаляет заполненные линии во всех активных играх.
+        
+        Координаты должны быть допустимы (см. can_place и landing_y);
+        игры с game_over пропускаются.
+        
+        Returns:
+            Количество удаленных линий для каждого поля (N,)
+        """
+        shapes = np.asarray(shapes, dtype=np.int64)
+        rotations = np.asarray(rotations, dtype=np.int64)
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        active = ~self.game_over
+        
+        # Размещение: OR сдвинутых масок в строки полей
+        for row_idx in range(_MAX_PIECE_SIZE):
+            board_y = ys + row_idx
+            masks = PIECE_MASKS[shapes, rotations, row_idx] << np.maximum(xs, 0)
+            write = active & (masks != 0) & (board_y >= 0) & (board_y < self.height)
+            boards = self._index[write]
+            self.rows[boards, board_y[write]] |= masks[write]
+        self.pieces_placed += active
+        
+        cleared = self.clear_lines()
+        self._score(cleared)
+        return cleared
+    
+    def drop(self, shapes, rotations, xs) -> np.ndarray:
+        """
+        Бросает фигуры вниз в колонки xs и фиксирует их.
+        
+        Игры, в которых фигура не помещается на поле, заканчиваются.
+        
+        Returns:
+            Количество удаленных линий для каждого поля (N,)
+        """
+        shapes = np.asarray(shapes, dtype=np.int64)
+        rotations = np.asarray(rotations, dtype=np.int64)
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = self.landing_y(shapes, rotations, xs)
+        self.game_over |= ys < 0
+        return self.place(shapes, rotations, xs, ys)
+    
+    def check_spawn(self, shapes):
+        """Заканчивает игры, в которых новая фигура не помещается в точке появления."""
+        shapes = np.asarray(shapes, dtype=np.int64)
+        rotations = np.zeros_like(shapes)
+        zeros = np.zeros(self.count, dtype=np.int64)
+        self.game_over |= ~self.can_place(shapes, rotations, self.spawn_x(shapes), zeros)
+    
+    def clear_lines(self) -> np.ndarray:
+        """
+        Удаляет заполненные линии на всех полях.
+        
+        Returns:
+            Количество удаленных линий для каждого поля (N,)
+        """
+        full = self.rows == self.full_row
+        cleared = full.sum(axis=1)
+        boards = np.flatnonzero(cleared)
+        if boards.size:
+            # Устойчивая сортировка поднимает полные строки наверх,
+            # сохраняя порядок остальных; затем полные строки обнуляются
+            order = np.argsort(~full[boards], axis=1, kind='stable')
+            compacted = np.take_along_axis(self.rows[boards], order, axis=1)
+            compacted[np.arange(self.height) < cleared[boards, None]] = 0
+            self.rows[boards] = compacted
+        return cleared
+    
+    def _score(self, cleared):
+        """Начисляет очки как GameState._lock_piece."""
+        self.lines_cleared += cleared
+        # Подсчет очков: 100 * (количество линий ^ 2) * уровень
+        self.score += 100 * cleared ** 2 * self.level
+        # Увеличение уровня каждые 10 линий и ускорение игры
+        self.level = self.lines_cleared // 10 + 1
+        self.fall_speed = np.maximum(50, 500 - (self.level - 1) * 50)
@@ -1,6 +1,49 @@
-# Игровое поле тетриса
+# Игровое поле тетриса (без графики: отрисовка в src/renderer.py)
 
-import pygame
+
+def popcount(value: int) -> int:
+    """Количество установленных битов."""
+    return bin(value).count('1')
+
+
+def column_heights(rows, width: int) -> list:
+    """
+    Вычисляет высоты колонок по маскам строк.
+    
+    Args:
+        rows: Маски строк поля сверху вниз
+        width: Ширина поля
+    
+    Returns:
+        Список высот колонок (0 - пустая колонка)
+    """
+    heights = [0] * width
+    full_row = (1 << width) - 1
+    height = len(rows)
+    seen = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        if new:
+            seen |= new
+            while new:
+                low_bit = new & -new
+                heights[low_bit.bit_length() - 1] = height - y
+                new ^= low_bit
+            if seen == full_row:
+                break
+    return heights
+
+
+def count_holes(rows, width: int) -> int:
+    """Количество пустых клеток, над которыми есть заполненные."""
+    covered = 0
+    holes = 0
+    # Маски дыр всех строк склеиваются в одно число: один подсчет битов на поле
+    for row in rows:
+        if covered:
+            holes = (holes << width) | (covered & ~row)
+        covered |= row
+    return popcount(holes)
 
 
 class Board:
@@ -18,56 +61,111 @@ class Board:
         self.width = width
         self.height = height
         self.cell_size = cell_size
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
+        # Цветовая плоскость: индекс цвета для каждой клетки (0 - пусто).
+        # Пустые строки ссылаются на одну общую строку (она никогда не меняется),
+        # поэтому память на больших полях растет только с числом занятых строк
+        self._empty_row = [0] * width
+        self.grid = [self._empty_row] * height
+        # Битовая плоскость: одна целочисленная маска на строку (бит i - колонка i)
+        self.rows = [0] * height
+        # Маска полностью заполненной строки
+        self.full_row = (1 << width) - 1
+        
+        # Статистика поля, обновляемая при размещении и удалении линий
+        self._row_counts = [0] * height  # Заполненных клеток в строке
+        self._heights = [0] * width  # Высота каждой колонки
+        self._holes = 0  # Пустых клеток под верхом своей колонки
         
         # Размеры поля в пикселях
         self.pixel_width = width * cell_size
         self.pixel_height = height * cell_size
     
-    def draw(self, screen: pygame.Surface, offset_x: int, offset_y: int):
+    @property
+    def column_heights(self) -> tuple:
+        """Высоты колонок (0 - пустая колонка)."""
+        return tuple(self._heights)
+    
+    @property
+    def top(self) -> int:
+        """Индекс верхней занятой строки (height для пустого поля)."""
+        return self.height - max(self._heights)
+    
+    @property
+    def row_counts(self) -> tuple:
+        """Количество заполненных клеток в каждой строке."""
+        return tuple(self._row_counts)
+    
+    @property
+    def holes(self) -> int:
+        """Количество пустых клеток, над которыми есть заполненные."""
+        return self._holes
+    
+    def snapshot(self) -> tuple:
         """
-        Отрисовка игрового поля с сеткой.
+        Снимок поля для последующего restore.
         
-        Args:
-            screen: Поверхность для отрисовки
-            offset_x: Смещение по X в пикселях
-            offset_y: Смещение по Y в пикселях
-        """
-        # Рисуем фон поля
-        board_rect = pygame.Rect(offset_x, offset_y, self.pixel_width, self.pixel_height)
-        pygame.draw.rect(screen, (0, 0, 0), board_rect)
-        pygame.draw.rect(screen, (100, 100, 100), board_rect, 2)
-        
-        # Рисуем сетку
-        for x in range(self.width + 1):
-            start_pos = (offset_x + x * self.cell_size, offset_y)
-            end_pos = (offset_x + x * self.cell_size, offset_y + self.pixel_height)
-            pygame.draw.line(screen, (50, 50, 50), start_pos, end_pos, 1)
-        
-        for y in range(self.height + 1):
-            start_pos = (offset_x, offset_y + y * self.cell_size)
-            end_pos = (offset_x + self.pixel_width, offset_y + y * self.cell_size)
-            pygame.draw.line(screen, (50, 50, 50), start_pos, end_pos, 1)
+        Копируются только занятые строки (от top до дна) списков масок,
+        счетчиков и ссылок на строки цветов: строки над стопкой пусты,
+        а сами строки цветов не меняются на месте (place_piece копирует
+        изменяемую строку), поэтому разделяются между полем и снимками.
+        """
+        top = self.top
+        return (top, self.rows[top:], self.grid[top:], self._row_counts[top:],
+                self._heights[:], self._holes)
+    
+    def restore(self, snapshot: tuple):
+        """
+        Возвращает поле того же размера к состоянию снимка (снимок можно
+        использовать повторно).
+        """
+        top, rows, grid, row_counts, heights, holes = snapshot
+        # Строки между текущей вершиной стопки и вершиной снимка очищаются
+        current_top = self.top
+        if current_top < top:
+            self.rows[current_top:top] = [0] * (top - current_top)
+            self.grid[current_top:top] = [self._empty_row] * (top - current_top)
+            self._row_counts[current_top:top] = [0] * (top - current_top)
+        self.rows[top:] = rows
+        self.grid[top:] = grid
+        self._row_counts[top:] = row_counts
+        self._heights[:] = heights
+        self._holes = holes
     
-    def draw_cell(self, screen: pygame.Surface, x: int, y: int, color: tuple, 
-                  offset_x: int, offset_y: int):
+    @staticmethod
+    def piece_masks(piece_matrix) -> tuple:
         """
-        Отрисовка одной клетки на поле.
+        Возвращает битовые маски строк фигуры.
         
         Args:
-            screen: Поверхность для отрисовки
-            x: Координата X в клетках
-            y: Координата Y в клетках
-            color: Цвет клетки (RGB)
-            offset_x: Смещение по X в пикселях
-            offset_y: Смещение по Y в пикселях
-        """
-        if 0 <= x < self.width and 0 <= y < self.height:
-            pixel_x = offset_x + x * self.cell_size
-            pixel_y = offset_y + y * self.cell_size
-            rect = pygame.Rect(pixel_x, pixel_y, self.cell_size, self.cell_size)
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, (255, 255, 255), rect, 1)  # Белая обводка
+            piece_matrix: Orientation или матрица фигуры
+        
+        Returns:
+            Кортеж масок (бит i - колонка i матрицы)
+        """
+        # Orientation хранит маски заранее вычисленными
+        row_masks = getattr(piece_matrix, 'row_masks', None)
+        if row_masks is not None:
+            return row_masks
+        return tuple(
+            sum(1 << col_idx for col_idx, cell in enumerate(row) if cell)
+            for row in piece_matrix
+        )
+    
+    def _shift_mask(self, mask: int, x: int) -> int:
+        """
+        Сдвигает маску строки фигуры в колонку x.
+        
+        Returns:
+            Сдвинутая маска или -1, если фигура выходит за стенки поля
+        """
+        if x >= 0:
+            shifted = mask << x
+            if shifted > self.full_row:
+                return -1
+            return shifted
+        if mask & ((1 << -x) - 1):
+            return -1
+        return mask >> -x
     
     def can_place_piece(self, piece_matrix, x: int, y: int) -> bool:
         """
@@ -81,20 +179,53 @@ class Board:
         Returns:
             True если можно разместить, False иначе
         """
-        for row_idx, row in enumerate(piece_matrix):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Если клетка заполнена
-                    board_x = x + col_idx
-                    board_y = y + row_idx
-                    
-                    # Проверка границ
-                    if board_x < 0 or board_x >= self.width or board_y >= self.height:
-                        return False
-                    # Проверка столкновения с уже размещенными фигурами
-                    if board_y >= 0 and self.grid[board_y][board_x] != 0:
-                        return False
+        rows = self.rows
+        board_y = y
+        for mask in self.piece_masks(piece_matrix):
+            if mask:
+                shifted = self._shift_mask(mask, x)
+                # Проверка границ
+                if shifted < 0 or board_y >= self.height:
+                    return False
+                # Проверка столкновения с уже размещенными фигурами
+                if board_y >= 0 and rows[board_y] & shifted:
+                    return False
+            board_y += 1
         return True
     
+    def drop_y(self, piece_matrix, x: int, y: int) -> int:
+        """
+        Строка, на которой остановится фигура, падающая из положения (x, y).
+        
+        Для Orientation строка вычисляется за O(ширины фигуры) по высотам
+        колонок и нижнему профилю фигуры. Если фигура уже ниже вершины
+        какой-либо колонки (задвинута под навес), профиль неприменим и
+        используется построчная проверка can_place_piece.
+        
+        Args:
+            piece_matrix: Orientation или матрица фигуры (положение (x, y) допустимо)
+            x: Координата X левого верхнего угла фигуры
+            y: Координата Y левого верхнего угла фигуры
+        
+        Returns:
+            Координата Y фигуры после падения
+        """
+        bottom = getattr(piece_matrix, 'bottom', None)
+        if bottom is not None:
+            heights = self._heights
+            landing = self.height
+            for dx, cell_y in enumerate(bottom):
+                if cell_y >= 0:
+                    # Вершина колонки - первая занятая строка (height, если колонка пуста)
+                    limit = self.height - heights[x + dx] - cell_y - 1
+                    if limit < landing:
+                        landing = limit
+            if landing >= y:
+                return landing
+        while self.can_place_piece(piece_matrix, x, y + 1):
+            y += 1
+        return y
+    
     def place_piece(self, piece_matrix, x: int, y: int, color_index: int):
         """
         Размещает фигуру на поле.
@@ -105,13 +236,31 @@ class Board:
             y: Координата Y левого верхнего угла фигуры
             color_index: Индекс цвета для сохранения в grid
         """
-        for row_idx, row in enumerate(piece_matrix):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Если клетка заполнена
-                    board_x = x + col_idx
-                    board_y = y + row_idx
-                    if 0 <= board_x < self.width and 0 <= board_y < self.height:
-                        self.grid[board_y][board_x] = color_index
+        for row_idx, mask in enumerate(self.piece_masks(piece_matrix)):
+            board_y = y + row_idx
+            if not mask or not 0 <= board_y < self.height:
+                continue
+            # Клетки за стенками поля отбрасываются
+            shifted = (mask << x if x >= 0 else mask >> -x) & self.full_row
+            new_cells = shifted & ~self.rows[board_y]
+            self.rows[board_y] |= shifted
+            # Копирование при записи: строки цветов могут разделяться со снимками
+            grid_row = self.grid[board_y] = self.grid[board_y][:]
+            cell_height = self.height - board_y
+            while shifted:
+                low_bit = shifted & -shifted
+                col = low_bit.bit_length() - 1
+                grid_row[col] = color_index
+                shifted ^= low_bit
+                if low_bit & new_cells:
+                    # Обновляем статистику только для ранее пустых клеток
+                    self._row_counts[board_y] += 1
+                    top = self._heights[col]
+                    if cell_height > top:
+                        self._holes += cell_height - top - 1
+                        self._heights[col] = cell_height
+                    else:
+                        self._holes -= 1
     
     def clear_lines(self) -> int:
         """
@@ -120,32 +269,26 @@ class Board:
         Returns:
             Количество удаленных линий
         """
-        lines_to_remove = []
+        counts = self._row_counts
+        width = self.width
+        # Пустые строки над стопкой не просматриваются
+        top = self.top
+        # Строка заполнена, если число клеток в ней равно ширине поля
+        if width not in counts[top:]:
+            return 0
         
-        # Находим полностью заполненные линии
-        for y in range(self.height):
-            if all(cell != 0 for cell in self.grid[y]):  # Все клетки заполнены
-                lines_to_remove.append(y)
+        # Оставляем только незаполненные строки и добавляем пустые сверху
+        keep = [y for y in range(top, self.height) if counts[y] != width]
+        cleared = self.height - top - len(keep)
+        rows = self.rows
+        grid = self.grid
+        rows[top:] = [0] * cleared + [rows[y] for y in keep]
+        grid[top:] = [self._empty_row] * cleared + [grid[y] for y in keep]
+        counts[top:] = [0] * cleared + [counts[y] for y in keep]
         
-        # Удаляем заполненные линии (снизу вверх)
-        for y in reversed(lines_to_remove):
-            del self.grid[y]
-            self.grid.insert(0, [0 for _ in range(self.width)])
+        # Высоты и дыры пересчитываются по маскам занятых строк (только при удалении линий)
+        occupied = rows[top + cleared:]
+        self._heights[:] = column_heights(occupied, width)
+        self._holes = count_holes(occupied, width)
         
-        return len(lines_to_remove)
-    
-    def draw_grid(self, screen: pygame.Surface, offset_x: int, offset_y: int, colors: dict):
-        """
-        Отрисовывает размещенные фигуры на поле.
-        
-        Args:
-            screen: Поверхность для отрисовки
-            offset_x: Смещение по X в пикселях
-            offset_y: Смещение по Y в пикселях
-            colors: Словарь цветов (по индексам)
-        """
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] != 0:
-                    color = colors.get(self.grid[y][x], (255, 255, 255))
-                    self.draw_cell(screen, x, y, color, offset_x, offset_y)
+        return cleared
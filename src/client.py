@@ -0,0 +1,123 @@
+# Клиент игрового сервера: зеркало сессий по кадрам и дельтам
+
+import asyncio
+
+from src.server import encode_message, decode_message, grid_checksum
+
+# Поля сессии, которые приходят в кадрах и дельтах помимо клеток
+SESSION_FIELDS = ('piece', 'next', 'score', 'level', 'lines', 'game_over')
+
+
+class SessionMirror:
+    """Копия состояния сессии на стороне клиента, собранная из кадра и дельт."""
+    
+    def __init__(self, frame: dict):
+        """
+        Args:
+            frame: Сообщение "frame" от сервера
+        """
+        self.session = frame['session']
+        self.width = frame['width']
+        self.height = frame['height']
+        self.grid = [[0] * self.width for _ in range(self.height)]
+        self.fields = {}
+        self.apply(frame)
+    
+    def apply(self, message: dict):
+        """Применяет кадр или дельту: клетки и изменившиеся поля."""
+        grid = self.grid
+        for x, y, value in message.get('cells', ()):
+            grid[y][x] = value
+        for key in SESSION_FIELDS:
+            if key in message:
+                self.fields[key] = message[key]
+    
+    def checksum(self) -> int:
+        """Контрольная сумма поля (сравнивается с ответом "sync" сервера)."""
+        return grid_checksum(self.grid)
+
+
+class GameClient:
+    """
+    Клиент протокола сервера (src.server).
+    
+    Используется как локальная замена настоящего клиента: для проверки
+    сервера из конца в конец и для нагрузочных ботов.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.session = None  # Сессия, которой управляет клиент
+        self.mirrors = {}  # Номер сессии -> SessionMirror
+        self.desyncs = 0  # Расхождений зеркала с сервером по ответам "sync"
+        self.errors = []
+    
+    @classmethod
+    async def connect(cls, host: str, port: int) -> 'GameClient':
+        """Подключается к серверу."""
+        # Кадры больших полей длиннее лимита строки по умолчанию
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 22)
+        return cls(reader, writer)
+    
+    def send(self, op: str, **fields):
+        """Отправляет операцию серверу (без ожидания ответа)."""
+        self.writer.write(encode_message({'op': op, **fields}))
+    
+    async def receive(self) -> dict:
+        """
+        Читает одно сообщение и применяет его к зеркалам.
+        
+        Raises:
+            ConnectionError: Если сервер закрыл соединение
+        """
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        message = decode_message(line)
+        kind = message.get('type')
+        if kind == 'frame':
+            self.mirrors[message['session']] = SessionMirror(message)
+        elif kind == 'delta':
+            self.mirrors[message['session']].apply(message)
+        elif kind == 'created':
+            self.session = message['session']
+        elif kind == 'sync':
+            mirror = self.mirrors[message['session']]
+            if (mirror.checksum() != message['checksum']
+                    or mirror.fields['score'] != message['score']):
+                self.desyncs += 1
+        elif kind == 'error':
+            self.errors.append(message['message'])
+        return message
+    
+    async def wait_for(self, kind: str) -> dict:
+        """Читает сообщения до первого сообщения типа kind."""
+        while True:
+            message = await self.receive()
+            if message.get('type') == kind:
+                return message
+    
+    async def play(self, seed: int = None, mode: str = None) -> int:
+        """
+        Создает сессию на сервере и ждет её первый кадр.
+        
+        Returns:
+            Номер сессии
+        """
+        fields = {}
+        if seed is not None:
+            fields['seed'] = seed
+        if mode is not None:
+            fields['mode'] = mode
+        self.send('play', **fields)
+        await self.wait_for('frame')
+        return self.session
+    
+    async def close(self):
+        """Закрывает соединение."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
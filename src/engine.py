@@ -0,0 +1,326 @@
+# Игровое ядро тетриса без графики (не зависит от pygame)
+
+from collections import deque
+
+from src.pieces import PieceGenerator, COLOR_INDEXES
+from src.board import Board
+
+# Действия игрока для GameState.step
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_DOWN = 3
+ACTION_ROTATE = 4
+ACTION_HARD_DROP = 5
+
+
+# Скалярные поля состояния, которые сохраняет снимок
+_SCALAR_FIELDS = (
+    'score', 'level', 'lines_cleared', 'pieces_placed', 'game_over', 'fall_time', 'fall_speed',
+    'current_shape_name', 'current_shape_matrix', 'current_color', 'current_color_index',
+    'next_shape_name', 'next_shape_matrix', 'next_color', 'next_color_index',
+    'piece_x', 'piece_y',
+)
+
+
+class Snapshot:
+    """Снимок состояния игры: скалярные поля, снимок поля и позиция в истории фигур."""
+    
+    __slots__ = _SCALAR_FIELDS + ('board', 'history_length')
+
+
+class GameState:
+    """Состояние и правила игры Тетрис без отрисовки и обработки событий."""
+    
+    __slots__ = _SCALAR_FIELDS + (
+        'width', 'height', 'generator', 'version', 'board', 'piece_history', 'undo_stack',
+        '_ghost_key', '_ghost_y',
+    )
+    
+    def __init__(self, width: int = 10, height: int = 20, generator: PieceGenerator = None,
+                 undo_limit: int = 0):
+        """
+        Инициализация игры.
+        
+        Args:
+            width: Ширина поля в клетках (колонки)
+            height: Высота поля в клетках (строки)
+            generator: Генератор фигур; по умолчанию - равномерный со случайным зерном
+            undo_limit: Сколько последних фиксаций фигур можно отменить (0 - без отмены)
+        """
+        self.width = width
+        self.height = height
+        self.generator = generator if generator is not None else PieceGenerator()
+        # Снимки перед фиксацией фигур (для undo)
+        self.undo_stack = deque(maxlen=undo_limit) if undo_limit else None
+        # Кэш строки падения: (поворот, x) -> y; сбрасывается при изменении поля
+        self._ghost_key = None
+        self._ghost_y = 0
+        # Счетчик изменений видимого состояния (для пропуска отрисовки)
+        self.version = 0
+        self.reset()
+    
+    def reset(self):
+        """Начинает новую игру."""
+        self.board = Board(self.width, self.height)
+        self.version += 1
+        self._ghost_key = None
+        
+        # Имена фигур, извлеченных из генератора в этой игре
+        self.piece_history = []
+        if self.undo_stack is not None:
+            self.undo_stack.clear()
+        
+        # Игровые переменные
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.game_over = False
+        
+        # Таймер для падения фигуры
+        self.fall_time = 0
+        self.fall_speed = 500  # Миллисекунды между падениями
+        
+        # Инициализация фигур (сначала создаем следующую фигуру)
+        self.next_shape_name, self.next_shape_matrix, self.next_color = self.generator.next()
+        self.next_color_index = COLOR_INDEXES[self.next_shape_name]
+        self.piece_history.append(self.next_shape_name)
+        
+        # Затем создаем текущую фигуру
+        self._spawn_new_piece()
+    
+    def _spawn_new_piece(self):
+        """Создает новую фигуру из очереди следующей фигуры."""
+        # Текущая фигура становится следующей
+        self.current_shape_name = self.next_shape_name
+        self.current_shape_matrix = self.next_shape_matrix  # Orientation неизменяем, копия не нужна
+        self.current_color = self.next_color
+        self.current_color_index = self.next_color_index
+        
+        # Генерируем новую следующую фигуру
+        self.next_shape_name, self.next_shape_matrix, self.next_color = self.generator.next()
+        self.next_color_index = COLOR_INDEXES[self.next_shape_name]
+        self.piece_history.append(self.next_shape_name)
+        
+        # Устанавливаем позицию новой фигуры
+        self.piece_x = self.width // 2 - len(self.current_shape_matrix[0]) // 2
+        self.piece_y = 0
+        self.version += 1
+        
+        # Проверяем Game Over (если нельзя разместить новую фигуру)
+        if not self.board.can_place_piece(self.current_shape_matrix, self.piece_x, self.piece_y):
+            self.game_over = True
+    
+    def _lock_piece(self) -> int:
+        """
+        Фиксирует текущую фигуру на поле.
+        
+        Returns:
+            Количество удаленных линий
+        """
+        if self.undo_stack is not None:
+            self.undo_stack.append(self.snapshot())
+        
+        # Размещаем фигуру на поле
+        self.board.place_piece(self.current_shape_matrix, self.piece_x, self.piece_y, self.current_color_index)
+        self.pieces_placed += 1
+        self._ghost_key = None
+        
+        # Очищаем заполненные линии
+        cleared = self.board.clear_lines()
+        if cleared > 0:
+            self.lines_cleared += cleared
+            # Подсчет очков: 100 * (количество линий ^ 2) * уровень
+            self.score += 100 * (cleared ** 2) * self.level
+            # Увеличение уровня каждые 10 линий
+            self.level = self.lines_cleared // 10 + 1
+            # Ускорение игры с уровнем
+            self.fall_speed = max(50, 500 - (self.level - 1) * 50)
+        
+        # Создаем новую фигуру
+        self._spawn_new_piece()
+        return cleared
+    
+    def snapshot(self) -> Snapshot:
+        """
+        Снимок состояния для ветвления (поиск ИИ) и отмены ходов.
+        
+        Скалярные поля копируются по ссылке, поле - через Board.snapshot.
+        """
+        snapshot = Snapshot()
+        for field in _SCALAR_FIELDS:
+            setattr(snapshot, field, getattr(self, field))
+        snapshot.board = self.board.snapshot()
+        snapshot.history_length = len(self.piece_history)
+        return snapshot
+    
+    def restore(self, snapshot: Snapshot):
+        """
+        Возвращает состояние к снимку, сделанному ранее в этой же игре.
+        
+        Фигуры, извлеченные из генератора после снимка, возвращаются в его
+        очередь, поэтому дальнейшая последовательность фигур не меняется.
+        """
+        for field in _SCALAR_FIELDS:
+            setattr(self, field, getattr(snapshot, field))
+        self.board.restore(snapshot.board)
+        self._ghost_key = None
+        drawn = self.piece_history[snapshot.history_length:]
+        del self.piece_history[snapshot.history_length:]
+        for shape_name in reversed(drawn):
+            self.generator.unget(shape_name)
+        self.version += 1
+    
+    def undo(self) -> bool:
+        """
+        Отменяет последнюю фиксацию фигуры (включая удаление линий).
+        
+        Фигура возвращается в положение перед фиксацией.
+        
+        Returns:
+            True если было что отменять
+        """
+        if not self.undo_stack:
+            return False
+        self.restore(self.undo_stack.pop())
+        return True
+    
+    def place(self, orientation, x: int, y: int) -> int:
+        """
+        Ставит текущую фигуру в заданное положение и фиксирует её.
+        
+        Используется ИИ и симуляциями, которые выбирают конечное положение
+        фигуры сразу, без пошагового управления.
+        
+        Args:
+            orientation: Поворот текущей фигуры (Orientation)
+            x: Координата X левого верхнего угла фигуры
+            y: Координата Y левого верхнего угла фигуры
+        
+        Returns:
+            Количество удаленных линий
+        """
+        self.current_shape_matrix = orientation
+        self.piece_x = x
+        self.piece_y = y
+        return self._lock_piece()
+    
+    def move(self, dx: int) -> bool:
+        """
+        Сдвигает фигуру по горизонтали.
+        
+        Returns:
+            True если фигура сдвинулась
+        """
+        if self.board.can_place_piece(self.current_shape_matrix, self.piece_x + dx, self.piece_y):
+            self.piece_x += dx
+            self.version += 1
+            return True
+        return False
+    
+    def rotate(self) -> bool:
+        """
+        Поворачивает фигуру по часовой стрелке.
+        
+        Returns:
+            True если поворот удался
+        """
+        rotated = self.current_shape_matrix.rotated
+        if self.board.can_place_piece(rotated, self.piece_x, self.piece_y):
+            self.current_shape_matrix = rotated
+            self.version += 1
+            return True
+        return False
+    
+    @property
+    def ghost_y(self) -> int:
+        """
+        Строка, на которой остановится текущая фигура (тень фигуры).
+        
+        Кэшируется, пока фигура не сдвинется по горизонтали, не повернется
+        или не изменится поле; падение фигуры кэш не сбрасывает.
+        """
+        key = (self.current_shape_matrix, self.piece_x)
+        if key != self._ghost_key:
+            self._ghost_y = self.board.drop_y(self.current_shape_matrix, self.piece_x, self.piece_y)
+            self._ghost_key = key
+        return self._ghost_y
+    
+    def hard_drop(self) -> int:
+        """
+        Сбрасывает фигуру вниз до упора и сразу фиксирует её.
+        
+        Returns:
+            Количество удаленных линий
+        """
+        self.piece_y = self.ghost_y
+        return self._lock_piece()
+    
+    def soft_drop(self) -> int:
+        """
+        Опускает фигуру на одну строку или фиксирует её, если ниже места нет.
+        
+        Returns:
+            Количество удаленных линий
+        """
+        if self.board.can_place_piece(self.current_shape_matrix, self.piece_x, self.piece_y + 1):
+            self.piece_y += 1
+            self.version += 1
+            return 0
+        return self._lock_piece()
+    
+    def update(self, dt: int) -> int:
+        """
+        Продвигает таймер падения фигуры.
+        
+        Остаток времени сохраняется, поэтому за один вызов фигура может
+        опуститься на несколько строк (на высоких уровнях или при большом dt).
+        
+        Args:
+            dt: Прошедшее время в миллисекундах
+        
+        Returns:
+            Количество удаленных линий
+        """
+        if self.game_over:
+            return 0
+        
+        self.fall_time += dt
+        
+        # Падение фигуры с течением времени
+        cleared = 0
+        while self.fall_time >= self.fall_speed and not self.game_over:
+            self.fall_time -= self.fall_speed
+            cleared += self.soft_drop()
+        return cleared
+    
+    def step(self, action: int = ACTION_NONE, dt: int = 0) -> int:
+        """
+        Выполняет действие игрока и продвигает время.
+        
+        Args:
+            action: Одна из констант ACTION_*
+            dt: Прошедшее время в миллисекундах
+        
+        Returns:
+            Количество удаленных линий за шаг
+        """
+        if self.game_over:
+            return 0
+        
+        cleared = 0
+        if action == ACTION_LEFT:
+            self.move(-1)
+        elif action == ACTION_RIGHT:
+            self.move(1)
+        elif action == ACTION_DOWN:
+            cleared = self.soft_drop()
+        elif action == ACTION_ROTATE:
+            self.rotate()
+        elif action == ACTION_HARD_DROP:
+            cleared = self.hard_drop()
+        
+        if dt:
+            cleared += self.update(dt)
+        return cleared
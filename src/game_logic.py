@@ -1,24 +1,71 @@
-# Основная логика игры тетрис
+# Основная логика игры тетрис (pygame-оболочка над src/engine.py)
 
+import random
+import sys
+from time import perf_counter_ns
 import pygame
-from src.pieces import get_random_piece, rotate_piece, COLORS
-from src.board import Board
+from src.pieces import INDEX_COLORS, PieceGenerator
+from src.engine import GameState, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE, ACTION_HARD_DROP
+from src.renderer import BoardRenderer, CellSprites, RENDERER_SPRITES, RENDERER_ARRAY
+from src.ui import LazyFont, TextLabel, Overlay
+from src.replay import ReplayWriter
+from src.profiler import (FrameProfiler, PHASE_EVENTS, PHASE_UPDATE, PHASE_DRAW,
+                          PHASE_DRAW_BOARD, PHASE_DRAW_CELLS, PHASE_DRAW_PANEL,
+                          PHASE_DRAW_OVERLAY, STAGE_FIRST_FRAME)
+
+# Соответствие клавиш действиям игрока
+KEY_ACTIONS = {
+    pygame.K_LEFT: ACTION_LEFT,     # Движение влево
+    pygame.K_RIGHT: ACTION_RIGHT,   # Движение вправо
+    pygame.K_DOWN: ACTION_DOWN,     # Ускоренное падение
+    pygame.K_UP: ACTION_ROTATE,     # Поворот фигуры
+    pygame.K_SPACE: ACTION_HARD_DROP,  # Мгновенное падение
+}
+
+# Клавиша оверлея профилировщика
+PROFILER_KEY = pygame.K_F3
+
+# Клавиша отмены хода в режиме тренировки
+UNDO_KEY = pygame.K_BACKSPACE
 
 
 class Game:
     """Класс для управления игрой Тетрис."""
     
-    def __init__(self):
-        """Инициализация игры."""
+    def __init__(self, ai=None, generator=None, record_path=None, window_size=(800, 600),
+                 undo_limit: int = 0, board_size=(10, 20), renderer: str = RENDERER_SPRITES):
+        """
+        Инициализация игры.
+        
+        Args:
+            ai: ИИ-игрок (src.ai.AIPlayer) для автоигры вместо клавиатуры
+            generator: Генератор фигур (src.pieces.PieceGenerator) для
+                       воспроизводимых последовательностей
+            record_path: Путь для записи повтора первой игры (None - без записи)
+            window_size: Размер окна в пикселях (ширина, высота)
+            undo_limit: Глубина отмены ходов клавишей Backspace (режим
+                        тренировки; 0 - без отмены)
+            board_size: Размер поля в клетках (колонки, строки); поле, не
+                        помещающееся в окно, показывается через прокручиваемое окно
+            renderer: Отрисовка поля: RENDERER_SPRITES или RENDERER_ARRAY (нужен NumPy)
+        
+        Raises:
+            ValueError: Если запрошены одновременно запись повтора и отмена ходов
+                        или неизвестный способ отрисовки
+        """
         # Константы
-        self.WINDOW_WIDTH = 800
-        self.WINDOW_HEIGHT = 600
+        self.WINDOW_WIDTH, self.WINDOW_HEIGHT = window_size
         self.FPS = 60
+        self.SIM_STEP_MS = 10  # Фиксированный шаг симуляции
+        self.MAX_FRAME_MS = 250  # Ограничение времени кадра после зависаний
+        self.IDLE_WAIT_MS = 500  # Ожидание событий в режиме простоя
+        self.IDLE_POLL_MS = 50  # Опрос событий в простое в браузере (без блокирующего ожидания)
+        self.FRAME_BUDGET_MS = 12  # Бюджет кадра в браузере: остаток 16.7 мс остается браузеру
         self.BACKGROUND_COLOR = (20, 20, 50)  # Темно-синий цвет для тетриса
         
         # Параметры игрового поля
-        self.BOARD_WIDTH = 10  # Колонок
-        self.BOARD_HEIGHT = 20  # Строк
+        self.BOARD_WIDTH, self.BOARD_HEIGHT = board_size  # Колонок, строк
+        self.MIN_CELL_SIZE = 8  # Меньше клетки не уменьшаются: большое поле прокручивается
         
         # Расчет размера клетки так, чтобы поле занимало 2/3 экрана по ширине
         available_width = (self.WINDOW_WIDTH * 2) // 3
@@ -30,105 +77,143 @@ class Game:
         if self.CELL_SIZE > max_cell_size_by_height:
             self.CELL_SIZE = max_cell_size_by_height
         
-        # Создание игрового поля
-        self.board = Board(self.BOARD_WIDTH, self.BOARD_HEIGHT, self.CELL_SIZE)
+        # Поле не помещается: видна только часть, сколько влезает клеток минимального размера
+        view_width = view_height = None
+        if self.CELL_SIZE < self.MIN_CELL_SIZE:
+            self.CELL_SIZE = self.MIN_CELL_SIZE
+            view_width = available_width // self.CELL_SIZE
+            view_height = available_height // self.CELL_SIZE
+        
+        if renderer == RENDERER_ARRAY:
+            from src.array_renderer import ArrayBoardRenderer as renderer_class
+        elif renderer == RENDERER_SPRITES:
+            renderer_class = BoardRenderer
+        else:
+            raise ValueError(f"Неизвестный способ отрисовки: {renderer}")
+        
+        # Повтор не умеет отмену ходов
+        if record_path is not None and undo_limit:
+            raise ValueError("Запись повтора несовместима с отменой ходов")
+        
+        # Запись повтора требует известного зерна генератора фигур
+        if record_path is not None:
+            if generator is None:
+                generator = PieceGenerator()
+            if generator.seed is None:
+                generator.reset(random.getrandbits(63))
+        
+        # Состояние игры и отрисовка поля
+        self.state = GameState(self.BOARD_WIDTH, self.BOARD_HEIGHT, generator, undo_limit)
+        
+        # Время симуляции в миллисекундах (метки событий повтора)
+        self.sim_time = 0
+        self.recorder = None
+        if record_path is not None:
+            self.recorder = ReplayWriter(record_path, generator.seed, generator.mode,
+                                         self.BOARD_WIDTH, self.BOARD_HEIGHT)
+        self.ai = ai
+        self.renderer = renderer_class(self.BOARD_WIDTH, self.BOARD_HEIGHT, self.CELL_SIZE,
+                                       view_width, view_height)
         
         # Позиция поля на экране (ближе к центру, с местом справа для информации)
         self.INFO_PANEL_WIDTH = 250  # Место справа для панели информации
-        self.board_offset_x = (self.WINDOW_WIDTH - self.board.pixel_width - self.INFO_PANEL_WIDTH) // 2
+        self.INFO_PANEL_HEIGHT = 260  # Высота панели: счет, уровень, линии и следующая фигура
+        self.board_offset_x = (self.WINDOW_WIDTH - self.renderer.pixel_width - self.INFO_PANEL_WIDTH) // 2
         self.board_offset_y = 20  # Небольшой отступ сверху
         
         # Создание словаря цветов по индексам (для сохранения на поле)
-        self.color_index_map = {i + 1: list(COLORS.values())[i] for i in range(len(COLORS))}
-        
-        # Игровые переменные
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
-        self.game_over = False
-        
-        # Таймер для падения фигуры
-        self.fall_time = 0
-        self.fall_speed = 500  # Миллисекунды между падениями
-        
-        # Шрифты
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
-        
-        # Инициализация фигур (сначала создаем следующую фигуру)
-        self.next_shape_name, self.next_shape_matrix, self.next_color = get_random_piece()
-        self.next_color_index = list(COLORS.keys()).index(self.next_shape_name) + 1
-        
-        # Затем создаем текущую фигуру
-        self._spawn_new_piece()
+        self.color_index_map = INDEX_COLORS
+        
+        # Спрайты клеток для превью следующей фигуры
+        self.preview_sprites = CellSprites()
+        
+        # Кэш статичного фона (поле и сетка) и состояние последнего кадра
+        self._background = None
+        self._shown_game_over = None
+        self._shown_panel = None
+        self._drawn_version = None
+        
+        # Окно в фокусе (без фокуса игра на паузе)
+        self.focused = True
+        
+        # Профилировщик кадров (None - замеры выключены) и его оверлей
+        self.profiler = None
+        self.show_profiler = False
+        self.PROFILER_REFRESH_MS = 250  # Период обновления оверлея
+        self._profiler_shown_at = None
+        self._profiler_frames = 0  # Кадров профилировщика на момент сборки оверлея
+        self._profiler_surface = None
+        
+        # Замеры холодного старта (None - выключены); завершаются первым кадром
+        self.startup_profiler = None
+        
+        # Шрифты загружаются при первой надписи
+        self.font_large = LazyFont(48)
+        self.font_medium = LazyFont(36)
+        self.font_small = LazyFont(24)
+        
+        # Надписи перерисовываются шрифтом только при изменении текста
+        white = (255, 255, 255)
+        self.score_label = TextLabel(self.font_medium, white)
+        self.level_label = TextLabel(self.font_medium, white)
+        self.lines_label = TextLabel(self.font_medium, white)
+        self.next_label = TextLabel(self.font_small, white)
+        self.game_over_label = TextLabel(self.font_large, (255, 0, 0))
+        self.final_score_label = TextLabel(self.font_medium, white)
+        self.restart_label = TextLabel(self.font_small, white)
+        self.overlay = Overlay((0, 0, 0), 200)
+    
+    @property
+    def board(self):
+        """Игровое поле."""
+        return self.state.board
+    
+    @property
+    def score(self) -> int:
+        """Текущий счет."""
+        return self.state.score
     
-    def _spawn_new_piece(self):
-        """Создает новую фигуру из очереди следующей фигуры."""
-        # Текущая фигура становится следующей
-        self.current_shape_name = self.next_shape_name
-        self.current_shape_matrix = [row[:] for row in self.next_shape_matrix]  # Копия
-        self.current_color = self.next_color
-        self.current_color_index = self.next_color_index
-        
-        # Генерируем новую следующую фигуру
-        self.next_shape_name, self.next_shape_matrix, self.next_color = get_random_piece()
-        self.next_color_index = list(COLORS.keys()).index(self.next_shape_name) + 1
-        
-        # Устанавливаем позицию новой фигуры
-        self.piece_x = self.BOARD_WIDTH // 2 - len(self.current_shape_matrix[0]) // 2
-        self.piece_y = 0
-        
-        # Проверяем Game Over (если нельзя разместить новую фигуру)
-        if not self.board.can_place_piece(self.current_shape_matrix, self.piece_x, self.piece_y):
-            self.game_over = True
+    @property
+    def level(self) -> int:
+        """Текущий уровень."""
+        return self.state.level
     
-    def _lock_piece(self):
-        """Фиксирует текущую фигуру на поле."""
-        # Размещаем фигуру на поле
-        self.board.place_piece(self.current_shape_matrix, self.piece_x, self.piece_y, self.current_color_index)
-        
-        # Очищаем заполненные линии
-        cleared = self.board.clear_lines()
-        if cleared > 0:
-            self.lines_cleared += cleared
-            # Подсчет очков: 100 * (количество линий ^ 2) * уровень
-            self.score += 100 * (cleared ** 2) * self.level
-            # Увеличение уровня каждые 10 линий
-            self.level = self.lines_cleared // 10 + 1
-            # Ускорение игры с уровнем
-            self.fall_speed = max(50, 500 - (self.level - 1) * 50)
-        
-        # Создаем новую фигуру
-        self._spawn_new_piece()
+    @property
+    def lines_cleared(self) -> int:
+        """Количество удаленных линий."""
+        return self.state.lines_cleared
+    
+    @property
+    def game_over(self) -> bool:
+        """Закончена ли игра."""
+        return self.state.game_over
     
     def _restart_game(self):
         """Перезапускает игру."""
-        # Сбрасываем поле
-        self.board = Board(self.BOARD_WIDTH, self.BOARD_HEIGHT, self.CELL_SIZE)
-        
-        # Получаем новые фигуры
-        self.current_shape_name, self.current_shape_matrix, self.current_color = get_random_piece()
-        self.current_color_index = list(COLORS.keys()).index(self.current_shape_name) + 1
-        self.next_shape_name, self.next_shape_matrix, self.next_color = get_random_piece()
-        self.next_color_index = list(COLORS.keys()).index(self.next_shape_name) + 1
-        
-        # Сбрасываем позицию
-        self.piece_x = self.BOARD_WIDTH // 2 - len(self.current_shape_matrix[0]) // 2
-        self.piece_y = 0
-        
-        # Сбрасываем игровые переменные
-        self.fall_time = 0
-        self.fall_speed = 500
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
-        self.game_over = False
+        self.state.reset()
+    
+    def _apply_action(self, action: int):
+        """Выполняет действие игрока и записывает его в повтор."""
+        if self.recorder is not None:
+            self.recorder.record(self.sim_time, action)
+        self.state.step(action)
+        self._check_recording()
+    
+    def _check_recording(self):
+        """Завершает запись повтора по окончании игры."""
+        if self.recorder is not None and self.state.game_over:
+            self.stop_recording()
+    
+    def stop_recording(self):
+        """Записывает итог игры в повтор и закрывает файл."""
+        if self.recorder is not None:
+            self.recorder.finish(self.sim_time, self.state.score, self.state.lines_cleared)
+            self.recorder = None
     
     def _draw_next_piece(self, screen, offset_x, offset_y):
         """Отрисовывает следующую фигуру."""
         # Заголовок
-        text = self.font_small.render("Следующая:", True, (255, 255, 255))
+        text = self.next_label.render("Следующая:")
         screen.blit(text, (offset_x, offset_y))
         
         # Размер для отрисовки следующей фигуры
@@ -137,31 +222,29 @@ class Game:
         preview_start_y = offset_y + 30
         
         # Отрисовка фигуры
-        for row_idx, row in enumerate(self.next_shape_matrix):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Если клетка заполнена
-                    x = preview_start_x + col_idx * preview_cell_size
-                    y = preview_start_y + row_idx * preview_cell_size
-                    rect = pygame.Rect(x, y, preview_cell_size, preview_cell_size)
-                    pygame.draw.rect(screen, self.next_color, rect)
-                    pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+        sprite = self.preview_sprites.get(self.state.next_color, preview_cell_size)
+        screen.blits([
+            (sprite, (preview_start_x + col_idx * preview_cell_size,
+                      preview_start_y + row_idx * preview_cell_size))
+            for col_idx, row_idx in self.state.next_shape_matrix.cells
+        ], False)
     
     def _draw_info_panel(self, screen, offset_x, offset_y):
         """Отрисовывает панель информации."""
         y_pos = offset_y
         
         # Счет
-        score_text = self.font_medium.render(f"Счет: {self.score}", True, (255, 255, 255))
+        score_text = self.score_label.render(f"Счет: {self.score}")
         screen.blit(score_text, (offset_x, y_pos))
         y_pos += 40
         
         # Уровень
-        level_text = self.font_medium.render(f"Уровень: {self.level}", True, (255, 255, 255))
+        level_text = self.level_label.render(f"Уровень: {self.level}")
         screen.blit(level_text, (offset_x, y_pos))
         y_pos += 40
         
         # Линии
-        lines_text = self.font_medium.render(f"Линии: {self.lines_cleared}", True, (255, 255, 255))
+        lines_text = self.lines_label.render(f"Линии: {self.lines_cleared}")
         screen.blit(lines_text, (offset_x, y_pos))
         y_pos += 60
         
@@ -170,119 +253,355 @@ class Game:
     
     def _draw_game_over(self, screen):
         """Отрисовывает экран Game Over."""
-        overlay = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.overlay.get((self.WINDOW_WIDTH, self.WINDOW_HEIGHT)), (0, 0))
         
-        game_over_text = self.font_large.render("GAME OVER", True, (255, 0, 0))
+        game_over_text = self.game_over_label.render("GAME OVER")
         text_rect = game_over_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 - 50))
         screen.blit(game_over_text, text_rect)
         
-        score_text = self.font_medium.render(f"Финальный счет: {self.score}", True, (255, 255, 255))
+        score_text = self.final_score_label.render(f"Финальный счет: {self.score}")
         score_rect = score_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2))
         screen.blit(score_text, score_rect)
         
-        restart_text = self.font_small.render("Нажмите R для рестарта", True, (255, 255, 255))
+        restart_text = self.restart_label.render("Нажмите R для рестарта")
         restart_rect = restart_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 50))
         screen.blit(restart_text, restart_rect)
     
-    def handle_events(self):
-        """Обрабатывает события игры."""
-        for event in pygame.event.get():
+    def handle_events(self, events=None, ai_step: bool = True):
+        """
+        Обрабатывает события игры.
+        
+        Args:
+            events: Уже полученные события (по умолчанию - pygame.event.get())
+            ai_step: Дать ИИ выполнить действие (в простое симуляция не идет)
+        """
+        for event in pygame.event.get() if events is None else events:
             # Обработка выхода (крестик окна)
             if event.type == pygame.QUIT:
                 return False
             
+            # Фокус и перекрытие окна
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.invalidate()
+            
             # Обработка управления
             if event.type == pygame.KEYDOWN:
-                if self.game_over:
+                if event.key == PROFILER_KEY:
+                    self.toggle_profiler()
+                elif event.key == UNDO_KEY and self.ai is None:
+                    # Отмена работает и после окончания игры
+                    self.state.undo()
+                elif self.game_over:
                     if event.key == pygame.K_r:
                         self._restart_game()
-                else:
-                    if event.key == pygame.K_LEFT:
-                        # Движение влево
-                        if self.board.can_place_piece(self.current_shape_matrix, self.piece_x - 1, self.piece_y):
-                            self.piece_x -= 1
-                    elif event.key == pygame.K_RIGHT:
-                        # Движение вправо
-                        if self.board.can_place_piece(self.current_shape_matrix, self.piece_x + 1, self.piece_y):
-                            self.piece_x += 1
-                    elif event.key == pygame.K_DOWN:
-                        # Ускоренное падение
-                        if self.board.can_place_piece(self.current_shape_matrix, self.piece_x, self.piece_y + 1):
-                            self.piece_y += 1
-                        else:
-                            self._lock_piece()
-                    elif event.key == pygame.K_UP:
-                        # Поворот фигуры
-                        rotated = rotate_piece(self.current_shape_matrix)
-                        if self.board.can_place_piece(rotated, self.piece_x, self.piece_y):
-                            self.current_shape_matrix = rotated
+                elif self.ai is None:
+                    action = KEY_ACTIONS.get(event.key)
+                    if action is not None:
+                        self._apply_action(action)
+        
+        # Автоигра: ИИ выполняет одно действие за кадр
+        if ai_step and self.ai is not None and not self.game_over:
+            self._apply_action(self.ai.next_action(self.state))
         
         return True
     
     def update(self, dt: int):
         """Обновляет состояние игры."""
-        if not self.game_over:
-            self.fall_time += dt
-            
-            # Падение фигуры с течением времени
-            if self.fall_time >= self.fall_speed:
-                if self.board.can_place_piece(self.current_shape_matrix, self.piece_x, self.piece_y + 1):
-                    self.piece_y += 1
-                else:
-                    self._lock_piece()
-                self.fall_time = 0
+        if self.state.game_over:
+            return
+        self.sim_time += dt
+        self.state.update(dt)
+        self._check_recording()
+    
+    def _get_background(self, screen):
+        """Возвращает кэшированный фон: заливка, поле и сетка (строится один раз)."""
+        if self._background is None or self._background.get_size() != screen.get_size():
+            self._background = pygame.Surface(screen.get_size(), 0, screen)
+            self._background.fill(self.BACKGROUND_COLOR)
+            self.renderer.draw(self._background, self.board_offset_x, self.board_offset_y)
+            self._shown_game_over = None
+        return self._background
+    
+    def invalidate(self):
+        """Требует полной перерисовки в следующем кадре."""
+        self._shown_game_over = None
+    
+    def toggle_profiler(self):
+        """Показывает или скрывает оверлей профилировщика (включая замеры)."""
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        self.show_profiler = not self.show_profiler
+        self._profiler_shown_at = None
+        self.invalidate()
+    
+    def _profiler_rect(self):
+        """Область оверлея профилировщика: под панелью информации."""
+        info_panel_x = self.board_offset_x + self.renderer.pixel_width + 20
+        top = self.board_offset_y + self.INFO_PANEL_HEIGHT
+        return pygame.Rect(info_panel_x, top, self.WINDOW_WIDTH - info_panel_x,
+                           self.WINDOW_HEIGHT - top)
+    
+    def _profiler_outdated(self) -> bool:
+        """Оверлей отстает от замеров: есть новые кадры и прошло PROFILER_REFRESH_MS."""
+        if self._profiler_shown_at is None:
+            return True
+        return (self.profiler.frames != self._profiler_frames
+                and pygame.time.get_ticks() - self._profiler_shown_at >= self.PROFILER_REFRESH_MS)
+    
+    def _draw_profiler(self, screen, background, force: bool):
+        """
+        Отрисовывает оверлей профилировщика: p50/p99 кадра и фаз.
+        
+        Текст пересобирается не чаще PROFILER_REFRESH_MS и только при новых замерах.
+        
+        Returns:
+            Измененный прямоугольник или None
+        """
+        stale = self._profiler_outdated()
+        if not stale and not force:
+            return None
+        rect = self._profiler_rect()
+        if stale:
+            self._profiler_shown_at = pygame.time.get_ticks()
+            self._profiler_frames = self.profiler.frames
+            surface = pygame.Surface(rect.size, 0, screen)
+            surface.blit(background, (0, 0), rect)
+            y_pos = 0
+            for phase, (p50, p99) in self.profiler.summary().items():
+                text = self.font_small.render(f"{phase}: {p50:.2f} / {p99:.2f} мс", True, (255, 255, 0))
+                surface.blit(text, (0, y_pos))
+                y_pos += 18
+            self._profiler_surface = surface
+        screen.blit(self._profiler_surface, rect)
+        return rect
     
     def draw(self, screen):
-        """Отрисовывает игру."""
-        # Заливка экрана цветом
-        screen.fill(self.BACKGROUND_COLOR)
-        
-        # Отрисовка игрового поля
-        self.board.draw(screen, self.board_offset_x, self.board_offset_y)
-        
-        # Отрисовка размещенных фигур на поле
-        self.board.draw_grid(screen, self.board_offset_x, self.board_offset_y, self.color_index_map)
-        
-        # Отрисовка текущей фигуры
-        if not self.game_over:
-            for row_idx, row in enumerate(self.current_shape_matrix):
-                for col_idx, cell in enumerate(row):
-                    if cell:  # Если клетка заполнена
-                        self.board.draw_cell(
-                            screen,
-                            self.piece_x + col_idx,
-                            self.piece_y + row_idx,
-                            self.current_color,
-                            self.board_offset_x,
-                            self.board_offset_y
-                        )
-        
-        # Отрисовка панели информации
-        info_panel_x = self.board_offset_x + self.board.pixel_width + 20
-        self._draw_info_panel(screen, info_panel_x, self.board_offset_y)
-        
-        # Отрисовка Game Over
-        if self.game_over:
+        """
+        Отрисовывает игру, перерисовывая только изменившиеся области.
+        
+        Returns:
+            Список измененных прямоугольников экрана (для pygame.display.update)
+        """
+        profiler = self.profiler
+        mark = perf_counter_ns() if profiler is not None else 0
+        background = self._get_background(screen)
+        state = self.state
+        
+        # Полная перерисовка: первый кадр, смена размера, начало и конец игры
+        full_redraw = self._shown_game_over != state.game_over
+        if full_redraw:
+            screen.blit(background, (0, 0))
+            self.renderer.reset_cells()
+            self._shown_panel = None
+            self._shown_game_over = state.game_over
+        elif state.game_over and not self.show_profiler:
+            return []  # Экран Game Over не меняется
+        if profiler is not None:
+            mark = self._profile(PHASE_DRAW_BOARD, mark)
+        
+        # Размещенные фигуры, текущая фигура и тень: только изменившиеся клетки
+        # (рисуются за один проход, поэтому замеряются одной фазой)
+        piece_cells = ghost_cells = ()
+        if not state.game_over:
+            # Большое поле: окно просмотра следует за фигурой
+            matrix = state.current_shape_matrix
+            self.renderer.follow(state.piece_x, state.piece_y, matrix.width, matrix.height)
+            piece_cells = [(state.piece_x + dx, state.piece_y + dy) for dx, dy in matrix.cells]
+            ghost_y = state.ghost_y
+            if ghost_y != state.piece_y:
+                ghost_cells = [(state.piece_x + dx, ghost_y + dy) for dx, dy in matrix.cells]
+        rects = self.renderer.draw_changed_cells(
+            screen, background, state.board, piece_cells, state.current_color_index,
+            self.color_index_map, self.board_offset_x, self.board_offset_y, ghost_cells
+        )
+        if profiler is not None:
+            mark = self._profile(PHASE_DRAW_CELLS, mark)
+        
+        # Панель информации: только при изменении счета, уровня, линий или следующей фигуры
+        panel = (state.score, state.level, state.lines_cleared, state.next_shape_name)
+        if panel != self._shown_panel:
+            self._shown_panel = panel
+            info_panel_x = self.board_offset_x + self.renderer.pixel_width + 20
+            panel_rect = pygame.Rect(info_panel_x, self.board_offset_y,
+                                     self.WINDOW_WIDTH - info_panel_x, self.INFO_PANEL_HEIGHT)
+            screen.blit(background, panel_rect, panel_rect)
+            self._draw_info_panel(screen, info_panel_x, self.board_offset_y)
+            rects.append(panel_rect)
+        if profiler is not None:
+            mark = self._profile(PHASE_DRAW_PANEL, mark)
+        
+        # Отрисовка Game Over и оверлея профилировщика
+        if full_redraw and state.game_over:
             self._draw_game_over(screen)
+        if self.show_profiler:
+            profiler_rect = self._draw_profiler(screen, background, full_redraw)
+            if profiler_rect is not None:
+                rects.append(profiler_rect)
+        if profiler is not None:
+            self._profile(PHASE_DRAW_OVERLAY, mark)
+        
+        self._drawn_version = state.version
+        if full_redraw:
+            return [screen.get_rect()]
+        return rects
+    
+    def _profile(self, phase: str, start_ns: int) -> int:
+        """Записывает длительность фазы от start_ns и возвращает текущее время."""
+        now = perf_counter_ns()
+        self.profiler.add(phase, now - start_ns)
+        return now
+    
+    def needs_redraw(self) -> bool:
+        """
+        Изменилось ли что-то на экране с прошлой отрисовки.
+        
+        После окончания игры оверлей профилировщика не обновляется: новые кадры
+        давала бы только его же перерисовка, и цикл не уходил бы в простой.
+        """
+        return (self._drawn_version != self.state.version
+                or self._shown_game_over != self.state.game_over
+                or (self.show_profiler and not self.state.game_over and self._profiler_outdated()))
+    
+    def is_idle(self) -> bool:
+        """Простой: игра окончена и уже отрисована, или окно не в фокусе."""
+        return not self.focused or (self.game_over and not self.needs_redraw())
+    
+    def _simulate(self, accumulator: int, deadline_ns: int = None) -> int:
+        """
+        Продвигает игру фиксированными шагами SIM_STEP_MS.
+        
+        Args:
+            accumulator: Накопленное, еще не просимулированное время в мс
+            deadline_ns: Момент perf_counter_ns, после которого догонять
+                         симуляцию нельзя (None - без ограничения)
+        
+        Returns:
+            Остаток времени, перенесенный на следующий кадр
+        """
+        while accumulator >= self.SIM_STEP_MS:
+            self.update(self.SIM_STEP_MS)
+            accumulator -= self.SIM_STEP_MS
+            if deadline_ns is not None and perf_counter_ns() >= deadline_ns:
+                break
+        # Отставание не копится дольше MAX_FRAME_MS
+        return min(accumulator, self.MAX_FRAME_MS)
+    
+    def _present(self, screen):
+        """Отрисовывает кадр и обновляет измененные области экрана."""
+        mark = perf_counter_ns()
+        rects = self.draw(screen)
+        
+        # Обновление экрана: только измененные области
+        if rects:
+            pygame.display.update(rects)
+        if self.profiler is not None:
+            self._profile(PHASE_DRAW, mark)
+        if self.startup_profiler is not None:
+            self.startup_profiler.mark(STAGE_FIRST_FRAME)
+            # stderr: отчет не смешивается с выводом игры
+            print(self.startup_profiler.report(), file=sys.stderr)
+            self.startup_profiler = None
     
     def run(self, screen, clock):
-        """Главный игровой цикл."""
+        """
+        Главный игровой цикл.
+        
+        Симуляция идет фиксированными шагами SIM_STEP_MS с накоплением
+        времени кадра, отрисовка выполняется только при изменениях,
+        а в простое цикл спит в ожидании событий.
+        """
         running = True
+        accumulator = 0
         while running:
-            # Вычисляем время кадра
-            dt = clock.tick(self.FPS)
+            if self.is_idle():
+                # Ждем событие, не нагружая процессор
+                event = pygame.event.wait(self.IDLE_WAIT_MS)
+                running = self.handle_events([event] + pygame.event.get(), ai_step=False)
+                # Время простоя не попадает в симуляцию
+                clock.tick()
+                accumulator = 0
+                frame_start = None
+            else:
+                # Вычисляем время кадра
+                dt = clock.tick(self.FPS)
+                frame_start = mark = perf_counter_ns()
+                
+                # Обработка событий
+                running = self.handle_events()
+                if self.profiler is not None:
+                    mark = self._profile(PHASE_EVENTS, mark)
+                
+                # Обновление игры фиксированными шагами
+                accumulator = self._simulate(accumulator + min(dt, self.MAX_FRAME_MS))
+                if self.profiler is not None:
+                    self._profile(PHASE_UPDATE, mark)
             
-            # Обработка событий
-            running = self.handle_events()
+            # Отрисовка только при изменениях
+            if self.needs_redraw():
+                self._present(screen)
             
-            # Обновление игры
-            self.update(dt)
+            # Длительность кадра без ожидания в clock.tick
+            if self.profiler is not None and frame_start is not None:
+                self.profiler.end_frame(perf_counter_ns() - frame_start)
+        
+        # Незавершенная игра тоже сохраняется в повтор
+        self.stop_recording()
+    
+    async def run_async(self, screen, clock):
+        """
+        Главный игровой цикл для браузера (pygbag).
+        
+        Раз в кадр управление отдается браузеру через asyncio.sleep(0),
+        блокирующее ожидание событий не используется. Работа кадра
+        ограничена FRAME_BUDGET_MS: догонять симуляцию можно до половины
+        бюджета (остаток времени переносится на следующие кадры), а
+        отрисовка выполняется, только если бюджет еще не исчерпан. Кадр
+        пропускается не больше одного раза подряд, чтобы экран не замирал.
+        """
+        # asyncio нужен только веб-сборке: не замедляет запуск настольной версии
+        import asyncio
+        
+        running = True
+        accumulator = 0
+        budget_ns = self.FRAME_BUDGET_MS * 1_000_000
+        skipped_draw = False
+        while running:
+            if self.is_idle():
+                # Простой: редкий опрос событий без нагрузки на вкладку
+                running = self.handle_events(ai_step=False)
+                clock.tick()
+                accumulator = 0
+                await asyncio.sleep(self.IDLE_POLL_MS / 1000)
+                frame_start = None
+            else:
+                dt = clock.tick(self.FPS)
+                frame_start = mark = perf_counter_ns()
+                
+                # События обрабатываются до симуляции: ввод попадает в этот же кадр
+                running = self.handle_events()
+                if self.profiler is not None:
+                    mark = self._profile(PHASE_EVENTS, mark)
+                
+                accumulator = self._simulate(accumulator + min(dt, self.MAX_FRAME_MS),
+                                             frame_start + budget_ns // 2)
+                if self.profiler is not None:
+                    self._profile(PHASE_UPDATE, mark)
+            
+            if self.needs_redraw():
+                if frame_start is None or skipped_draw or perf_counter_ns() - frame_start < budget_ns:
+                    self._present(screen)
+                    skipped_draw = False
+                else:
+                    skipped_draw = True
             
-            # Отрисовка
-            self.draw(screen)
+            if self.profiler is not None and frame_start is not None:
+                self.profiler.end_frame(perf_counter_ns() - frame_start)
             
-            # Обновление экрана
-            pygame.display.flip()
+            # Отдаем управление браузеру
+            await asyncio.sleep(0)
+        
+        self.stop_recording()
@@ -1,6 +1,7 @@
 # Фигуры тетриса
 
 import random
+from collections import deque
 
 # Словарь с матрицами фигур тетриса (0 - пусто, 1 - заполнено)
 SHAPES = {
@@ -45,15 +46,114 @@ COLORS = {
 }
 
 
-def get_random_piece():
+# Порядок фигур (индекс цвета фигуры на поле = позиция в этом кортеже + 1)
+SHAPE_NAMES = tuple(SHAPES)
+
+# Индекс цвета фигуры для сохранения на поле
+COLOR_INDEXES = {name: index for index, name in enumerate(SHAPE_NAMES, 1)}
+
+# Цвет по индексу на поле (обратное соответствие)
+INDEX_COLORS = {COLOR_INDEXES[name]: color for name, color in COLORS.items()}
+
+
+class Orientation:
+    """
+    Неизменяемое положение (поворот) фигуры.
+    
+    Ведет себя как матрица фигуры (последовательность строк), поэтому
+    может передаваться везде, где ожидается shape_matrix.
+    """
+    
+    __slots__ = ('name', 'rotation', 'matrix', 'cells', 'row_masks',
+                 'width', 'height', 'bottom', 'rotated')
+    
+    def __init__(self, name: str, rotation: int, matrix):
+        """
+        Args:
+            name: Имя фигуры
+            rotation: Номер поворота (0-3, по часовой стрелке)
+            matrix: Матрица фигуры в этом повороте
+        """
+        matrix = tuple(tuple(row) for row in matrix)
+        cells = tuple(
+            (col_idx, row_idx)
+            for row_idx, row in enumerate(matrix)
+            for col_idx, cell in enumerate(row) if cell
+        )
+        width = len(matrix[0])
+        # Нижняя заполненная клетка в каждой колонке (-1 если колонка пуста)
+        bottom = tuple(
+            max((dy for dx, dy in cells if dx == col_idx), default=-1)
+            for col_idx in range(width)
+        )
+        set_attr = object.__setattr__
+        set_attr(self, 'name', name)
+        set_attr(self, 'rotation', rotation)
+        set_attr(self, 'matrix', matrix)
+        set_attr(self, 'cells', cells)
+        set_attr(self, 'row_masks', tuple(
+            sum(1 << col_idx for col_idx, cell in enumerate(row) if cell) for row in matrix
+        ))
+        set_attr(self, 'width', width)
+        set_attr(self, 'height', len(matrix))
+        set_attr(self, 'bottom', bottom)
+        set_attr(self, 'rotated', None)
+    
+    def __setattr__(self, key, value):
+        raise AttributeError("Orientation is immutable")
+    
+    def __iter__(self):
+        return iter(self.matrix)
+    
+    def __len__(self):
+        return self.height
+    
+    def __getitem__(self, index):
+        return self.matrix[index]
+    
+    def __repr__(self):
+        return f"Orientation({self.name!r}, {self.rotation})"
+
+
+def _rotate_matrix(shape_matrix):
+    """Поворачивает матрицу на 90 градусов по часовой стрелке."""
+    rows = len(shape_matrix)
+    cols = len(shape_matrix[0])
+    return [[shape_matrix[rows - 1 - j][i] for j in range(rows)] for i in range(cols)]
+
+
+def _build_orientations():
+    """Строит все четыре поворота каждой фигуры (один раз при импорте)."""
+    orientations = {}
+    for name in SHAPE_NAMES:
+        matrix = SHAPES[name]
+        states = []
+        for rotation in range(4):
+            states.append(Orientation(name, rotation, matrix))
+            matrix = _rotate_matrix(matrix)
+        # Связываем повороты в кольцо: поворот - это переход по ссылке
+        for rotation, state in enumerate(states):
+            object.__setattr__(state, 'rotated', states[(rotation + 1) % 4])
+        orientations[name] = tuple(states)
+    return orientations
+
+
+# Таблица поворотов: имя фигуры -> кортеж из 4 Orientation
+ORIENTATIONS = _build_orientations()
+
+
+def get_random_piece(rng=None):
     """
     Возвращает случайную фигуру и её цвет.
     
+    Args:
+        rng: Генератор случайных чисел (random.Random); по умолчанию модуль random
+    
     Returns:
-        tuple: (shape_name, shape_matrix, color)
+        tuple: (shape_name, shape_matrix, color), где shape_matrix - начальный Orientation
     """
-    shape_name = random.choice(list(SHAPES.keys()))
-    shape_matrix = SHAPES[shape_name]
+    shape_name = (rng or random).choice(SHAPE_NAMES)
+    shape_matrix = ORIENTATIONS[shape_name][0]
     color = COLORS[shape_name]
     return shape_name, shape_matrix, color
 
@@ -63,17 +163,83 @@ def rotate_piece(shape_matrix):
     Поворачивает фигуру на 90 градусов по часовой стрелке.
     
     Args:
-        shape_matrix: Матрица фигуры (список списков)
+        shape_matrix: Orientation или матрица фигуры (список списков)
     
     Returns:
-        Повернутая матрица фигуры
+        Следующий Orientation (без аллокаций) или повернутая матрица фигуры
     """
+    if isinstance(shape_matrix, Orientation):
+        return shape_matrix.rotated
+    
     if not shape_matrix or not shape_matrix[0]:
         return shape_matrix
     
-    rows = len(shape_matrix)
-    cols = len(shape_matrix[0])
+    return _rotate_matrix(shape_matrix)
+
+
+# Режимы генератора фигур
+RANDOMIZER_UNIFORM = 'uniform'  # Каждая фигура выбирается независимо
+RANDOMIZER_BAG = 'bag'  # «Мешок»: все 7 фигур в случайном порядке, затем новый мешок
+
+
+class PieceGenerator:
+    """Воспроизводимый генератор фигур с собственным RNG и очередью превью."""
+    
+    def __init__(self, seed=None, mode: str = RANDOMIZER_UNIFORM):
+        """
+        Args:
+            seed: Зерно генератора (None - случайное)
+            mode: RANDOMIZER_UNIFORM или RANDOMIZER_BAG
+        """
+        if mode not in (RANDOMIZER_UNIFORM, RANDOMIZER_BAG):
+            raise ValueError(f"Unknown randomizer mode: {mode!r}")
+        self.mode = mode
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Начинает последовательность заново с заданным зерном."""
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._bag = []
+        self._queue = deque()
+    
+    def _generate(self) -> str:
+        """Выбирает имя следующей фигуры."""
+        if self.mode == RANDOMIZER_UNIFORM:
+            return self._rng.choice(SHAPE_NAMES)
+        if not self._bag:
+            self._bag = list(SHAPE_NAMES)
+            self._rng.shuffle(self._bag)
+        return self._bag.pop()
+    
+    def peek(self, count: int = 1) -> list:
+        """
+        Возвращает имена следующих фигур, не извлекая их из очереди.
+        
+        Args:
+            count: Сколько фигур посмотреть вперед
+        """
+        queue = self._queue
+        while len(queue) < count:
+            queue.append(self._generate())
+        return [queue[i] for i in range(count)]
+    
+    def next_name(self) -> str:
+        """Извлекает имя следующей фигуры."""
+        if self._queue:
+            return self._queue.popleft()
+        return self._generate()
+    
+    def unget(self, shape_name: str):
+        """Возвращает извлеченную фигуру в начало очереди (для отмены хода)."""
+        self._queue.appendleft(shape_name)
     
-    # Поворот на 90 градусов по часовой стрелке
-    rotated = [[shape_matrix[rows - 1 - j][i] for j in range(rows)] for i in range(cols)]
-    return rotated
+    def next(self):
+        """
+        Извлекает следующую фигуру.
+        
+        Returns:
+            tuple: (shape_name, shape_matrix, color), как get_random_piece
+        """
+        shape_name = self.next_name()
+        return shape_name, ORIENTATIONS[shape_name][0], COLORS[shape_name]
@@ -0,0 +1,140 @@
+# Профилирование игрового цикла: фазы кадра и холодный старт
+
+import csv
+from array import array
+from time import perf_counter_ns
+
+# Фазы кадра: обработка событий, симуляция, отрисовка и ее части
+PHASE_FRAME = 'frame'
+PHASE_EVENTS = 'events'
+PHASE_UPDATE = 'update'
+PHASE_DRAW = 'draw'
+PHASE_DRAW_BOARD = 'draw_board'  # Фон поля (полная перерисовка)
+PHASE_DRAW_CELLS = 'draw_cells'  # Изменившиеся клетки поля, текущая фигура и её тень
+PHASE_DRAW_PANEL = 'draw_panel'  # Панель информации
+PHASE_DRAW_OVERLAY = 'draw_overlay'  # Game Over и оверлей профилировщика
+PHASES = (PHASE_FRAME, PHASE_EVENTS, PHASE_UPDATE, PHASE_DRAW, PHASE_DRAW_BOARD,
+          PHASE_DRAW_CELLS, PHASE_DRAW_PANEL, PHASE_DRAW_OVERLAY)
+
+# Этапы холодного старта
+STAGE_IMPORT = 'import'  # Импорт pygame и модулей игры
+STAGE_INIT = 'init'  # Инициализация дисплея и шрифтов, создание окна
+STAGE_GAME = 'game'  # Создание Game
+STAGE_FIRST_FRAME = 'first_frame'  # Первый показанный кадр
+
+
+class StartupProfiler:
+    """Замеры холодного старта: длительность этапов от запуска до первого кадра."""
+    
+    def __init__(self, start_ns: int = None):
+        """
+        Args:
+            start_ns: Момент запуска по perf_counter_ns (None - сейчас)
+        """
+        self.start_ns = perf_counter_ns() if start_ns is None else start_ns
+        self._last_ns = self.start_ns
+        self.stages = []  # (этап, длительность в нс)
+    
+    def mark(self, stage: str):
+        """Завершает этап: время с предыдущей отметки."""
+        now = perf_counter_ns()
+        self.stages.append((stage, now - self._last_ns))
+        self._last_ns = now
+    
+    def report(self) -> str:
+        """Отчет по этапам и общее время в миллисекундах."""
+        lines = [f"{stage}: {duration / 1e6:.1f} мс" for stage, duration in self.stages]
+        lines.append(f"total: {(self._last_ns - self.start_ns) / 1e6:.1f} мс")
+        return "\n".join(lines)
+
+
+class RingBuffer:
+    """Кольцевой буфер фиксированного размера для замеров в наносекундах."""
+    
+    def __init__(self, size: int):
+        """
+        Args:
+            size: Количество хранимых последних значений
+        """
+        self.size = size
+        self._values = array('q', bytes(8 * size))
+        self._index = 0
+        self.count = 0
+    
+    def add(self, value: int):
+        """Добавляет значение, затирая самое старое при заполнении."""
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+    
+    def values(self) -> list:
+        """Хранимые значения от старых к новым."""
+        if self.count < self.size:
+            return self._values[:self.count].tolist()
+        return (self._values[self._index:] + self._values[:self._index]).tolist()
+    
+    def percentile(self, percent: float) -> int:
+        """Перцентиль хранимых значений (0, если значений нет)."""
+        if not self.count:
+            return 0
+        ordered = sorted(self._values[:self.count])
+        return ordered[min(self.count - 1, int(self.count * percent / 100))]
+
+
+class FrameProfiler:
+    """Замеры фаз кадра в кольцевых буферах (последние size кадров)."""
+    
+    def __init__(self, size: int = 600):
+        """
+        Args:
+            size: Количество хранимых кадров для каждой фазы
+        """
+        self.buffers = {phase: RingBuffer(size) for phase in PHASES}
+        # Номер кадра каждого замера: фазы отрисовки есть не в каждом кадре
+        self.frame_numbers = {phase: RingBuffer(size) for phase in PHASES}
+        self.frames = 0
+    
+    def add(self, phase: str, duration_ns: int):
+        """Добавляет замер фазы текущего кадра."""
+        self.buffers[phase].add(duration_ns)
+        self.frame_numbers[phase].add(self.frames)
+    
+    def end_frame(self, duration_ns: int):
+        """Добавляет длительность всего кадра и переходит к следующему."""
+        self.add(PHASE_FRAME, duration_ns)
+        self.frames += 1
+    
+    def summary(self) -> dict:
+        """
+        Сводка по фазам в миллисекундах.
+        
+        Returns:
+            Словарь: фаза -> (p50, p99)
+        """
+        return {
+            phase: (buffer.percentile(50) / 1e6, buffer.percentile(99) / 1e6)
+            for phase, buffer in self.buffers.items()
+        }
+    
+    def dump_csv(self, path):
+        """
+        Сохраняет хранимые замеры в CSV: строка на кадр, колонка на фазу (нс).
+        
+        Замеры сопоставляются по номеру кадра (первая колонка); фаза, которая
+        в кадре не выполнялась (например, отрисовка в кадре без изменений),
+        остается пустой.
+        """
+        by_frame = {}
+        for phase in PHASES:
+            numbers = self.frame_numbers[phase].values()
+            for number, value in zip(numbers, self.buffers[phase].values()):
+                row = by_frame.setdefault(number, {})
+                row[phase] = row.get(phase, 0) + value
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(('frame_number',) + PHASES)
+            # Строки - только завершенные кадры, хранимые в буфере длительности кадра
+            for number in self.frame_numbers[PHASE_FRAME].values():
+                row = by_frame[number]
+                writer.writerow([number] + [row.get(phase, '') for phase in PHASES])
@@ -0,0 +1,309 @@
+# Отрисовка игрового поля тетриса
+
+import pygame
+
+# Цвет обводки клеток
+OUTLINE_COLOR = (255, 255, 255)
+
+# Способы отрисовки поля: спрайт на клетку или массивы NumPy (src/array_renderer.py)
+RENDERER_SPRITES = 'sprites'
+RENDERER_ARRAY = 'numpy'
+RENDERERS = (RENDERER_SPRITES, RENDERER_ARRAY)
+
+
+class CellSprites:
+    """
+    Кэш заранее отрисованных клеток (заливка цветом и белая обводка).
+    
+    Хранит спрайты одного размера; при запросе другого размера кэш
+    сбрасывается. Спрайт цвета отрисовывается при первом запросе.
+    """
+    
+    def __init__(self):
+        self.cell_size = None
+        self._sprites = {}
+        self._ghosts = {}
+    
+    def _render(self, color: tuple) -> pygame.Surface:
+        """Отрисовывает одну клетку текущего размера."""
+        sprite = pygame.Surface((self.cell_size, self.cell_size))
+        # Формат экрана ускоряет копирование
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.fill(color)
+        pygame.draw.rect(sprite, OUTLINE_COLOR, sprite.get_rect(), 1)
+        return sprite
+    
+    def _render_ghost(self, color: tuple) -> pygame.Surface:
+        """Отрисовывает клетку тени фигуры: пустая клетка с обводкой цвета фигуры."""
+        sprite = pygame.Surface((self.cell_size, self.cell_size))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.fill((0, 0, 0))
+        pygame.draw.rect(sprite, color, sprite.get_rect(), 1)
+        return sprite
+    
+    def get(self, color: tuple, cell_size: int) -> pygame.Surface:
+        """
+        Возвращает спрайт клетки.
+        
+        Args:
+            color: Цвет клетки (RGB)
+            cell_size: Размер клетки в пикселях
+        """
+        if cell_size != self.cell_size:
+            self.cell_size = cell_size
+            self._sprites = {}
+            self._ghosts = {}
+        sprite = self._sprites.get(color)
+        if sprite is None:
+            sprite = self._sprites[color] = self._render(color)
+        return sprite
+    
+    def get_ghost(self, color: tuple, cell_size: int) -> pygame.Surface:
+        """
+        Возвращает спрайт клетки тени фигуры.
+        
+        Args:
+            color: Цвет фигуры (RGB)
+            cell_size: Размер клетки в пикселях
+        """
+        if cell_size != self.cell_size:
+            self.get(color, cell_size)
+        sprite = self._ghosts.get(color)
+        if sprite is None:
+            sprite = self._ghosts[color] = self._render_ghost(color)
+        return sprite
+
+
+class BoardRenderer:
+    """
+    Класс для отрисовки игрового поля.
+    
+    Рисует окно просмотра (viewport) размером view_width x view_height клеток
+    с левым верхним углом в клетке (view_x, view_y). Для обычного поля окно
+    совпадает со всем полем; на больших полях отрисовываются только видимые
+    клетки, а окно прокручивается за фигурой (см. follow).
+    """
+    
+    def __init__(self, width: int, height: int, cell_size: int,
+                 view_width: int = None, view_height: int = None):
+        """
+        Инициализация отрисовки поля.
+        
+        Args:
+            width: Ширина поля в клетках (колонки)
+            height: Высота поля в клетках (строки)
+            cell_size: Размер одной клетки в пикселях
+            view_width: Видимых колонок (None - все поле)
+            view_height: Видимых строк (None - все поле)
+        """
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        
+        # Окно просмотра в клетках
+        self.view_width = min(width, view_width or width)
+        self.view_height = min(height, view_height or height)
+        self.view_x = 0
+        self.view_y = 0
+        
+        # Размеры видимой части поля в пикселях
+        self.pixel_width = self.view_width * cell_size
+        self.pixel_height = self.view_height * cell_size
+        
+        # Индексы цветов, показанные на экране в последнем кадре (None - неизвестно)
+        self.reset_cells()
+        
+        # Спрайты клеток для размера cell_size
+        self.sprites = CellSprites()
+    
+    def draw(self, screen: pygame.Surface, offset_x: int, offset_y: int):
+        """
+        Отрисовка видимой части игрового поля с сеткой.
+        
+        Args:
+            screen: Поверхность для отрисовки
+            offset_x: Смещение по X в пикселях
+            offset_y: Смещение по Y в пикселях
+        """
+        # Рисуем фон поля
+        board_rect = pygame.Rect(offset_x, offset_y, self.pixel_width, self.pixel_height)
+        pygame.draw.rect(screen, (0, 0, 0), board_rect)
+        pygame.draw.rect(screen, (100, 100, 100), board_rect, 2)
+        
+        # Рисуем сетку
+        for x in range(self.view_width + 1):
+            start_pos = (offset_x + x * self.cell_size, offset_y)
+            end_pos = (offset_x + x * self.cell_size, offset_y + self.pixel_height)
+            pygame.draw.line(screen, (50, 50, 50), start_pos, end_pos, 1)
+        
+        for y in range(self.view_height + 1):
+            start_pos = (offset_x, offset_y + y * self.cell_size)
+            end_pos = (offset_x + self.pixel_width, offset_y + y * self.cell_size)
+            pygame.draw.line(screen, (50, 50, 50), start_pos, end_pos, 1)
+    
+    def scroll_to(self, view_x: int, view_y: int) -> bool:
+        """
+        Перемещает окно просмотра (с ограничением краями поля).
+        
+        Returns:
+            True если окно сдвинулось (все видимые клетки будут перерисованы)
+        """
+        view_x = max(0, min(view_x, self.width - self.view_width))
+        view_y = max(0, min(view_y, self.height - self.view_height))
+        if (view_x, view_y) == (self.view_x, self.view_y):
+            return False
+        self.view_x = view_x
+        self.view_y = view_y
+        self.reset_cells()
+        return True
+    
+    def follow(self, x: int, y: int, width: int, height: int, margin: int = 4) -> bool:
+        """
+        Прокручивает окно так, чтобы область (фигура) была видна с запасом margin.
+        
+        Окно центрируется на области только когда она подходит к краю,
+        поэтому при падении фигуры прокрутка идет скачками, а не каждую строку.
+        
+        Args:
+            x, y: Левый верхний угол области в клетках
+            width, height: Размер области в клетках
+            margin: Минимальный отступ области от края окна в клетках
+        
+        Returns:
+            True если окно сдвинулось
+        """
+        view_x, view_y = self.view_x, self.view_y
+        margin_x = min(margin, max(0, (self.view_width - width) // 2))
+        if x < view_x + margin_x or x + width > view_x + self.view_width - margin_x:
+            view_x = x + width // 2 - self.view_width // 2
+        margin_y = min(margin, max(0, (self.view_height - height) // 2))
+        if y < view_y + margin_y or y + height > view_y + self.view_height - margin_y:
+            view_y = y + height // 2 - self.view_height // 2
+        return self.scroll_to(view_x, view_y)
+    
+    def draw_cell(self, screen: pygame.Surface, x: int, y: int, color: tuple,
+                  offset_x: int, offset_y: int):
+        """
+        Отрисовка одной клетки на поле (если она видна).
+        
+        Args:
+            screen: Поверхность для отрисовки
+            x: Координата X в клетках поля
+            y: Координата Y в клетках поля
+            color: Цвет клетки (RGB)
+            offset_x: Смещение по X в пикселях
+            offset_y: Смещение по Y в пикселях
+        """
+        x -= self.view_x
+        y -= self.view_y
+        if 0 <= x < self.view_width and 0 <= y < self.view_height:
+            pixel_x = offset_x + x * self.cell_size
+            pixel_y = offset_y + y * self.cell_size
+            screen.blit(self.sprites.get(color, self.cell_size), (pixel_x, pixel_y))
+    
+    def _visible_row(self, row: list) -> list:
+        """Видимая часть строки цветов (без копирования, если видны все колонки)."""
+        if self.view_width == self.width:
+            return row
+        return row[self.view_x:self.view_x + self.view_width]
+    
+    def draw_grid(self, screen: pygame.Surface, board, offset_x: int, offset_y: int, colors: dict):
+        """
+        Отрисовывает размещенные фигуры в видимой части поля.
+        
+        Args:
+            screen: Поверхность для отрисовки
+            board: Игровое поле (Board)
+            offset_x: Смещение по X в пикселях
+            offset_y: Смещение по Y в пикселях
+            colors: Словарь цветов (по индексам)
+        """
+        cell_size = self.cell_size
+        sprites = self.sprites
+        blits = []
+        for view_row in range(self.view_height):
+            y = self.view_y + view_row
+            # Пустые строки пропускаем по маске
+            if not board.rows[y]:
+                continue
+            pixel_y = offset_y + view_row * cell_size
+            for x, color_index in enumerate(self._visible_row(board.grid[y])):
+                if color_index != 0:
+                    color = colors.get(color_index, OUTLINE_COLOR)
+                    blits.append((sprites.get(color, cell_size), (offset_x + x * cell_size, pixel_y)))
+        screen.blits(blits, False)
+    
+    def reset_cells(self):
+        """Забывает показанное состояние клеток (следующий кадр перерисует все)."""
+        self._shown = [[None] * self.view_width for _ in range(self.view_height)]
+    
+    def draw_changed_cells(self, screen: pygame.Surface, background: pygame.Surface, board,
+                           piece_cells, piece_color_index: int, colors: dict,
+                           offset_x: int, offset_y: int, ghost_cells=()) -> list:
+        """
+        Перерисовывает только видимые клетки, изменившиеся с прошлого кадра.
+        
+        Клетка восстанавливается из кэшированного фона и, если она заполнена,
+        рисуется заново. Клетки тени хранятся в показанном состоянии с
+        отрицательным индексом цвета, чтобы отличаться от самой фигуры.
+        
+        Args:
+            screen: Поверхность для отрисовки
+            background: Фон экрана с полем и сеткой (того же размера, что screen)
+            board: Игровое поле (Board)
+            piece_cells: Клетки текущей фигуры на поле [(x, y), ...]
+            piece_color_index: Индекс цвета текущей фигуры
+            colors: Словарь цветов (по индексам)
+            offset_x: Смещение по X в пикселях
+            offset_y: Смещение по Y в пикселях
+            ghost_cells: Клетки тени фигуры (место её падения) [(x, y), ...]
+        
+        Returns:
+            Список измененных прямоугольников экрана
+        """
+        view_x, view_y = self.view_x, self.view_y
+        view_width, view_height = self.view_width, self.view_height
+        
+        # Видимые клетки тени и фигуры по строкам окна (фигура рисуется поверх тени)
+        piece_rows = {}
+        for cells, color_index in ((ghost_cells, -piece_color_index), (piece_cells, piece_color_index)):
+            for x, y in cells:
+                x -= view_x
+                y -= view_y
+                if 0 <= x < view_width and 0 <= y < view_height:
+                    piece_rows.setdefault(y, []).append((x, color_index))
+        
+        rects = []
+        blits = []
+        cell_size = self.cell_size
+        sprites = self.sprites
+        grid = board.grid
+        for view_row in range(view_height):
+            wanted = self._visible_row(grid[view_y + view_row])
+            if view_row in piece_rows:
+                wanted = wanted[:]
+                for x, color_index in piece_rows[view_row]:
+                    wanted[x] = color_index
+            shown = self._shown[view_row]
+            if wanted == shown:
+                continue
+            
+            pixel_y = offset_y + view_row * cell_size
+            for x in range(view_width):
+                color_index = wanted[x]
+                if color_index == shown[x]:
+                    continue
+                rect = pygame.Rect(offset_x + x * cell_size, pixel_y, cell_size, cell_size)
+                # Заполненная клетка закрывает фон целиком, пустая восстанавливается из фона
+                if color_index > 0:
+                    blits.append((sprites.get(colors.get(color_index, OUTLINE_COLOR), cell_size), rect))
+                elif color_index:
+                    blits.append((sprites.get_ghost(colors.get(-color_index, OUTLINE_COLOR), cell_size), rect))
+                else:
+                    blits.append((background, rect, rect))
+                rects.append(rect)
+            self._shown[view_row] = list(wanted)
+        screen.blits(blits, False)
+        return rects
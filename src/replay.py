@@ -0,0 +1,183 @@
+# Запись и проверка повторов: зерно фигур и поток событий (время, действие)
+
+import mmap
+
+from src.engine import GameState
+from src.pieces import PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+
+# Формат файла:
+#   MAGIC, версия (1 байт), затем varint: зерно, режим генератора, ширина, высота;
+#   события: varint((приращение времени в мс << 3) | действие);
+#   конец: varint((приращение времени << 3) | END_MARKER), затем varint: счет, линии.
+MAGIC = b'TRPL'
+FORMAT_VERSION = 1
+END_MARKER = 7  # Действия занимают 3 бита, 7 зарезервировано под конец записи
+RANDOMIZER_CODES = {RANDOMIZER_UNIFORM: 0, RANDOMIZER_BAG: 1}
+RANDOMIZER_MODES = {code: mode for mode, code in RANDOMIZER_CODES.items()}
+
+
+class ReplayError(Exception):
+    """Поврежденный или неподдерживаемый файл повтора."""
+
+
+def encode_varint(value: int, out: bytearray):
+    """Дописывает неотрицательное число в формате varint (LEB128)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos: int):
+    """
+    Читает varint из буфера (bytes, mmap).
+    
+    Returns:
+        tuple: (значение, позиция после числа)
+    """
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise ReplayError("unexpected end of replay") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class ReplayWriter:
+    """Запись повтора одной игры в компактный двоичный файл."""
+    
+    def __init__(self, path, seed: int, mode: str, width: int, height: int, buffer_size: int = 4096):
+        """
+        Args:
+            path: Путь к файлу повтора
+            seed: Зерно генератора фигур (неотрицательное)
+            mode: Режим генератора фигур
+            width: Ширина поля
+            height: Высота поля
+            buffer_size: Размер буфера перед записью на диск
+        
+        Raises:
+            ValueError: Если зерно отрицательное (varint хранит только неотрицательные числа)
+        """
+        if seed < 0:
+            raise ValueError(f"replay seed must be non-negative, got {seed}")
+        self._file = open(path, 'wb')
+        self._buffer = bytearray(MAGIC)
+        self._buffer.append(FORMAT_VERSION)
+        for value in (seed, RANDOMIZER_CODES[mode], width, height):
+            encode_varint(value, self._buffer)
+        self._buffer_size = buffer_size
+        self._last_time = 0
+    
+    def record(self, time_ms: int, action: int):
+        """
+        Записывает действие игрока.
+        
+        Args:
+            time_ms: Время симуляции в миллисекундах
+            action: Действие (ACTION_*)
+        """
+        encode_varint(((time_ms - self._last_time) << 3) | action, self._buffer)
+        self._last_time = time_ms
+        if len(self._buffer) >= self._buffer_size:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+    
+    def finish(self, time_ms: int, score: int, lines: int):
+        """Записывает итог игры и закрывает файл."""
+        encode_varint(((time_ms - self._last_time) << 3) | END_MARKER, self._buffer)
+        encode_varint(score, self._buffer)
+        encode_varint(lines, self._buffer)
+        self._file.write(self._buffer)
+        self._file.close()
+
+
+def read_replay(data):
+    """
+    Разбирает повтор из буфера (bytes или mmap) без копирования событий.
+    
+    Args:
+        data: Содержимое файла повтора
+    
+    Returns:
+        tuple: (header, events, footer), где header - словарь параметров игры,
+        events - генератор пар (время в мс, действие), footer - словарь
+        с итогом, заполняемый после полного прохода по events
+    """
+    if len(data) <= len(MAGIC) or data[:len(MAGIC)] != MAGIC:
+        raise ReplayError("not a replay file")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise ReplayError(f"unsupported replay version {data[len(MAGIC)]}")
+    pos = len(MAGIC) + 1
+    values = []
+    for _ in range(4):
+        value, pos = decode_varint(data, pos)
+        values.append(value)
+    seed, mode_code, width, height = values
+    if mode_code not in RANDOMIZER_MODES:
+        raise ReplayError(f"unknown randomizer code {mode_code}")
+    header = {'seed': seed, 'mode': RANDOMIZER_MODES[mode_code], 'width': width, 'height': height}
+    footer = {}
+    
+    def events(pos=pos):
+        time_ms = 0
+        while True:
+            value, pos = decode_varint(data, pos)
+            time_ms += value >> 3
+            action = value & 7
+            if action == END_MARKER:
+                footer['time_ms'] = time_ms
+                footer['score'], pos = decode_varint(data, pos)
+                footer['lines'], pos = decode_varint(data, pos)
+                return
+            yield time_ms, action
+    
+    return header, events(), footer
+
+
+def replay_state(data) -> tuple:
+    """
+    Проигрывает повтор без графики.
+    
+    Между событиями время прокручивается одним вызовом update: падение
+    фигуры зависит только от накопленного времени, поэтому результат
+    совпадает с покадровой симуляцией.
+    
+    Returns:
+        tuple: (итоговое GameState, footer с записанным итогом)
+    """
+    header, events, footer = read_replay(data)
+    state = GameState(header['width'], header['height'],
+                      PieceGenerator(header['seed'], header['mode']))
+    current_time = 0
+    for time_ms, action in events:
+        if time_ms > current_time:
+            state.update(time_ms - current_time)
+            current_time = time_ms
+        state.step(action)
+    if footer['time_ms'] > current_time:
+        state.update(footer['time_ms'] - current_time)
+    return state, footer
+
+
+def verify_replay(path) -> tuple:
+    """
+    Проверяет файл повтора: совпадают ли счет и линии с записанными.
+    
+    Файл отображается в память (mmap) и читается потоково.
+    
+    Returns:
+        tuple: (ok, записанные (счет, линии), полученные (счет, линии))
+    """
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            state, footer = replay_state(data)
+    recorded = (footer['score'], footer['lines'])
+    actual = (state.score, state.lines_cleared)
+    return recorded == actual, recorded, actual
@@ -0,0 +1,261 @@
+# Колоночное хранилище результатов игр: потоковая запись в .npy и чтение через memmap
+
+import ast
+import os
+import sys
+from array import array
+
+# Формат колонки - файл .npy версии 1.0 с одномерным массивом int64:
+#   MAGIC, версия (2 байта), длина заголовка (2 байта), словарь заголовка,
+#   дополненный пробелами до HEADER_SIZE байт, затем значения подряд.
+# Заголовок фиксированной длины переписывается на месте при каждом сбросе,
+# поэтому файл читается numpy.load, пока запись еще идет.
+MAGIC = b'\x93NUMPY\x01\x00'
+HEADER_SIZE = 128
+DESCR = '<i8' if sys.byteorder == 'little' else '>i8'
+ITEM_SIZE = 8
+# Строк в буфере колонки перед записью на диск
+FLUSH_ROWS = 65536
+# Строк, обрабатываемых за раз при агрегации (память не зависит от размера колонки)
+CHUNK_ROWS = 1 << 20
+
+
+class ResultsError(Exception):
+    """Поврежденный или неподдерживаемый файл колонки."""
+
+
+def _header(rows: int) -> bytes:
+    """Заголовок .npy фиксированной длины для колонки из rows значений."""
+    text = repr({'descr': DESCR, 'fortran_order': False, 'shape': (rows,)})
+    size = HEADER_SIZE - len(MAGIC) - 2
+    return MAGIC + size.to_bytes(2, 'little') + text.ljust(size - 1).encode('latin1') + b'\n'
+
+
+def _read_rows(file) -> int:
+    """
+    Количество значений по заголовку колонки.
+    
+    Raises:
+        ResultsError: Если файл не колонка этого формата
+    """
+    file.seek(0)
+    data = file.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE or data[:len(MAGIC)] != MAGIC:
+        raise ResultsError("not a results column")
+    if int.from_bytes(data[len(MAGIC):len(MAGIC) + 2], 'little') != HEADER_SIZE - len(MAGIC) - 2:
+        raise ResultsError("unsupported column header size")
+    try:
+        header = ast.literal_eval(data[len(MAGIC) + 2:].decode('latin1'))
+        rows, = header['shape']
+    except (ValueError, SyntaxError, KeyError, TypeError):
+        raise ResultsError("corrupted column header") from None
+    if header.get('descr') != DESCR or header.get('fortran_order'):
+        raise ResultsError(f"unsupported column type {header.get('descr')}")
+    return rows
+
+
+class ColumnWriter:
+    """
+    Потоковая запись таблицы: колонка int64 на поле, файл <поле>.npy в каталоге.
+    
+    Значения копятся в array('q') по колонкам и сбрасываются на диск каждые
+    FLUSH_ROWS строк, объекты на запись не создаются. Существующая таблица
+    дописывается, если её колонки совпадают с fields. Сброс сначала дописывает
+    значения во все колонки, затем обновляет заголовки, поэтому после
+    прерванного сброса отбрасываются только значения за последним числом
+    строк в заголовках, а отставшие заголовки догоняются.
+    """
+    
+    def __init__(self, directory, fields, flush_rows: int = FLUSH_ROWS):
+        """
+        Args:
+            directory: Каталог таблицы (создается при необходимости)
+            fields: Имена колонок
+            flush_rows: Строк в буфере перед записью на диск
+        
+        Raises:
+            ResultsError: Если колонки существующей таблицы не совпадают с fields
+                          или файл колонки другого формата либо короче таблицы
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.fields = tuple(fields)
+        self.columns = [array('q') for _ in self.fields]
+        self._flush_rows = flush_rows
+        self._files = []
+        
+        # Строки в заголовках и размеры уже существующих колонок
+        stored = {}
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            # Пустой файл - колонка, созданная без заголовка (прерванное создание)
+            if name.endswith('.npy') and os.path.getsize(path):
+                with open(path, 'rb') as file:
+                    stored[name[:-4]] = (_read_rows(file), os.fstat(file.fileno()).st_size)
+        rows = max((field_rows for field_rows, _ in stored.values()), default=0)
+        # Пустую таблицу можно дополнить колонками (прерванное создание), непустую - нет
+        missing = set(self.fields) - set(stored)
+        if set(stored) - set(self.fields) or (rows and missing):
+            raise ResultsError(f"table columns {sorted(stored)} do not match fields {list(self.fields)}")
+        for field, (_, size) in stored.items():
+            if size < HEADER_SIZE + rows * ITEM_SIZE:
+                raise ResultsError(f"column {field} is shorter than the table ({rows} rows)")
+        
+        self.rows = rows  # Строк на диске
+        header = _header(rows)
+        for field in self.fields:
+            file = open(os.path.join(directory, f"{field}.npy"), 'w+b' if field in missing else 'r+b')
+            self._files.append(file)
+            if field in missing or stored[field][0] != rows:
+                file.write(header)
+            file.truncate(HEADER_SIZE + rows * ITEM_SIZE)
+            file.seek(0, os.SEEK_END)
+    
+    def __enter__(self) -> 'ColumnWriter':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self) -> int:
+        """Всего строк (на диске и в буфере)."""
+        return self.rows + len(self.columns[0])
+    
+    def append(self, *values):
+        """Дописывает одну строку (значения в порядке fields)."""
+        for column, value in zip(self.columns, values):
+            column.append(value)
+        if len(self.columns[0]) >= self._flush_rows:
+            self.flush()
+    
+    def extend(self, columns):
+        """Дописывает пакет строк: по последовательности значений на колонку."""
+        for column, values in zip(self.columns, columns):
+            column.extend(values)
+        if len(self.columns[0]) >= self._flush_rows:
+            self.flush()
+    
+    def flush(self):
+        """Записывает буфер на диск, затем обновляет заголовки колонок."""
+        buffered = len(self.columns[0])
+        if not buffered:
+            return
+        for file, column in zip(self._files, self.columns):
+            file.write(column)  # array('q') в порядке байтов машины, как DESCR
+            del column[:]
+        self.rows += buffered
+        header = _header(self.rows)
+        for file in self._files:
+            file.seek(0)
+            file.write(header)
+            file.seek(0, os.SEEK_END)
+            file.flush()
+    
+    def close(self):
+        """Сбрасывает буфер и закрывает файлы."""
+        if self._files:
+            self.flush()
+        for file in self._files:
+            file.close()
+        self._files = []
+
+
+class ColumnReader:
+    """
+    Чтение таблицы ColumnWriter через numpy.memmap (требует NumPy).
+    
+    Колонки не загружаются в память целиком: агрегации проходят по ним
+    кусками по CHUNK_ROWS строк, данные подгружает операционная система.
+    """
+    
+    def __init__(self, directory, fields=None):
+        """
+        Args:
+            directory: Каталог таблицы
+            fields: Колонки для чтения (по умолчанию - все файлы .npy каталога)
+        
+        Raises:
+            ResultsError: Если колонки нет или она другого формата
+        """
+        import numpy as np
+        self._np = np
+        if fields is None:
+            fields = sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.npy'))
+        self.fields = tuple(fields)
+        self.columns = {}
+        for field in self.fields:
+            path = os.path.join(directory, f"{field}.npy")
+            try:
+                column = np.load(path, mmap_mode='r')
+            except FileNotFoundError:
+                raise ResultsError(f"missing column {field}") from None
+            except ValueError as e:
+                raise ResultsError(f"bad column {field}: {e}") from None
+            if column.ndim != 1 or column.dtype != np.int64:
+                raise ResultsError(f"unsupported column {field}: {column.dtype}, {column.shape}")
+            self.columns[field] = column
+        self.rows = min((len(column) for column in self.columns.values()), default=0)
+    
+    def __len__(self) -> int:
+        return self.rows
+    
+    def column(self, field: str):
+        """Колонка как numpy.memmap (без копирования)."""
+        return self.columns[field][:self.rows]
+    
+    def chunks(self, *fields):
+        """Куски колонок: кортежи массивов до CHUNK_ROWS строк."""
+        columns = [self.column(field) for field in fields]
+        for start in range(0, self.rows, CHUNK_ROWS):
+            yield tuple(column[start:start + CHUNK_ROWS] for column in columns)
+    
+    def summary(self, field: str) -> dict:
+        """Количество, минимум, максимум и среднее колонки."""
+        np = self._np
+        low, high, total = None, None, 0
+        for values, in self.chunks(field):
+            chunk_low, chunk_high = int(values.min()), int(values.max())
+            low = chunk_low if low is None else min(low, chunk_low)
+            high = chunk_high if high is None else max(high, chunk_high)
+            total += int(values.sum(dtype=np.int64))
+        return {'count': self.rows, 'min': low, 'max': high,
+                'mean': total / self.rows if self.rows else None}
+    
+    def histogram(self, field: str, bin_width: int = 1) -> dict:
+        """
+        Распределение значений колонки по интервалам ширины bin_width.
+        
+        Returns:
+            Словарь: начало интервала -> количество строк (только непустые интервалы)
+        """
+        np = self._np
+        low = self.summary(field)['min']
+        if low is None:
+            return {}
+        low -= low % bin_width
+        counts = np.zeros(0, dtype=np.int64)
+        for values, in self.chunks(field):
+            chunk = np.bincount((values - low) // bin_width)
+            if len(chunk) > len(counts):
+                counts = np.pad(counts, (0, len(chunk) - len(counts)))
+            counts[:len(chunk)] += chunk
+        return {low + index * bin_width: int(counts[index]) for index in np.flatnonzero(counts)}
+    
+    def group_mean(self, field: str, by: str) -> dict:
+        """
+        Среднее колонки field по значениям колонки by (неотрицательным).
+        
+        Returns:
+            Словарь: значение by -> (количество строк, среднее field)
+        """
+        np = self._np
+        counts = np.zeros(0, dtype=np.int64)
+        sums = np.zeros(0, dtype=np.float64)
+        for values, keys in self.chunks(field, by):
+            chunk_counts = np.bincount(keys)
+            chunk_sums = np.bincount(keys, weights=values)
+            if len(chunk_counts) > len(counts):
+                counts = np.pad(counts, (0, len(chunk_counts) - len(counts)))
+                sums = np.pad(sums, (0, len(chunk_counts) - len(sums)))
+            counts[:len(chunk_counts)] += chunk_counts
+            sums[:len(chunk_sums)] += chunk_sums
+        return {int(key): (int(counts[key]), float(sums[key] / counts[key])) for key in np.flatnonzero(counts)}
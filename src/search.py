@@ -0,0 +1,186 @@
+# Поиск с заглядыванием вперед: лучевой поиск по текущей и следующей фигурам
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+
+from src.ai import AIPlayer, enumerate_placements
+from src.pieces import ORIENTATIONS
+
+# Позиций между проверками лимита времени внутри уровня поиска
+DEADLINE_CHECK_NODES = 64
+
+
+class TranspositionTable:
+    """Кэш оценок позиций с вытеснением давно не использованных (LRU)."""
+    
+    def __init__(self, max_size: int = 100000):
+        """
+        Args:
+            max_size: Максимальное количество хранимых позиций
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """Возвращает сохраненное значение или None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key, value):
+        """Сохраняет значение, вытесняя самую старую позицию при переполнении."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Очищает кэш."""
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class BeamSearchPlayer(AIPlayer):
+    """
+    ИИ-игрок с заглядыванием вперед.
+    
+    Перебирает положения текущей фигуры, затем следующей (из превью) и т.д.,
+    на каждом уровне оставляя beam_width лучших позиций. Оценки полей
+    кэшируются в таблице транспозиций по маскам строк.
+    """
+    
+    def __init__(self, weights: dict = None, depth: int = 2, beam_width: int = 8,
+                 cache_size: int = 100000, time_budget: float = None):
+        """
+        Args:
+            weights: Веса признаков (см. DEFAULT_WEIGHTS)
+            depth: Глубина поиска в фигурах (текущая, следующая и очередь генератора)
+            beam_width: Количество позиций, оставляемых на каждом уровне
+            cache_size: Размер таблицы транспозиций
+            time_budget: Лимит времени на ход в секундах (None - без лимита);
+                         проверяется и внутри уровня (каждые DEADLINE_CHECK_NODES
+                         позиций): недосчитанный уровень отбрасывается, ход
+                         выбирается по предыдущему
+        """
+        super().__init__(weights)
+        self.depth = depth
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.table = TranspositionTable(cache_size)
+        
+        # Счетчики
+        self.nodes = 0
+        self.search_time = 0.0
+    
+    @property
+    def nodes_per_second(self) -> float:
+        """Скорость поиска в позициях в секунду."""
+        return self.nodes / self.search_time if self.search_time else 0.0
+    
+    @property
+    def cache_hits(self) -> int:
+        """Количество попаданий в таблицу транспозиций."""
+        return self.table.hits
+    
+    def reset_stats(self):
+        """Обнуляет счетчики."""
+        self.nodes = 0
+        self.search_time = 0.0
+        self.table.hits = 0
+        self.table.misses = 0
+    
+    def _cached_board_score(self, key, rows, width: int) -> float:
+        """Оценка поля через таблицу транспозиций."""
+        score = self.table.get(key)
+        if score is None:
+            score = self.board_score(rows, width)
+            self.table.put(key, score)
+        return score
+    
+    def search(self, rows, width: int, pieces, x: int, y: int, height: int = None):
+        """
+        Лучевой поиск по последовательности фигур.
+        
+        Args:
+            rows: Маски строк поля (или только его занятой части, см. enumerate_placements)
+            width: Ширина поля
+            pieces: Начальные повороты фигур (Orientation): текущая, следующая, ...
+            x: Текущая координата X первой фигуры
+            y: Текущая координата Y первой фигуры
+            height: Высота всего поля (по умолчанию len(rows))
+        
+        Returns:
+            Лучшее положение первой фигуры (Placement со счетом лучшего листа)
+            или None, если ходов нет
+        """
+        start = time.perf_counter()
+        if height is None:
+            height = len(rows)  # Узлы хранят только занятую часть поля
+        lines_weight = self.weights.get('lines', 0)
+        # Узел: (оценка, номер для стабильного сравнения, первое положение, маски, линии)
+        beam = [(0.0, 0, None, rows, 0)]
+        best = None
+        # Номера узлов уникальны: при равных оценках до положений сравнение не доходит
+        sequence = itertools.count(1)
+        
+        deadline = None if self.time_budget is None else start + self.time_budget
+        expired = False
+        
+        for level, orientation in enumerate(pieces[:max(1, self.depth)]):
+            children = {}
+            for _, _, first, node_rows, node_lines in beam:
+                if level == 0:
+                    piece_x, piece_y = x, y
+                else:
+                    piece_x, piece_y = width // 2 - orientation.width // 2, 0
+                for placement in enumerate_placements(node_rows, width, orientation, piece_x, piece_y,
+                                                      height=height):
+                    self.nodes += 1
+                    key = tuple(placement.rows)
+                    lines = node_lines + placement.cleared
+                    score = self._cached_board_score(key, placement.rows, width) + lines_weight * lines
+                    # Одинаковые позиции из разных веток раскрываются один раз
+                    known = children.get(key)
+                    if known is None or score > known[0]:
+                        children[key] = (score, next(sequence), first or placement, placement.rows, lines)
+                    # Первый уровень досчитывается всегда: без него хода нет
+                    if (level and deadline is not None and self.nodes % DEADLINE_CHECK_NODES == 0
+                            and time.perf_counter() > deadline):
+                        expired = True
+                        break
+                if expired:
+                    break
+            if expired or not children:
+                break  # Лучший узел остается с предыдущего уровня
+            beam = heapq.nlargest(self.beam_width, children.values())
+            best = beam[0]
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        
+        self.search_time += time.perf_counter() - start
+        if best is None:
+            return None
+        return best[2]._replace(score=best[0])
+    
+    def choose(self, state):
+        """
+        Лучшее положение текущей фигуры с учетом следующей.
+        
+        При глубине больше 2 дальнейшие фигуры берутся из очереди генератора.
+        """
+        pieces = [state.current_shape_matrix, state.next_shape_matrix]
+        if self.depth > 2:
+            pieces += [ORIENTATIONS[name][0] for name in state.generator.peek(self.depth - 2)]
+        board = state.board
+        return self.search(board.rows[board.top:], board.width, pieces,
+                           state.piece_x, state.piece_y, board.height)
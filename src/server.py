@@ -0,0 +1,455 @@
+# Игровой сервер: много сессий без графики в одном цикле asyncio
+
+import asyncio
+import json
+import random
+import zlib
+
+from src.engine import GameState, ACTION_NONE, ACTION_HARD_DROP
+from src.pieces import PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+
+# Протокол: JSON-сообщения, по одному на строку.
+#   Клиент -> сервер: {"op": "play", "seed": 1, "mode": "bag"} - новая сессия (игрок и зритель);
+#                     {"op": "watch", "session": 3} - наблюдать за сессией;
+#                     {"op": "action", "action": 4} - действие ACTION_* в своей сессии;
+#                     {"op": "restart"}, {"op": "list"}, {"op": "sync", "session": 3}.
+#   Сервер -> клиент: "created", "frame" (полное поле при подключении), "delta" (только
+#                     изменившиеся клетки и поля), "sessions", "sync" (контрольная сумма), "error".
+TICK_MS = 10  # Шаг общего колеса таймеров
+WHEEL_SLOTS = 64  # Слотов колеса: 640 мс при шаге 10 мс (больше самого медленного падения)
+MAX_LINE = 4096  # Максимальная длина сообщения клиента
+MAX_WRITE_BUFFER = 256 * 1024  # Отставший клиент отключается, а не копит память сервера
+MODES = (RANDOMIZER_UNIFORM, RANDOMIZER_BAG)
+
+
+class ProtocolError(Exception):
+    """Некорректное сообщение клиента."""
+
+
+def encode_message(message: dict) -> bytes:
+    """Кодирует сообщение в строку протокола."""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def decode_message(line: bytes) -> dict:
+    """
+    Разбирает строку протокола.
+    
+    Raises:
+        ProtocolError: Если строка не является JSON-объектом
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ProtocolError("malformed message") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("message must be an object")
+    return message
+
+
+def grid_checksum(grid) -> int:
+    """Контрольная сумма цветов поля (для проверки синхронизации клиента)."""
+    return zlib.crc32(b''.join(bytes(row) for row in grid))
+
+
+class TickWheel:
+    """
+    Колесо таймеров: общий планировщик для всех сессий вместо таймера на каждую.
+    
+    Элемент ставится в слот тика, на котором он должен сработать; продвижение
+    колеса на один тик стоит O(элементов в слоте), а не O(всех сессий).
+    Задержки длиннее оборота колеса обрезаются до одного оборота.
+    """
+    
+    def __init__(self, tick_ms: int = TICK_MS, slots: int = WHEEL_SLOTS):
+        """
+        Args:
+            tick_ms: Длительность тика в миллисекундах
+            slots: Количество слотов (оборот колеса - slots тиков)
+        """
+        self.tick_ms = tick_ms
+        self.tick = 0
+        # Словари вместо множеств: порядок срабатывания совпадает с порядком постановки
+        self._slots = [{} for _ in range(slots)]
+        self._due = {}  # Элемент -> тик срабатывания
+    
+    def __len__(self) -> int:
+        return len(self._due)
+    
+    @property
+    def now_ms(self) -> int:
+        """Время колеса в миллисекундах."""
+        return self.tick * self.tick_ms
+    
+    def schedule(self, item, delay_ms: int):
+        """Ставит элемент (или переставляет) на срабатывание через delay_ms."""
+        self.cancel(item)
+        ticks = -(-delay_ms // self.tick_ms)  # Округление вверх
+        ticks = max(1, min(ticks, len(self._slots) - 1))
+        due = self.tick + ticks
+        self._slots[due % len(self._slots)][item] = None
+        self._due[item] = due
+    
+    def cancel(self, item):
+        """Снимает элемент с колеса (если он на нем есть)."""
+        due = self._due.pop(item, None)
+        if due is not None:
+            del self._slots[due % len(self._slots)][item]
+    
+    def advance(self) -> list:
+        """
+        Продвигает колесо на один тик.
+        
+        Returns:
+            Элементы, срок которых наступил
+        """
+        self.tick += 1
+        slot = self._slots[self.tick % len(self._slots)]
+        fired = list(slot)
+        slot.clear()
+        for item in fired:
+            del self._due[item]
+        return fired
+
+
+class Session:
+    """
+    Одна игра на сервере: состояние без графики, игрок и зрители.
+    
+    Зрителям рассылаются дельты относительно последнего разосланного
+    состояния (базы). Строки цветов поля не меняются на месте (см.
+    Board.place_piece), поэтому база - это копия списка ссылок на строки,
+    а неизменившиеся строки отсеиваются проверкой идентичности.
+    """
+    
+    def __init__(self, session_id: int, seed: int, mode: str, width: int, height: int, now_ms: int):
+        self.id = session_id
+        self.seed = seed
+        self.mode = mode
+        self.state = GameState(width, height, PieceGenerator(seed, mode))
+        self.time_ms = now_ms  # Время, до которого продвинута игра
+        self.player = None
+        self.spectators = set()
+        self._sent_grid = None
+        self._sent_fields = None
+        self.mark_sent()
+    
+    def advance(self, now_ms: int):
+        """Продвигает игру до времени колеса now_ms."""
+        dt = now_ms - self.time_ms
+        self.time_ms = now_ms
+        if dt > 0:
+            self.state.update(dt)
+    
+    def fall_delay(self) -> int:
+        """Миллисекунды до следующего шага падения фигуры."""
+        return max(0, self.state.fall_speed - self.state.fall_time)
+    
+    def fields(self) -> dict:
+        """Поля сообщения помимо клеток: положение фигуры, счет и прочее."""
+        state = self.state
+        piece = None
+        if not state.game_over:
+            piece = [state.current_shape_name, state.current_shape_matrix.rotation,
+                     state.piece_x, state.piece_y]
+        return {
+            'piece': piece,
+            'next': state.next_shape_name,
+            'score': state.score,
+            'level': state.level,
+            'lines': state.lines_cleared,
+            'game_over': state.game_over,
+        }
+    
+    def mark_sent(self):
+        """Запоминает текущее состояние как базу для следующей дельты."""
+        self._sent_grid = self.state.board.grid[:]
+        self._sent_fields = self.fields()
+    
+    def frame(self) -> dict:
+        """Полное состояние базы (для нового зрителя; дальше ему идут дельты)."""
+        cells = [[x, y, value]
+                 for y, row in enumerate(self._sent_grid)
+                 for x, value in enumerate(row) if value]
+        return {'type': 'frame', 'session': self.id, 'width': self.state.width,
+                'height': self.state.height, 'cells': cells, **self._sent_fields}
+    
+    def delta(self):
+        """
+        Изменения с последней рассылки; база сдвигается на текущее состояние.
+        
+        Returns:
+            Сообщение "delta" или None, если ничего не изменилось
+        """
+        sent_grid = self._sent_grid
+        cells = []
+        for y, row in enumerate(self.state.board.grid):
+            old = sent_grid[y]
+            if row is not old:
+                cells.extend([x, y, value] for x, (value, old_value) in enumerate(zip(row, old))
+                             if value != old_value)
+        sent_fields = self._sent_fields
+        self.mark_sent()
+        message = {key: value for key, value in self._sent_fields.items() if sent_fields[key] != value}
+        if not cells and not message:
+            return None
+        if cells:
+            message['cells'] = cells
+        message['type'] = 'delta'
+        message['session'] = self.id
+        return message
+
+
+class Connection:
+    """Подключение клиента: запись сообщений с защитой от отставших клиентов."""
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.playing = None  # Сессия, которой управляет клиент
+        self.watching = set()
+        self.closed = False
+    
+    def send(self, data: bytes) -> bool:
+        """
+        Отправляет закодированное сообщение без ожидания.
+        
+        Returns:
+            False если клиент отключен (в том числе из-за переполненного буфера)
+        """
+        if self.closed:
+            return False
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.close()
+            return False
+        self.writer.write(data)
+        return True
+    
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class GameServer:
+    """Сервер сессий: общее колесо таймеров, прием действий и рассылка дельт."""
+    
+    def __init__(self, tick_ms: int = TICK_MS, width: int = 10, height: int = 20):
+        """
+        Args:
+            tick_ms: Шаг колеса таймеров в миллисекундах
+            width: Ширина поля новых сессий
+            height: Высота поля новых сессий
+        """
+        self.width = width
+        self.height = height
+        self.wheel = TickWheel(tick_ms)
+        self.sessions = {}
+        self._next_id = 1
+        # Сессии, изменившиеся с последней рассылки (словарь как упорядоченное множество)
+        self._dirty = {}
+        self._server = None
+        self._ticker = None
+        
+        # Статистика
+        self.messages_sent = 0
+        self.bytes_sent = 0
+    
+    def create_session(self, seed: int = None, mode: str = RANDOMIZER_UNIFORM) -> Session:
+        """Создает сессию и ставит её на колесо таймеров."""
+        # Зерно всегда известно: игру сессии можно воспроизвести
+        if seed is None:
+            seed = random.getrandbits(63)
+        session = Session(self._next_id, seed, mode, self.width, self.height, self.wheel.now_ms)
+        self._next_id += 1
+        self.sessions[session.id] = session
+        self._schedule(session)
+        return session
+    
+    def close_session(self, session: Session):
+        """Удаляет сессию (без игрока и зрителей)."""
+        self.wheel.cancel(session)
+        self._dirty.pop(session, None)
+        self.sessions.pop(session.id, None)
+    
+    def _schedule(self, session: Session):
+        """Ставит сессию на колесо к следующему шагу падения."""
+        if session.state.game_over:
+            self.wheel.cancel(session)
+        else:
+            self.wheel.schedule(session, session.fall_delay())
+    
+    def apply_action(self, session: Session, action: int):
+        """Выполняет действие игрока во время текущего тика."""
+        session.advance(self.wheel.now_ms)
+        session.state.step(action)
+        self._schedule(session)
+        self._dirty[session] = None
+    
+    def restart(self, session: Session):
+        """Начинает игру сессии заново с тем же генератором."""
+        session.advance(self.wheel.now_ms)
+        session.state.reset()
+        self._schedule(session)
+        self._dirty[session] = None
+    
+    def tick(self):
+        """Один тик: продвигает сработавшие сессии и рассылает дельты."""
+        now_ms = self.wheel.now_ms + self.wheel.tick_ms
+        for session in self.wheel.advance():
+            session.advance(now_ms)
+            self._schedule(session)
+            self._dirty[session] = None
+        self.flush()
+    
+    def flush(self):
+        """Рассылает дельты изменившихся сессий их зрителям (одна кодировка на сессию)."""
+        for session in self._dirty:
+            message = session.delta()
+            if message is None or not session.spectators:
+                continue
+            data = encode_message(message)
+            for connection in session.spectators:
+                if connection.send(data):
+                    self.messages_sent += 1
+                    self.bytes_sent += len(data)
+        self._dirty.clear()
+    
+    def _send(self, connection: Connection, message: dict):
+        data = encode_message(message)
+        if connection.send(data):
+            self.messages_sent += 1
+            self.bytes_sent += len(data)
+    
+    def _watch(self, connection: Connection, session: Session):
+        """Подписывает клиента на сессию: полный кадр базы, затем дельты."""
+        if session in connection.watching:
+            return
+        self._send(connection, session.frame())
+        session.spectators.add(connection)
+        connection.watching.add(session)
+    
+    def _session_for(self, message: dict) -> Session:
+        session = self.sessions.get(message.get('session'))
+        if session is None:
+            raise ProtocolError("unknown session")
+        return session
+    
+    def dispatch(self, connection: Connection, message: dict):
+        """
+        Обрабатывает сообщение клиента.
+        
+        Raises:
+            ProtocolError: При неизвестной операции или неверных параметрах
+        """
+        op = message.get('op')
+        if op == 'action':
+            session = connection.playing
+            if session is None:
+                raise ProtocolError("not playing a session")
+            action = message.get('action')
+            if type(action) is not int or not ACTION_NONE <= action <= ACTION_HARD_DROP:
+                raise ProtocolError("invalid action")
+            self.apply_action(session, action)
+        elif op == 'play':
+            if connection.playing is not None:
+                raise ProtocolError("already playing a session")
+            seed = message.get('seed')
+            mode = message.get('mode', RANDOMIZER_UNIFORM)
+            if seed is not None and (type(seed) is not int or seed < 0):
+                raise ProtocolError("invalid seed")
+            if mode not in MODES:
+                raise ProtocolError("invalid mode")
+            session = self.create_session(seed, mode)
+            session.player = connection
+            connection.playing = session
+            self._send(connection, {'type': 'created', 'session': session.id, 'seed': session.seed,
+                                    'mode': session.mode})
+            self._watch(connection, session)
+        elif op == 'watch':
+            self._watch(connection, self._session_for(message))
+        elif op == 'restart':
+            if connection.playing is None:
+                raise ProtocolError("not playing a session")
+            self.restart(connection.playing)
+        elif op == 'sync':
+            # Ответ идет после уже отправленных дельт: клиент сверяет с ним свое зеркало
+            session = self._session_for(message)
+            if session not in connection.watching:
+                raise ProtocolError("not watching the session")
+            self._send(connection, {'type': 'sync', 'session': session.id,
+                                    'checksum': grid_checksum(session._sent_grid),
+                                    'score': session._sent_fields['score']})
+        elif op == 'list':
+            self._send(connection, {'type': 'sessions', 'sessions': [
+                {'session': session.id, 'score': session.state.score,
+                 'lines': session.state.lines_cleared, 'game_over': session.state.game_over,
+                 'spectators': len(session.spectators)}
+                for session in self.sessions.values()
+            ]})
+        else:
+            raise ProtocolError(f"unknown op {op!r}")
+    
+    def disconnect(self, connection: Connection):
+        """Отписывает клиента; сессии без игрока и зрителей удаляются."""
+        connection.close()
+        sessions = set(connection.watching)
+        if connection.playing is not None:
+            connection.playing.player = None
+            sessions.add(connection.playing)
+        for session in sessions:
+            session.spectators.discard(connection)
+            if session.player is None and not session.spectators:
+                self.close_session(session)
+        connection.watching.clear()
+        connection.playing = None
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(writer)
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self.dispatch(connection, decode_message(line))
+                except ProtocolError as error:
+                    self._send(connection, {'type': 'error', 'message': str(error)})
+        except (ConnectionError, ValueError):
+            pass  # Обрыв соединения или слишком длинное сообщение
+        finally:
+            self.disconnect(connection)
+    
+    async def _run_ticks(self):
+        """Продвигает колесо по часам цикла событий, догоняя пропущенные тики."""
+        loop = asyncio.get_running_loop()
+        start = loop.time() - self.wheel.now_ms / 1000
+        tick_seconds = self.wheel.tick_ms / 1000
+        while True:
+            delay = start + (self.wheel.tick + 1) * tick_seconds - loop.time()
+            await asyncio.sleep(max(0.0, delay))
+            self.tick()
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """
+        Запускает прием подключений и колесо таймеров.
+        
+        Returns:
+            Номер порта (при port=0 выбирается свободный)
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port, limit=MAX_LINE)
+        self._ticker = asyncio.create_task(self._run_ticks())
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def close(self):
+        """Останавливает сервер и колесо таймеров."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+            self._ticker = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
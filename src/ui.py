@@ -0,0 +1,79 @@
+# Кэшируемые элементы интерфейса: надписи и затемнение экрана
+
+import pygame
+
+
+class LazyFont:
+    """
+    Шрифт, загружаемый при первой отрисовке текста.
+    
+    Загрузка шрифта - заметная часть холодного старта, а часть шрифтов
+    (Game Over, оверлей профилировщика) может не понадобиться вовсе.
+    """
+    
+    def __init__(self, size: int, name: str = None):
+        """
+        Args:
+            size: Размер шрифта
+            name: Файл шрифта (None - шрифт pygame по умолчанию)
+        """
+        self.size = size
+        self.name = name
+        self._font = None
+    
+    @property
+    def font(self) -> pygame.font.Font:
+        """Загруженный шрифт."""
+        if self._font is None:
+            self._font = pygame.font.Font(self.name, self.size)
+        return self._font
+    
+    def render(self, text: str, antialias: bool, color: tuple) -> pygame.Surface:
+        """Отрисовывает текст (как pygame.font.Font.render)."""
+        return self.font.render(text, antialias, color)
+
+
+class TextLabel:
+    """Надпись, которая растеризуется шрифтом только при изменении текста."""
+    
+    def __init__(self, font, color: tuple, antialias: bool = True):
+        """
+        Args:
+            font: Шрифт надписи (pygame.font.Font или LazyFont)
+            color: Цвет текста (RGB)
+            antialias: Сглаживание текста
+        """
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self._text = None
+        self._surface = None
+    
+    def render(self, text: str) -> pygame.Surface:
+        """Возвращает поверхность с текстом (из кэша, если текст не изменился)."""
+        if text != self._text:
+            self._surface = self.font.render(text, self.antialias, self.color)
+            self._text = text
+        return self._surface
+
+
+class Overlay:
+    """Полупрозрачное затемнение экрана, создаваемое один раз на размер окна."""
+    
+    def __init__(self, color: tuple = (0, 0, 0), alpha: int = 200):
+        """
+        Args:
+            color: Цвет затемнения (RGB)
+            alpha: Прозрачность (0-255)
+        """
+        self.color = color
+        self.alpha = alpha
+        self._surface = None
+    
+    def get(self, size: tuple) -> pygame.Surface:
+        """Возвращает поверхность затемнения заданного размера."""
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size)
+            self._surface.set_alpha(self.alpha)
+            self._surface.fill(self.color)
+        return self._surface
@@ -0,0 +1,93 @@
+# Тесты перебора положений ИИ (src/ai.py)
+
+import random
+
+from src.ai import AIPlayer, enumerate_placements, fits
+from src.board import Board
+from src.engine import GameState
+from src.pieces import ORIENTATIONS, SHAPE_NAMES, PieceGenerator
+
+
+def board_with_cells(cells, width: int = 10, height: int = 20) -> Board:
+    """Поле с заполненными клетками (x, y)."""
+    board = Board(width, height)
+    for x, y in cells:
+        board.place_piece(((1,),), x, y, 1)
+    return board
+
+
+def check_placements(board: Board, orientation, x: int, y: int):
+    """Каждое положение перебора совпадает с падением на Board и не выходит за поле."""
+    placements = list(enumerate_placements(board.rows[board.top:], board.width, orientation, x, y,
+                                           board.column_heights, board.height))
+    for placement in placements:
+        assert fits(board.rows, placement.orientation.row_masks, placement.x, placement.y, board.width)
+        assert placement.y == board.drop_y(placement.orientation, placement.x, y)
+        expected = Board(board.width, board.height)
+        expected.restore(board.snapshot())
+        expected.place_piece(placement.orientation, placement.x, placement.y, 1)
+        expected.clear_lines()
+        assert placement.rows == expected.rows[expected.top:]
+    return placements
+
+
+def test_piece_under_overhang_falls_to_the_floor():
+    # Вертикальная Z в колонках 4-5: клетка (4, 0) над её левой колонкой
+    board = board_with_cells([(4, 0)])
+    z_vertical = ORIENTATIONS['Z'][1]
+    placements = check_placements(board, z_vertical, 4, 0)
+    at_spawn = [placement for placement in placements if placement.x == 4 and placement.orientation is z_vertical]
+    assert at_spawn and at_spawn[0].y == board.drop_y(z_vertical, 4, 0) == 17
+    assert all(placement.y >= 0 for placement in placements)
+
+
+def test_placements_match_board_on_random_boards():
+    rng = random.Random(0)
+    for _ in range(200):
+        # Разреженные клетки (и у самого верха) дают навесы над пустыми колонками
+        cells = {(rng.randrange(10), rng.randrange(20)) for _ in range(rng.randrange(40))}
+        board = board_with_cells(cells)
+        for name in SHAPE_NAMES:
+            orientation = ORIENTATIONS[name][rng.randrange(4)]
+            x = board.width // 2 - orientation.width // 2
+            if board.can_place_piece(orientation, x, 0):
+                check_placements(board, orientation, x, 0)
+
+
+def test_tall_board_matches_short_board():
+    # Одна и та же стопка на полях высотой 20 и 3000: перебор видит только занятые строки
+    rng = random.Random(1)
+    cells = {(rng.randrange(10), rng.randrange(12, 20)) for _ in range(30)}
+    short = board_with_cells(cells)
+    tall = board_with_cells({(x, y + 2980) for x, y in cells}, height=3000)
+    for name in SHAPE_NAMES:
+        orientation = ORIENTATIONS[name][0]
+        x = short.width // 2 - orientation.width // 2
+        short_placements = check_placements(short, orientation, x, 0)
+        tall_placements = check_placements(tall, orientation, x, 0)
+        shifted = [(p.orientation, p.x, p.y + 2980, p.rows) for p in short_placements]
+        assert shifted == [(p.orientation, p.x, p.y, p.rows) for p in tall_placements]
+        assert all(len(p.rows) <= short.height - short.top + 4 for p in tall_placements)
+
+
+def test_next_action_replans_after_disturbance():
+    # Фигуру сдвигают или поворачивают между действиями ИИ (как неудавшееся действие)
+    for seed in range(10):
+        for disturb in (lambda state: state.move(-1), lambda state: state.move(1),
+                        lambda state: state.rotate()):
+            state = GameState(generator=PieceGenerator(seed), undo_limit=1)
+            for _ in range(5):
+                AIPlayer().play_piece(state)
+            ai = AIPlayer()
+            state.step(ai.next_action(state))
+            if not disturb(state):
+                continue
+            expected = AIPlayer().choose(state)
+            for _ in range(30):
+                if state.pieces_placed == 6:
+                    break
+                state.step(ai.next_action(state))
+            # Отмена возвращает фигуру в положение фиксации
+            assert state.pieces_placed == 6 and state.undo()
+            locked = (state.current_shape_matrix.rotation, state.piece_x, state.piece_y)
+            assert locked == (expected.orientation.rotation, expected.x, expected.y)
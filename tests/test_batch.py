@@ -0,0 +1,52 @@
+# Тесты пакетного симулятора (src/batch.py): сверка с Board шаг за шагом
+
+import pytest
+
+from src.board import Board
+from src.pieces import ORIENTATIONS, SHAPE_NAMES
+
+# Пакетный симулятор требует NumPy (необязательная зависимость)
+np = pytest.importorskip("numpy")
+from src.batch import BatchBoards, PIECE_WIDTHS
+
+
+def test_drop_matches_board_step_by_step():
+    count, steps = 300, 200
+    rng = np.random.default_rng(0)
+    batch = BatchBoards(count)
+    boards = [Board() for _ in range(count)]
+    lines = [0] * count
+    game_over = [False] * count
+    
+    for _ in range(steps):
+        shapes = rng.integers(0, len(SHAPE_NAMES), count)
+        rotations = rng.integers(0, 4, count)
+        xs = rng.integers(0, batch.width - PIECE_WIDTHS[shapes, rotations] + 1)
+        batch.drop(shapes, rotations, xs)
+        
+        for index, board in enumerate(boards):
+            if game_over[index]:
+                continue
+            orientation = ORIENTATIONS[SHAPE_NAMES[shapes[index]]][rotations[index]]
+            x = int(xs[index])
+            if not board.can_place_piece(orientation, x, 0):
+                game_over[index] = True
+                continue
+            board.place_piece(orientation, x, board.drop_y(orientation, x, 0), 1)
+            lines[index] += board.clear_lines()
+        
+        assert batch.game_over.tolist() == game_over
+        for index, board in enumerate(boards):
+            assert batch.rows[index].tolist() == board.rows
+        assert batch.lines_cleared.tolist() == lines
+
+
+def test_landing_under_overhang():
+    batch = BatchBoards(1)
+    board = Board()
+    # Клетка (4, 0) нависает над левой колонкой вертикальной Z
+    board.place_piece(((1,),), 4, 0, 1)
+    batch.rows[0] = board.rows
+    z_vertical = ORIENTATIONS['Z'][1]
+    shape = SHAPE_NAMES.index('Z')
+    assert batch.landing_y([shape], [1], [4])[0] == board.drop_y(z_vertical, 4, 0) == 17
@@ -0,0 +1,176 @@
+# Тесты битового поля (src/board.py): сверка с наивным полем из клеток
+
+import random
+
+from src.board import Board
+from src.pieces import ORIENTATIONS, SHAPE_NAMES
+
+
+class NaiveBoard:
+    """Поле как список строк клеток; всё пересчитывается заново."""
+    
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cells = [[0] * width for _ in range(height)]
+    
+    def can_place(self, matrix, x: int, y: int) -> bool:
+        for row_idx, row in enumerate(matrix):
+            for col_idx, cell in enumerate(row):
+                if not cell:
+                    continue
+                board_x, board_y = x + col_idx, y + row_idx
+                if not 0 <= board_x < self.width or board_y >= self.height:
+                    return False
+                if board_y >= 0 and self.cells[board_y][board_x]:
+                    return False
+        return True
+    
+    def drop_y(self, matrix, x: int, y: int) -> int:
+        while self.can_place(matrix, x, y + 1):
+            y += 1
+        return y
+    
+    def place(self, matrix, x: int, y: int, color_index: int):
+        for row_idx, row in enumerate(matrix):
+            for col_idx, cell in enumerate(row):
+                board_x, board_y = x + col_idx, y + row_idx
+                if cell and 0 <= board_x < self.width and 0 <= board_y < self.height:
+                    self.cells[board_y][board_x] = color_index
+    
+    def clear_lines(self) -> int:
+        kept = [row for row in self.cells if not all(row)]
+        cleared = self.height - len(kept)
+        self.cells = [[0] * self.width for _ in range(cleared)] + kept
+        return cleared
+    
+    def rows(self) -> list:
+        return [sum(1 << x for x, cell in enumerate(row) if cell) for row in self.cells]
+    
+    def heights(self) -> tuple:
+        return tuple(
+            next((self.height - y for y in range(self.height) if self.cells[y][x]), 0)
+            for x in range(self.width)
+        )
+    
+    def holes(self) -> int:
+        return sum(
+            1
+            for x in range(self.width)
+            for y in range(self.height - self.heights()[x], self.height)
+            if not self.cells[y][x]
+        )
+    
+    def row_counts(self) -> tuple:
+        return tuple(sum(1 for cell in row if cell) for row in self.cells)
+
+
+def assert_same(board: Board, naive: NaiveBoard):
+    assert board.rows == naive.rows()
+    assert [list(row) for row in board.grid] == naive.cells
+    assert board.column_heights == naive.heights()
+    assert board.holes == naive.holes()
+    assert board.row_counts == naive.row_counts()
+    assert board.top == board.height - max(naive.heights())
+
+
+def play_random(seed: int, width: int = 10, height: int = 20, pieces: int = 300):
+    """Случайная игра на Board и NaiveBoard с проверкой после каждой фигуры."""
+    rng = random.Random(seed)
+    board = Board(width, height)
+    naive = NaiveBoard(width, height)
+    for _ in range(pieces):
+        orientation = ORIENTATIONS[rng.choice(SHAPE_NAMES)][rng.randrange(4)]
+        # Матрица без таблиц Orientation проверяет и общий путь piece_masks
+        piece = orientation if rng.random() < 0.5 else [list(row) for row in orientation.matrix]
+        x = rng.randrange(-1, width)
+        if rng.random() < 0.7:
+            # Чаще в самое глубокое место, чтобы строки заполнялись и удалялись
+            fitting = [col for col in range(-1, width) if naive.can_place(piece, col, 0)]
+            if fitting:
+                x = max(fitting, key=lambda col: naive.drop_y(piece, col, 0))
+        assert board.can_place_piece(piece, x, 0) == naive.can_place(piece, x, 0)
+        if not naive.can_place(piece, x, 0):
+            # Иногда фигура начинает ниже: под навесом или сбоку от стопки
+            y = rng.randrange(height)
+            if not naive.can_place(piece, x, y) or not board.can_place_piece(piece, x, y):
+                assert board.can_place_piece(piece, x, y) == naive.can_place(piece, x, y)
+                continue
+        else:
+            y = 0
+        assert board.drop_y(piece, x, y) == naive.drop_y(piece, x, y)
+        y = naive.drop_y(piece, x, y)
+        color_index = rng.randrange(1, 8)
+        board.place_piece(piece, x, y, color_index)
+        naive.place(piece, x, y, color_index)
+        assert board.clear_lines() == naive.clear_lines()
+        assert_same(board, naive)
+        if board.top < 4:
+            # Поле почти заполнено: начинаем заново, чтобы проверять и удаление линий
+            board = Board(width, height)
+            naive = NaiveBoard(width, height)
+
+
+def test_random_games_match_naive_board():
+    for seed in range(20):
+        play_random(seed)
+
+
+def test_narrow_and_wide_boards():
+    play_random(100, width=4, height=12)
+    play_random(101, width=40, height=30)
+
+
+def test_clear_non_adjacent_lines():
+    # Полные строки 17 и 19 с неполной строкой 18 между ними
+    board = Board(4, 20)
+    naive = NaiveBoard(4, 20)
+    for piece, x, y in ((((1, 1, 1, 1),), 0, 19), (((1, 0, 1, 0),), 0, 18),
+                        (((1, 1, 1, 1),), 0, 17), (((0, 1, 0, 0),), 0, 16)):
+        board.place_piece(piece, x, y, 2)
+        naive.place(piece, x, y, 2)
+    assert board.clear_lines() == naive.clear_lines() == 2
+    assert_same(board, naive)
+    assert board.rows[18:] == [0b0010, 0b0101]
+
+
+def test_snapshot_restore():
+    rng = random.Random(7)
+    board = Board()
+    snapshots = []
+    for _ in range(60):
+        orientation = ORIENTATIONS[rng.choice(SHAPE_NAMES)][rng.randrange(4)]
+        x = rng.randrange(board.width - orientation.width + 1)
+        if not board.can_place_piece(orientation, x, 0):
+            break
+        snapshots.append((board.snapshot(), board.rows[:], [row[:] for row in board.grid],
+                          board.column_heights, board.holes, board.row_counts))
+        board.place_piece(orientation, x, board.drop_y(orientation, x, 0), 1)
+        board.clear_lines()
+    for snapshot, rows, grid, heights, holes, counts in reversed(snapshots):
+        board.restore(snapshot)
+        assert board.rows == rows
+        assert board.grid == grid
+        assert (board.column_heights, board.holes, board.row_counts) == (heights, holes, counts)
+
+
+def test_snapshot_keeps_only_occupied_rows():
+    # Снимки восстанавливаются в случайном порядке: вершина стопки и растет, и опускается
+    rng = random.Random(8)
+    board = Board(10, 3000)
+    states = []
+    for _ in range(40):
+        orientation = ORIENTATIONS[rng.choice(SHAPE_NAMES)][rng.randrange(4)]
+        x = rng.randrange(board.width - orientation.width + 1)
+        board.place_piece(orientation, x, board.drop_y(orientation, x, 0), 1)
+        board.clear_lines()
+        snapshot = board.snapshot()
+        assert len(snapshot[1]) == board.height - board.top < 100
+        states.append((snapshot, board.rows[:], [row[:] for row in board.grid],
+                       board.column_heights, board.holes, board.row_counts))
+    rng.shuffle(states)
+    for snapshot, rows, grid, heights, holes, counts in states:
+        board.restore(snapshot)
+        assert board.rows == rows
+        assert board.grid == grid
+        assert (board.column_heights, board.holes, board.row_counts) == (heights, holes, counts)
@@ -0,0 +1,109 @@
+# Тесты снимков и отмены ходов игрового ядра (src/engine.py)
+
+import pytest
+
+from src.ai import AIPlayer
+from src.engine import GameState, _SCALAR_FIELDS
+from src.pieces import ORIENTATIONS, SHAPE_NAMES, PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+
+
+def signature(state: GameState) -> tuple:
+    """Всё наблюдаемое состояние игры, включая поле и дальнейшие фигуры."""
+    board = state.board
+    return (
+        tuple(getattr(state, field) for field in _SCALAR_FIELDS),
+        tuple(board.rows), tuple(tuple(row) for row in board.grid),
+        board.column_heights, board.holes, board.row_counts,
+        tuple(state.piece_history), tuple(state.generator.peek(14)),
+    )
+
+
+def play(state: GameState, ai: AIPlayer, pieces: int) -> list:
+    """
+    Ставит фигуры ИИ, запоминая состояние перед каждой фиксацией
+    (фигура уже в конечном положении, как после отмены).
+    
+    Returns:
+        Список (состояние до фиксации, удалено линий)
+    """
+    history = []
+    for _ in range(pieces):
+        if state.game_over:
+            break
+        placement = ai.choose(state)
+        state.current_shape_matrix = placement.orientation
+        state.piece_x, state.piece_y = placement.x, placement.y
+        before = signature(state)
+        history.append((before, state.place(placement.orientation, placement.x, placement.y)))
+    return history
+
+
+@pytest.mark.parametrize('mode', [RANDOMIZER_UNIFORM, RANDOMIZER_BAG])
+def test_undo_restores_state_before_each_lock(mode):
+    state = GameState(generator=PieceGenerator(3, mode), undo_limit=1000)
+    history = play(state, AIPlayer(), 120)
+    assert any(cleared for _, cleared in history)
+    for before, _ in reversed(history):
+        assert state.undo()
+        assert signature(state) == before
+    assert not state.undo()
+
+
+def test_undo_multi_line_clear():
+    state = GameState(generator=PieceGenerator(1), undo_limit=5)
+    board = state.board
+    # Строки 16, 18, 19 заполнены, кроме колонки 0; в строке 17 пусты колонки 0 и 5
+    for y in (16, 18, 19):
+        board.place_piece([[1] * 9], 1, y, 2)
+    board.place_piece([[1, 1, 1, 1, 0, 1, 1, 1, 1]], 1, 17, 3)
+    vertical_i = ORIENTATIONS['I'][1]
+    state.current_shape_matrix = vertical_i
+    state.piece_x, state.piece_y = 0, board.drop_y(vertical_i, 0, 0)
+    before = signature(state)
+    
+    assert state.place(vertical_i, 0, state.piece_y) == 3
+    assert state.lines_cleared == 3 and state.score == 900
+    assert board.rows[19] == 0b1111011111
+    assert state.undo()
+    assert signature(state) == before
+
+
+def test_undo_limit_keeps_last_locks():
+    state = GameState(generator=PieceGenerator(2), undo_limit=3)
+    history = play(state, AIPlayer(), 6)
+    for before, _ in reversed(history[-3:]):
+        assert state.undo()
+        assert signature(state) == before
+    assert not state.undo()
+    assert state.pieces_placed == 3
+
+
+@pytest.mark.parametrize('mode', [RANDOMIZER_UNIFORM, RANDOMIZER_BAG])
+def test_pieces_after_undo_follow_original_sequence(mode):
+    ai = AIPlayer()
+    reference = GameState(generator=PieceGenerator(9, mode))
+    play(reference, ai, 40)
+    
+    state = GameState(generator=PieceGenerator(9, mode), undo_limit=20)
+    play(state, ai, 30)
+    for _ in range(15):
+        state.undo()
+    play(state, ai, 25)
+    assert signature(state) == signature(reference)
+    if mode == RANDOMIZER_BAG:
+        # Каждые 7 фигур подряд - перестановка всех фигур
+        names = state.piece_history
+        for start in range(0, len(names) - 6, 7):
+            assert sorted(names[start:start + 7]) == sorted(SHAPE_NAMES)
+
+
+@pytest.mark.parametrize('mode', [RANDOMIZER_UNIFORM, RANDOMIZER_BAG])
+def test_unget_returns_pieces_in_order(mode):
+    generator = PieceGenerator(4, mode)
+    expected = PieceGenerator(4, mode)
+    drawn = [generator.next_name() for _ in range(10)]
+    generator.peek(3)
+    for name in reversed(drawn[4:]):
+        generator.unget(name)
+    names = drawn[:4] + [generator.next_name() for _ in range(20)]
+    assert names == [expected.next_name() for _ in range(24)]
@@ -0,0 +1,28 @@
+# Тесты покадрового профилировщика (src/profiler.py)
+
+import csv
+
+from src.profiler import FrameProfiler, PHASE_EVENTS, PHASE_UPDATE, PHASE_DRAW
+
+
+def test_dump_csv_joins_phases_by_frame(tmp_path):
+    profiler = FrameProfiler(size=4)
+    for frame in range(6):
+        profiler.add(PHASE_EVENTS, 10 + frame)
+        profiler.add(PHASE_UPDATE, 20 + frame)
+        # Отрисовка только в четных кадрах (нечетные - без изменений)
+        if frame % 2 == 0:
+            profiler.add(PHASE_DRAW, 100 + frame)
+        profiler.end_frame(1000 + frame)
+    path = tmp_path / "frames.csv"
+    profiler.dump_csv(path)
+    
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['frame_number'] for row in rows] == ['2', '3', '4', '5']
+    for row in rows:
+        frame = int(row['frame_number'])
+        assert row['frame'] == str(1000 + frame)
+        assert row[PHASE_EVENTS] == str(10 + frame)
+        assert row[PHASE_UPDATE] == str(20 + frame)
+        assert row[PHASE_DRAW] == (str(100 + frame) if frame % 2 == 0 else '')
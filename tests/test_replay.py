@@ -0,0 +1,96 @@
+# Тесты записи и проверки повторов (src/replay.py)
+
+import random
+
+import pytest
+
+from src.ai import AIPlayer
+from src.game_logic import Game
+from src.pieces import PieceGenerator, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+from src.replay import (END_MARKER, ReplayError, ReplayWriter, decode_varint, encode_varint,
+                        read_replay, verify_replay)
+
+
+class LoggingAI(AIPlayer):
+    """ИИ, запоминающий свои действия вместе со временем симуляции игры."""
+    
+    def __init__(self):
+        super().__init__()
+        self.game = None
+        self.actions = []
+    
+    def next_action(self, state) -> int:
+        action = super().next_action(state)
+        self.actions.append((self.game.sim_time, action))
+        return action
+
+
+def record_session(path, mode: str, seed: int = 5, pieces: int = 40) -> tuple:
+    """
+    Записывает игру ИИ через Game с паузами разной длины между действиями.
+    
+    Returns:
+        tuple: (Game после записи, выполненные действия)
+    """
+    ai = LoggingAI()
+    game = ai.game = Game(ai=ai, generator=PieceGenerator(seed, mode), record_path=path)
+    rng = random.Random(seed)
+    while not game.game_over and game.state.pieces_placed < pieces:
+        # Несколько действий в один момент, однобайтовые и многобайтовые приращения времени
+        game.update(rng.choice((0, 0, 10, 15, 16, 2047, 2048)))
+        game.handle_events([])
+    game.stop_recording()
+    return game, ai.actions
+
+
+def test_varint_edges():
+    for value, size in ((0, 1), (127, 1), (128, 2), (2 ** 14 - 1, 2), (2 ** 14, 3), (2 ** 63 - 1, 9)):
+        out = bytearray(b'x')
+        encode_varint(value, out)
+        assert len(out) == 1 + size
+        assert decode_varint(out, 1) == (value, len(out))
+    with pytest.raises(ReplayError):
+        decode_varint(b'\x80\x80', 0)
+
+
+@pytest.mark.parametrize('mode', [RANDOMIZER_UNIFORM, RANDOMIZER_BAG])
+def test_recorded_game_replays_to_same_result(tmp_path, mode):
+    path = tmp_path / "game.trpl"
+    game, actions = record_session(path, mode)
+    assert game.lines_cleared > 0
+    
+    data = path.read_bytes()
+    header, events, footer = read_replay(data)
+    assert header == {'seed': 5, 'mode': mode, 'width': 10, 'height': 20}
+    # Действия по порядку с абсолютным временем, итог после END_MARKER
+    assert list(events) == actions
+    tail = bytearray()
+    for value in (((game.sim_time - actions[-1][0]) << 3) | END_MARKER, game.score, game.lines_cleared):
+        encode_varint(value, tail)
+    assert data.endswith(tail)
+    assert footer == {'time_ms': game.sim_time, 'score': game.score, 'lines': game.lines_cleared}
+    assert verify_replay(path) == (True, (game.score, game.lines_cleared),
+                                   (game.score, game.lines_cleared))
+
+
+def test_tampered_replay_fails(tmp_path):
+    path = tmp_path / "game.trpl"
+    game, actions = record_session(path, RANDOMIZER_BAG)
+    
+    # Тот же поток событий с подмененным итогом
+    forged_path = tmp_path / "forged.trpl"
+    writer = ReplayWriter(forged_path, 5, RANDOMIZER_BAG, 10, 20)
+    for time_ms, action in actions:
+        writer.record(time_ms, action)
+    writer.finish(game.sim_time, game.score + 100, game.lines_cleared)
+    assert verify_replay(forged_path) == (False, (game.score + 100, game.lines_cleared),
+                                          (game.score, game.lines_cleared))
+    
+    # Обрезанный файл и чужой формат
+    data = path.read_bytes()
+    truncated_path = tmp_path / "truncated.trpl"
+    truncated_path.write_bytes(data[:-2])
+    with pytest.raises(ReplayError):
+        verify_replay(truncated_path)
+    with pytest.raises(ReplayError):
+        read_replay(b'TRPX' + data[4:])
@@ -0,0 +1,78 @@
+# Тесты колоночного хранилища результатов (src/results.py)
+
+import os
+
+import pytest
+
+from src.results import ColumnWriter, ColumnReader, ResultsError, HEADER_SIZE, ITEM_SIZE, _header
+
+np = pytest.importorskip("numpy")
+
+FIELDS = ("seed", "score")
+
+
+def write_rows(directory, count: int, start: int = 0, flush_rows: int = 64):
+    with ColumnWriter(directory, FIELDS, flush_rows) as writer:
+        for seed in range(start, start + count):
+            writer.append(seed, seed * 10)
+
+
+def test_round_trip_and_append(tmp_path):
+    write_rows(tmp_path, 1000)
+    write_rows(tmp_path, 10, start=1000)
+    reader = ColumnReader(tmp_path)
+    assert reader.fields == ("score", "seed")
+    assert len(reader) == 1010
+    assert np.array_equal(reader.column("seed"), np.arange(1010))
+    assert np.array_equal(np.load(tmp_path / "score.npy"), np.arange(1010) * 10)
+    assert reader.summary("seed") == {'count': 1010, 'min': 0, 'max': 1009, 'mean': 504.5}
+    assert sum(reader.histogram("score", 1000).values()) == 1010
+    groups = reader.group_mean("score", "seed")
+    assert groups[7] == (1, 70.0)
+
+
+def test_reopen_with_other_fields_keeps_table(tmp_path):
+    write_rows(tmp_path, 1000)
+    with pytest.raises(ResultsError):
+        ColumnWriter(tmp_path, FIELDS + ("level",))
+    with pytest.raises(ResultsError):
+        ColumnWriter(tmp_path, FIELDS[:1])
+    assert not os.path.exists(tmp_path / "level.npy")
+    assert len(ColumnReader(tmp_path)) == 1000
+
+
+def test_missing_column_of_non_empty_table(tmp_path):
+    write_rows(tmp_path, 100)
+    os.remove(tmp_path / "score.npy")
+    with pytest.raises(ResultsError):
+        ColumnWriter(tmp_path, FIELDS)
+
+
+def test_partial_flush_data_is_trimmed(tmp_path):
+    write_rows(tmp_path, 100)
+    # Прерванный сброс: значения дописаны в одну колонку, заголовки не обновлены
+    with open(tmp_path / "seed.npy", 'ab') as file:
+        file.write(bytes(3 * ITEM_SIZE))
+    write_rows(tmp_path, 1, start=100)
+    assert os.path.getsize(tmp_path / "seed.npy") == HEADER_SIZE + 101 * ITEM_SIZE
+    assert np.array_equal(ColumnReader(tmp_path).column("seed"), np.arange(101))
+
+
+def test_lagging_header_rolls_forward(tmp_path):
+    write_rows(tmp_path, 110)
+    # Прерванный сброс: данные записаны во все колонки, но заголовок score отстал
+    with open(tmp_path / "score.npy", 'r+b') as file:
+        file.write(_header(100))
+    with ColumnWriter(tmp_path, FIELDS) as writer:
+        assert writer.rows == 110
+    reader = ColumnReader(tmp_path)
+    assert len(reader) == 110
+    assert np.array_equal(reader.column("score"), np.arange(110) * 10)
+
+
+def test_short_column_is_an_error(tmp_path):
+    write_rows(tmp_path, 100)
+    with open(tmp_path / "score.npy", 'r+b') as file:
+        file.truncate(HEADER_SIZE + 50 * ITEM_SIZE)
+    with pytest.raises(ResultsError):
+        ColumnWriter(tmp_path, FIELDS)
@@ -0,0 +1,57 @@
+# Тесты лучевого поиска (src/search.py)
+
+from src import search
+from src.ai import Placement
+from src.pieces import ORIENTATIONS
+
+
+def test_equal_scores_after_replaced_node(monkeypatch):
+    # Уровень 0: три первых положения (раскрываются в порядке C, B, A).
+    # Уровень 1: позиция K из ветки C, затем лучше из ветки B (замена узла),
+    # затем новая позиция L из ветки A с той же оценкой, что у K.
+    first_a = Placement(ORIENTATIONS['T'][0], 0, 0, 0.0, [1, 0], 0)
+    first_b = Placement(ORIENTATIONS['S'][0], 1, 0, 0.0, [2, 0], 0)
+    first_c = Placement(ORIENTATIONS['Z'][0], 2, 0, 0.0, [3, 0], 0)
+    level_one = {
+        (3, 0): [Placement(ORIENTATIONS['O'][0], 0, 0, 0.0, [3, 3], 0)],
+        (2, 0): [Placement(ORIENTATIONS['O'][0], 0, 0, 0.0, [3, 3], 1)],
+        (1, 0): [Placement(ORIENTATIONS['O'][0], 0, 0, 0.0, [0, 3], 1)],
+    }
+    
+    def fake_placements(rows, width, orientation, x, y, heights=None, height=None):
+        if tuple(rows) == (0, 0):
+            return [first_a, first_b, first_c]
+        return level_one[tuple(rows)]
+    
+    monkeypatch.setattr(search, 'enumerate_placements', fake_placements)
+    player = search.BeamSearchPlayer({'lines': 1.0}, depth=2)
+    best = player.search([0, 0], 2, [ORIENTATIONS['T'][0], ORIENTATIONS['O'][0]], 0, 0)
+    assert best.score == 1.0
+    assert best.orientation in (first_a.orientation, first_b.orientation)
+
+
+class StepClock:
+    """Часы, идущие на секунду при каждом чтении (вместо модуля time)."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def perf_counter(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def test_time_budget_stops_inside_level(monkeypatch):
+    pieces = [ORIENTATIONS[name][0] for name in ('T', 'I', 'O', 'L')]
+    rows = [0] * 20
+    full = search.BeamSearchPlayer(depth=4, beam_width=16)
+    full.search(rows, 10, pieces, 4, 0)
+    level_zero = search.BeamSearchPlayer(depth=1).search(rows, 10, pieces, 4, 0)
+    
+    # Лимит истекает при первой проверке внутри второго уровня: его узлы отбрасываются
+    monkeypatch.setattr(search, 'time', StepClock())
+    player = search.BeamSearchPlayer(depth=4, beam_width=16, time_budget=1.5)
+    best = player.search(rows, 10, pieces, 4, 0)
+    assert best == level_zero
+    assert player.nodes < full.nodes
+    assert player.nodes % search.DEADLINE_CHECK_NODES == 0
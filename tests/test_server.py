@@ -0,0 +1,115 @@
+# Тест сервера из конца в конец: GameServer и клиенты GameClient на локальном сокете
+
+import asyncio
+
+from src.ai import AIPlayer
+from src.board import Board
+from src.client import GameClient
+from src.engine import ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_HARD_DROP
+from src.pieces import ORIENTATIONS, RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+from src.server import GameServer
+
+
+async def read_forever(client: GameClient, kinds: list):
+    """Применяет входящие сообщения к зеркалам клиента до закрытия соединения, запоминая их типы."""
+    try:
+        while True:
+            kinds.append((await client.receive()).get('type'))
+    except ConnectionError:
+        pass
+
+
+async def wait_until(condition, timeout: float = 10.0):
+    """Ждет выполнения условия, пока сервер и клиенты обмениваются сообщениями."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+async def play_pieces(client: GameClient, ai: AIPlayer, pieces: int):
+    """Бот: ставит фигуры по своему зеркалу (повороты, сдвиги, мгновенное падение)."""
+    mirror = client.mirrors[client.session]
+    for _ in range(pieces):
+        if mirror.fields['game_over']:
+            return
+        board = Board(mirror.width, mirror.height)
+        for y, row in enumerate(mirror.grid):
+            for x, value in enumerate(row):
+                if value:
+                    board.place_piece(((1,),), x, y, value)
+        name, rotation, x, y = mirror.fields['piece']
+        placement = ai.best_placement(board, ORIENTATIONS[name][rotation], x, y)
+        if placement is not None:
+            for _ in range((placement.orientation.rotation - rotation) % 4):
+                client.send('action', action=ACTION_ROTATE)
+            dx = placement.x - x
+            for _ in range(abs(dx)):
+                client.send('action', action=ACTION_RIGHT if dx > 0 else ACTION_LEFT)
+        client.send('action', action=ACTION_HARD_DROP)
+        # Следующая фигура видна в зеркале после рассылки дельты
+        placed = mirror.fields['piece']
+        await wait_until(lambda: mirror.fields['game_over'] or mirror.fields['piece'] != placed)
+
+
+async def play_to_game_over(client: GameClient):
+    """Мгновенное падение, пока игра не закончится (после этого состояние сессии неизменно)."""
+    mirror = client.mirrors[client.session]
+    while not mirror.fields['game_over']:
+        client.send('action', action=ACTION_HARD_DROP)
+        await asyncio.sleep(0.01)
+
+
+async def run_session_check():
+    server = GameServer(tick_ms=5)
+    port = await server.start(port=0)
+    ai = AIPlayer()
+    players = [await GameClient.connect('127.0.0.1', port) for _ in range(3)]
+    for index, player in enumerate(players):
+        await player.play(index, RANDOMIZER_BAG if index % 2 else RANDOMIZER_UNIFORM)
+    spectator = await GameClient.connect('127.0.0.1', port)
+    for player in players:
+        spectator.send('watch', session=player.session)
+    # Зритель не управляет сессией: ошибка протокола, соединение остается открытым
+    spectator.send('action', action=ACTION_HARD_DROP)
+    clients = players + [spectator]
+    kinds = [[] for _ in clients]
+    readers = [asyncio.create_task(read_forever(client, client_kinds))
+               for client, client_kinds in zip(clients, kinds)]
+    await wait_until(lambda: len(spectator.mirrors) == len(players) and spectator.errors)
+    
+    await asyncio.gather(*(play_pieces(player, ai, 25) for player in players))
+    # Перезапуск первой сессии: дельта очищает поле зеркал
+    await play_to_game_over(players[0])
+    players[0].send('restart')
+    first_mirror = players[0].mirrors[players[0].session]
+    await wait_until(lambda: not first_mirror.fields['game_over'])
+    await play_pieces(players[0], ai, 5)
+    await asyncio.gather(*(play_to_game_over(player) for player in players))
+    
+    # Игры окончены: зеркала должны догнать неизменное состояние сервера
+    for player in players:
+        session = server.sessions[player.session]
+        for client in (player, spectator):
+            mirror = client.mirrors[player.session]
+            await wait_until(lambda: mirror.fields == session.fields())
+            assert mirror.grid == [list(row) for row in session.state.board.grid]
+            client.send('sync', session=player.session)
+    lines = sum(server.sessions[player.session].state.lines_cleared for player in players)
+    # Ответы "sync" сверяются клиентами при получении (счетчик desyncs)
+    await wait_until(lambda: [client_kinds.count('sync') for client_kinds in kinds] == [1, 1, 1, 3])
+    
+    for client in clients:
+        await client.close()
+    await asyncio.gather(*readers)
+    await server.close()
+    return players, spectator, lines
+
+
+def test_mirrors_match_server_state():
+    players, spectator, lines = asyncio.run(run_session_check())
+    assert lines > 0
+    assert spectator.errors == ["not playing a session"]
+    assert all(not player.errors for player in players)
+    assert sum(client.desyncs for client in players + [spectator]) == 0
@@ -0,0 +1,246 @@
+# Подбор весов эвристики ИИ методом перекрестной энтропии на нескольких ядрах
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from runner import play_batch, RESULT_FIELDS
+from src.ai import DEFAULT_WEIGHTS
+from src.pieces import RANDOMIZER_UNIFORM, RANDOMIZER_BAG
+
+# Признаки эвристики (порядок координат вектора весов)
+FEATURES = tuple(DEFAULT_WEIGHTS)
+# Веса округляются: одинаковые кандидаты дают одинаковые ключи кэша
+WEIGHT_DIGITS = 6
+# Итоги пакета игр, которые хранит кэш
+TOTAL_FIELDS = ("games", "score", "lines", "pieces")
+
+
+class FitnessCache:
+    """
+    Кэш результатов пакетов игр на диске.
+    
+    Файл - JSON-строка на пакет: ключ (веса, диапазон зерен, лимит фигур,
+    генератор) и суммы счета, линий и фигур. Строки дописываются сразу
+    после пакета, поэтому прерванный запуск теряет только незавершенные
+    пакеты, а повторный запуск не переигрывает уже сыгранные игры.
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: Путь к файлу кэша (None - кэш только в памяти)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry['key']] = entry['totals']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Строка, недописанная при прерывании
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def key(weights: dict, seeds: range, max_pieces: int, randomizer: str) -> str:
+        """Ключ пакета игр."""
+        return json.dumps([[weights[feature] for feature in FEATURES],
+                           seeds.start, seeds.stop, max_pieces, randomizer])
+    
+    def get(self, key: str):
+        """Итоги пакета или None, если пакет еще не сыгран."""
+        totals = self._entries.get(key)
+        if totals is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return totals
+    
+    def put(self, key: str, totals: dict):
+        """Сохраняет итоги пакета (в памяти и в конце файла)."""
+        self._entries[key] = totals
+        if self.path is not None:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps({'key': key, 'totals': totals}) + "\n")
+
+
+def normalize(vector) -> dict:
+    """
+    Веса единичной длины с округлением.
+    
+    Выбор положения зависит только от направления вектора весов, поэтому
+    длина не влияет на игру и не должна давать разные ключи кэша.
+    """
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return {feature: round(value / norm, WEIGHT_DIGITS) for feature, value in zip(FEATURES, vector)}
+
+
+def batch_totals(columns) -> dict:
+    """Суммы пакета по колонкам результата runner.play_batch."""
+    results = dict(zip(RESULT_FIELDS, columns))
+    return {
+        'games': len(results['seed']),
+        'score': sum(results['score']),
+        'lines': sum(results['lines']),
+        'pieces': sum(results['pieces']),
+    }
+
+
+def evaluate(population, chunks, executor, cache: FitnessCache, max_pieces: int,
+             randomizer: str, metric: str = 'lines'):
+    """
+    Оценивает кандидатов: среднее значение metric по всем играм набора зерен.
+    
+    Несыгранные пакеты (кандидат x пакет зерен) раздаются процессам все сразу;
+    одинаковые пакеты разных кандидатов играются один раз.
+    
+    Returns:
+        tuple: (список оценок кандидатов, количество сыгранных игр)
+    """
+    totals = [dict.fromkeys(TOTAL_FIELDS, 0) for _ in population]
+    pending = {}  # Ключ пакета -> индексы кандидатов, ждущих его
+    futures = {}
+    for index, weights in enumerate(population):
+        for chunk in chunks:
+            key = cache.key(weights, chunk, max_pieces, randomizer)
+            if key in pending:
+                pending[key].append(index)
+                continue
+            cached = cache.get(key)
+            if cached is not None:
+                for field in TOTAL_FIELDS:
+                    totals[index][field] += cached[field]
+                continue
+            pending[key] = [index]
+            future = executor.submit(play_batch, chunk, max_pieces, 0, weights, randomizer)
+            futures[future] = key
+    
+    played = 0
+    for future in as_completed(futures):
+        key = futures[future]
+        columns = future.result()[0]
+        batch = batch_totals(columns)
+        cache.put(key, batch)
+        played += batch['games']
+        for index in pending[key]:
+            for field in TOTAL_FIELDS:
+                totals[index][field] += batch[field]
+    return [total[metric] / max(1, total['games']) for total in totals], played
+
+
+def tune(generations: int, population_size: int, elite_fraction: float, seeds: range,
+         chunk_size: int, max_pieces: int, workers: int, cache: FitnessCache,
+         randomizer: str = RANDOMIZER_UNIFORM, metric: str = 'lines', seed: int = 0,
+         initial_std: float = 0.5, extra_noise: float = 0.1):
+    """
+    Метод перекрестной энтропии: выборка весов из нормального распределения,
+    отбор лучших и пересчет среднего и разброса по ним.
+    
+    Args:
+        generations: Количество поколений
+        population_size: Кандидатов в поколении (включая текущее среднее)
+        elite_fraction: Доля лучших кандидатов для пересчета распределения
+        seeds: Набор зерен игр (одинаковый для всех кандидатов)
+        chunk_size: Игр в одном пакете (единица работы процесса и запись кэша)
+        max_pieces: Лимит фигур на игру
+        workers: Количество процессов
+        cache: Кэш результатов
+        randomizer: Режим генератора фигур
+        metric: Оценка кандидата: 'lines' или 'score' (среднее на игру)
+        seed: Зерно выборки кандидатов (повторный запуск дает тех же кандидатов)
+        initial_std: Начальный разброс весов
+        extra_noise: Добавка к разбросу, убывающая к последнему поколению
+    
+    Returns:
+        tuple: (лучшие веса, их оценка)
+    """
+    rng = random.Random(seed)
+    chunks = [range(start, min(start + chunk_size, seeds.stop))
+              for start in range(seeds.start, seeds.stop, chunk_size)]
+    mean = list(normalize([DEFAULT_WEIGHTS[feature] for feature in FEATURES]).values())
+    std = [initial_std] * len(FEATURES)
+    elite_count = max(1, int(population_size * elite_fraction))
+    best_weights, best_fitness = None, -math.inf
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for generation in range(generations):
+            start = time.perf_counter()
+            hits = cache.hits
+            # Текущее среднее оценивается вместе с выборкой
+            population = [normalize(mean)] + [
+                normalize([rng.gauss(mu, sigma) for mu, sigma in zip(mean, std)])
+                for _ in range(population_size - 1)
+            ]
+            fitness, played = evaluate(population, chunks, executor, cache, max_pieces,
+                                       randomizer, metric)
+            ranked = sorted(zip(fitness, range(len(population))), reverse=True)
+            elite = [population[index] for _, index in ranked[:elite_count]]
+            if ranked[0][0] > best_fitness:
+                best_fitness, best_weights = ranked[0][0], population[ranked[0][1]]
+            
+            # Новое распределение по лучшим кандидатам
+            noise = extra_noise * (1 - generation / generations)
+            for i, feature in enumerate(FEATURES):
+                values = [weights[feature] for weights in elite]
+                mean[i] = sum(values) / len(values)
+                variance = sum((value - mean[i]) ** 2 for value in values) / len(values)
+                std[i] = math.sqrt(variance) + noise
+            
+            elapsed = time.perf_counter() - start
+            print(f"Поколение {generation + 1}/{generations}: лучший {ranked[0][0]:.2f}, "
+                  f"центр распределения {fitness[0]:.2f}, сыграно игр {played}, "
+                  f"пакетов из кэша {cache.hits - hits}, время {elapsed:.1f} с")
+    return best_weights, best_fitness
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Подбор весов эвристики ИИ тетриса")
+    parser.add_argument("--generations", type=int, default=10, help="Количество поколений")
+    parser.add_argument("--population", type=int, default=32, help="Кандидатов в поколении")
+    parser.add_argument("--elite", type=float, default=0.25, help="Доля лучших кандидатов")
+    parser.add_argument("--games", type=int, default=20, help="Игр на кандидата")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно первой игры и выборки кандидатов")
+    parser.add_argument("--chunk-size", type=int, default=5, help="Игр в одном пакете")
+    parser.add_argument("--max-pieces", type=int, default=500, help="Лимит фигур на игру")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Количество процессов")
+    parser.add_argument("--metric", choices=("lines", "score"), default="lines",
+                        help="Оценка кандидата (среднее на игру)")
+    parser.add_argument("--bag", action="store_true", help="Генератор фигур «7 в мешке»")
+    parser.add_argument("--cache", default="tune_cache.jsonl",
+                        help="Файл кэша результатов (пустая строка - без файла)")
+    parser.add_argument("--output", default=None, help="Сохранить лучшие веса в JSON")
+    args = parser.parse_args(argv)
+    
+    if args.max_pieces <= 0:
+        parser.error("--max-pieces должен быть положительным: игра ИИ может не закончиться")
+    cache = FitnessCache(args.cache or None)
+    randomizer = RANDOMIZER_BAG if args.bag else RANDOMIZER_UNIFORM
+    seeds = range(args.seed, args.seed + args.games)
+    
+    start = time.perf_counter()
+    weights, fitness = tune(args.generations, max(2, args.population), args.elite, seeds,
+                            max(1, args.chunk_size), args.max_pieces, max(1, args.workers), cache,
+                            randomizer, args.metric, args.seed)
+    print(f"Время: {time.perf_counter() - start:.1f} с, пакетов в кэше: {len(cache)}")
+    print(f"Лучшая оценка ({args.metric}): {fitness:.2f}")
+    print(f"Веса: {weights}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'weights': weights, 'fitness': fitness, 'metric': args.metric}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# Проверка архива повторов: проигрывание без графики и сверка счета
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.replay import verify_replay, ReplayError
+
+# Расширение файлов повторов
+REPLAY_SUFFIX = ".trp"
+
+
+def collect_paths(targets) -> list:
+    """Собирает файлы повторов из путей к файлам и каталогам."""
+    paths = []
+    for target in targets:
+        target = Path(target)
+        if target.is_dir():
+            paths.extend(sorted(str(path) for path in target.rglob(f"*{REPLAY_SUFFIX}")))
+        else:
+            paths.append(str(target))
+    return paths
+
+
+def check_file(path: str):
+    """
+    Проверяет один повтор.
+    
+    Returns:
+        tuple: (path, ok, сообщение об ошибке или None)
+    """
+    try:
+        ok, recorded, actual = verify_replay(path)
+    except (OSError, ValueError, ReplayError) as e:
+        return path, False, f"ошибка чтения: {e}"
+    if ok:
+        return path, True, None
+    return path, False, f"записано счет/линии {recorded}, получено {actual}"
+
+
+def main(argv=None):
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Проверка повторов тетриса")
+    parser.add_argument("paths", nargs="+", help=f"Файлы или каталоги с файлами *{REPLAY_SUFFIX}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Количество процессов")
+    args = parser.parse_args(argv)
+    
+    paths = collect_paths(args.paths)
+    workers = max(1, args.workers)
+    failed = 0
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk_size = max(1, len(paths) // (workers * 4))
+        for path, ok, message in executor.map(check_file, paths, chunksize=chunk_size):
+            if not ok:
+                failed += 1
+                print(f"✗ {path}: {message}")
+    elapsed = time.perf_counter() - start
+    
+    print(f"Проверено: {len(paths)}, ошибок: {failed}, время: {elapsed:.2f} с"
+          f" ({len(paths) / elapsed if elapsed else 0:.1f} файлов/с)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())